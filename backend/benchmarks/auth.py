@@ -0,0 +1,100 @@
+"""
+Microbenchmark of per-request authentication overhead in get_current_user,
+with and without the resolved principal cache.
+
+Uses a throwaway SQLite database (or DATABASE_URL if set) and counts the SQL
+statements each variant issues.
+
+Run with: python -m backend.benchmarks.auth [--requests 5000] [--json out.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp.name, 'auth_bench.db')}")
+
+from sqlalchemy import event  # noqa: E402
+
+from backend.config import settings  # noqa: E402
+from backend.database import SessionLocal, engine, init_db  # noqa: E402
+from backend.models.user import User  # noqa: E402
+from backend.utils import auth  # noqa: E402
+
+
+def _percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * pct / 100), len(values) - 1)]
+
+
+def run(label: str, token: str, requests: int, ttl: int) -> dict:
+    settings.AUTH_CACHE_TTL_SECONDS = ttl
+    auth._token_cache.clear()
+    auth._user_cache.clear()
+
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    timings = []
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            # Same shape as a request: new session from get_db, then the dependency
+            db = SessionLocal()
+            try:
+                auth.get_current_user(token, db)
+            finally:
+                db.close()
+            timings.append((time.perf_counter() - start) * 1e6)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    return {
+        "variant": label,
+        "requests": requests,
+        "mean_us": round(statistics.mean(timings), 1),
+        "p50_us": round(statistics.median(timings), 1),
+        "p99_us": round(_percentile(timings, 99), 1),
+        "sql_statements": statements[0],
+    }
+
+
+def main(requests: int) -> list:
+    init_db()
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == "auth-bench").first()
+        if user is None:
+            user = User(email="auth-bench@example.com", username="auth-bench")
+            db.add(user)
+            db.commit()
+        token = auth.create_access_token({"sub": str(user.id)})
+    finally:
+        db.close()
+
+    ttl = settings.AUTH_CACHE_TTL_SECONDS or 60
+    return [
+        run("no cache", token, requests, 0),
+        run("principal cache", token, requests, ttl),
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    rows = main(args.requests)
+    print(f"{'variant':>16} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'SQL':>7}")
+    for row in rows:
+        print(f"{row['variant']:>16} {row['mean_us']:>9} {row['p50_us']:>9} {row['p99_us']:>9} {row['sql_statements']:>7}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
@@ -0,0 +1,88 @@
+"""
+Bulk contract writes: per-row create_contract/delete_contract_by_id against
+bulk_create_contracts/bulk_delete_contracts, on a throwaway SQLite database
+(or DATABASE_URL if set).
+
+Run with: python -m backend.benchmarks.bulk [--rows 10000] [--json out.json]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp.name, 'bulk_bench.db')}")
+os.environ.setdefault("RETRIEVAL_INDEX_PATH", os.path.join(_tmp.name, "index.db"))
+
+from backend.database import SessionLocal, init_db  # noqa: E402
+from backend.models.user import User  # noqa: E402
+from backend.services.contract_service import (  # noqa: E402
+    bulk_create_contracts,
+    bulk_delete_contracts,
+    create_contract,
+    delete_contract_by_id,
+)
+
+
+def _items(rows: int) -> list:
+    return [
+        ({
+            "contact_name": f"Counterparty {i % 500}",
+            "contact_email": f"legal{i % 500}@example.com",
+            "start_date": f"2024-{i % 12 + 1:02d}-01",
+            "end_date": f"2026-{i % 12 + 1:02d}-01",
+            "contract_value": float(1000 + i),
+            "payment_terms": "Net 30",
+            "summary": "Master services agreement.",
+        }, f"contract-{i}.pdf")
+        for i in range(rows)
+    ]
+
+
+def _timed(label: str, rows: int, fn) -> dict:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return {"operation": label, "rows": rows, "seconds": round(elapsed, 2), "rows_per_second": round(rows / elapsed)}
+
+
+def main(rows: int) -> list:
+    init_db()
+    db = SessionLocal()
+    try:
+        user = User(email="bulk@example.com", username="bulk")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+        items = _items(rows)
+
+        created = []
+        results = [_timed("create_contract x N", rows, lambda: created.extend(
+            create_contract(db, data, file_name, user_id).id for data, file_name in items
+        ))]
+        results.append(_timed("delete_contract_by_id x N", rows, lambda: [
+            delete_contract_by_id(db, contract_id, user_id) for contract_id in created
+        ]))
+
+        ids = []
+        results.append(_timed("bulk_create_contracts", rows, lambda: ids.extend(bulk_create_contracts(db, items, user_id))))
+        results.append(_timed("bulk_delete_contracts", rows, lambda: bulk_delete_contracts(db, ids, user_id)))
+        return results
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    rows = main(args.rows)
+    print(f"{'operation':>26} {'rows':>7} {'seconds':>8} {'rows/s':>8}")
+    for row in rows:
+        print(f"{row['operation']:>26} {row['rows']:>7} {row['seconds']:>8} {row['rows_per_second']:>8}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
@@ -0,0 +1,139 @@
+"""
+Check that LLM calls do not block the event loop: concurrent /extract
+requests must overlap with each other and with GET /api/contracts.
+
+The API runs under uvicorn in a subprocess (one worker, so one event loop)
+with OPENAI_BASE_URL pointed at a local fake server that takes --latency
+seconds per completion. After one warm-up extraction (which pays for
+starting the parser pool and the model client), --extracts distinct
+documents are extracted concurrently while a client lists contracts in a
+loop. The run fails
+(exit status 1) if the extractions took more than twice the time of one
+(they ran one after another), or if a list request issued during them took
+more than half the LLM latency (it waited behind an LLM call).
+
+Run with: python -m backend.benchmarks.concurrency [--latency 1.0] [--extracts 8] [--json out.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from backend.benchmarks.corpus import build_corpus
+from backend.benchmarks.end_to_end import PASSWORD, _checked, _wait_until_up
+from backend.benchmarks.fake_openai import FakeOpenAIServer, _free_port
+
+
+async def measure(base_url: str, corpus: list, latency: float) -> dict:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        _checked(await client.post("/api/auth/signup", json={
+            "email": "overlap@example.com", "username": "overlap", "password": PASSWORD,
+        }))
+        login = await client.post("/api/auth/login", data={"username": "overlap", "password": PASSWORD})
+        client.headers["Authorization"] = f"Bearer {_checked(login).json()['access_token']}"
+        async def extract(doc):
+            _checked(await client.post("/api/contracts/extract", files={"file": (doc.file_name, doc.content)}))
+
+        # Warm up the parser pool, model client and connection pools
+        await extract(corpus[-1])
+        _checked(await client.get("/api/contracts", params={"limit": 20}))
+
+        start = time.perf_counter()
+        extracts = asyncio.gather(*(extract(doc) for doc in corpus[:-1]))
+        done = [False]
+        extracts.add_done_callback(lambda _: done.__setitem__(0, True))
+
+        list_ms = []
+        await asyncio.sleep(min(latency / 4, 0.25))
+        while not done[0]:
+            issued = time.perf_counter()
+            _checked(await client.get("/api/contracts", params={"limit": 20}))
+            if not done[0]:
+                list_ms.append((time.perf_counter() - issued) * 1000)
+            await asyncio.sleep(0.05)
+        await extracts
+        extract_s = time.perf_counter() - start
+
+    return {
+        "extracts": len(corpus) - 1,
+        "latency_s": latency,
+        "extract_wall_s": round(extract_s, 2),
+        "serial_extract_s": round(latency * (len(corpus) - 1), 2),
+        "lists_during_extracts": len(list_ms),
+        "list_max_ms": round(max(list_ms), 1) if list_ms else None,
+    }
+
+
+def failures(result: dict) -> list:
+    """Messages for every way the run shows requests running one after another."""
+    messages = []
+    if result["extracts"] > 1 and result["extract_wall_s"] > 2 * result["latency_s"] + 1:
+        messages.append(
+            f"{result['extracts']} concurrent extractions took {result['extract_wall_s']} s "
+            f"(one takes about {result['latency_s']} s)"
+        )
+    if not result["lists_during_extracts"]:
+        messages.append("no GET /api/contracts completed while extractions were in flight")
+    elif result["list_max_ms"] > result["latency_s"] * 1000 / 2:
+        messages.append(f"GET /api/contracts took up to {result['list_max_ms']} ms during extractions")
+    return messages
+
+
+def main(args) -> dict:
+    corpus = build_corpus([2_000], args.extracts + 1, ["docx"], args.seed)
+    tmp = tempfile.TemporaryDirectory()
+    with FakeOpenAIServer(latency=args.latency) as fake_server:
+        env = {
+            **os.environ,
+            "OPENAI_API_KEY": "benchmark",
+            "OPENAI_BASE_URL": fake_server.base_url,
+            "EXTRACTION_CACHE_BACKEND": "none",
+            "JOB_WORKERS": "0",
+            "LOG_LEVEL": "WARNING",
+        }
+        env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tmp.name, 'concurrency_bench.db')}")
+        env.setdefault("RETRIEVAL_INDEX_PATH", os.path.join(tmp.name, "index.db"))
+        env.setdefault("BCRYPT_ROUNDS", "4")
+
+        port = _free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.main:app",
+             "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+            env=env,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_until_up(base_url, server)
+            return asyncio.run(measure(base_url, corpus, args.latency))
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+            tmp.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=1.0, help="fake LLM latency per call (s)")
+    parser.add_argument("--extracts", type=int, default=8, help="concurrent extractions")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    result = main(args)
+    for key, value in result.items():
+        print(f"{key:>22}: {value}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
+
+    problems = failures(result)
+    for message in problems:
+        print(f"FAIL {message}")
+    print("FAIL" if problems else "OK: extractions and list requests overlapped")
+    sys.exit(1 if problems else 0)
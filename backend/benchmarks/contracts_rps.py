@@ -0,0 +1,215 @@
+"""
+Contract routes under concurrent load: sustained requests per second and
+latency for the async routes against the previous sync implementation.
+
+The API runs under uvicorn in a subprocess against a throwaway SQLite database
+seeded with contracts. The previous handlers (sync ``def`` reads on the
+threadpool, upload calling the sync service on the event loop) are mounted
+under ``/sync`` next to the real routes so both run against the same server
+and data. Each client loops over a mix of list/get/renewals/upload requests
+for a fixed duration.
+
+Run with: python -m backend.benchmarks.contracts_rps [--concurrency 64] [--duration 10] [--json out.json]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp.name, 'rps_bench.db')}")
+os.environ.setdefault("RETRIEVAL_INDEX_PATH", os.path.join(_tmp.name, "index.db"))
+os.environ.setdefault("JOB_WORKERS", "0")
+
+from datetime import date, datetime, timedelta  # noqa: E402
+
+from fastapi import APIRouter, Depends, HTTPException  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.database import get_db  # noqa: E402
+from backend.models.user import User  # noqa: E402
+from backend.schemas.contract import ContractCreate  # noqa: E402
+from backend.services.contract_service import (  # noqa: E402
+    create_contract,
+    get_contract_by_id,
+    get_upcoming_renewals,
+    list_user_contracts,
+)
+from backend.utils.auth import get_current_user  # noqa: E402
+
+SEED_CONTRACTS = 2000
+
+# Weighted request mix: (name, weight)
+MIX = [("list", 4), ("get", 4), ("renewals", 1), ("upload", 1)]
+
+
+def sync_router() -> APIRouter:
+    """The contract handlers as they were before the async session path."""
+    router = APIRouter(prefix="/sync/contracts")
+
+    @router.post("/upload")
+    async def upload(contract_data: ContractCreate, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+        contract = create_contract(db, contract_data.dict(exclude={"file_name"}), contract_data.file_name, user.id)
+        return {"id": contract.id}
+
+    @router.get("")
+    def contracts(limit: int = 20, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+        rows, _ = list_user_contracts(db, user.id, limit=limit)
+        return [{"id": row.id, "file_name": row.file_name} for row in rows]
+
+    @router.get("/renewals")
+    def renewals(days: int = 90, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+        return [{"id": row.id} for row in get_upcoming_renewals(db, user.id, days)]
+
+    @router.get("/{contract_id}")
+    def contract(contract_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+        row = get_contract_by_id(db, contract_id, user.id)
+        if not row:
+            raise HTTPException(status_code=404, detail="Contract not found")
+        return {"id": row.id, "file_name": row.file_name}
+
+    return router
+
+
+def create_app():
+    """uvicorn factory: the real app plus the sync baseline routes."""
+    from backend.main import app
+
+    app.include_router(sync_router())
+    return app
+
+
+def seed(contracts: int) -> str:
+    """Create a user with ``contracts`` contracts; returns a bearer token."""
+    from backend.database import SessionLocal, init_db
+    from backend.models.contract import Contract
+    from backend.utils.auth import create_access_token
+
+    init_db()
+    db = SessionLocal()
+    try:
+        user = User(email="rps@example.com", username="rps")
+        db.add(user)
+        db.flush()
+        today = date.today()
+        db.add_all([
+            Contract(
+                user_id=user.id,
+                file_name=f"contract-{i}.pdf",
+                contact_name=f"Counterparty {i % 200}",
+                start_date=today - timedelta(days=i % 700),
+                end_date=today + timedelta(days=i % 700),
+                contract_value=float(1000 + i),
+                summary="Master services agreement.",
+                created_at=datetime(2024, 1, 1) + timedelta(minutes=i),
+            )
+            for i in range(contracts)
+        ])
+        db.commit()
+        return create_access_token({"sub": str(user.id)})
+    finally:
+        db.close()
+
+
+def _request(client, prefix: str, kind: str, n: int):
+    if kind == "list":
+        return client.get(f"{prefix}?limit=20")
+    if kind == "get":
+        return client.get(f"{prefix}/{n % SEED_CONTRACTS + 1}")
+    if kind == "renewals":
+        return client.get(f"{prefix}/renewals?days=30")
+    return client.post(f"{prefix}/upload", json={
+        "file_name": f"bench-{n}.pdf",
+        "contact_name": "Bench Corp",
+        "start_date": "2025-01-01",
+        "end_date": "2026-01-01",
+        "contract_value": 5000.0,
+    })
+
+
+async def run_case(base_url: str, prefix: str, token: str, concurrency: int, duration: float) -> dict:
+    import httpx
+
+    kinds = list(itertools.chain.from_iterable([kind] * weight for kind, weight in MIX))
+    timings, errors = [], [0]
+    counter = itertools.count()
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(client):
+        while time.perf_counter() < deadline:
+            n = next(counter)
+            start = time.perf_counter()
+            response = await _request(client, prefix, kinds[n % len(kinds)], n)
+            if response.status_code != 200:
+                errors[0] += 1
+            timings.append((time.perf_counter() - start) * 1000)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=60, limits=limits) as client:
+        # Warm up connections, the principal cache and both engines
+        await asyncio.gather(*[_request(client, prefix, "list", i) for i in range(concurrency)])
+        start = time.perf_counter()
+        await asyncio.gather(*[client_loop(client) for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+
+    values = sorted(timings)
+    return {
+        "requests": len(values),
+        "errors": errors[0],
+        "rps": round(len(values) / elapsed, 1),
+        "p50_ms": round(statistics.median(values), 1),
+        "p99_ms": round(values[min(int(len(values) * 0.99), len(values) - 1)], 1),
+    }
+
+
+def main(concurrency: int, duration: float) -> list:
+    from backend.benchmarks.fake_openai import _free_port
+
+    token = seed(SEED_CONTRACTS)
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "--factory", "backend.benchmarks.contracts_rps:create_app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        env=os.environ.copy(),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        import httpx
+
+        for _ in range(300):
+            try:
+                httpx.get(f"{base_url}/health", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        results = []
+        for label, prefix in (("sync (threadpool)", "/sync/contracts"), ("async session", "/api/contracts")):
+            result = asyncio.run(run_case(base_url, prefix, token, concurrency, duration))
+            results.append({"routes": label, "concurrency": concurrency, **result})
+        return results
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=64, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per variant")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    rows = main(args.concurrency, args.duration)
+    print(f"{'routes':>18} {'requests':>9} {'errors':>7} {'RPS':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for row in rows:
+        print(f"{row['routes']:>18} {row['requests']:>9} {row['errors']:>7} {row['rps']:>8} {row['p50_ms']:>8} {row['p99_ms']:>8}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
@@ -0,0 +1,183 @@
+"""
+Synthetic contract corpus: PDF and DOCX files of varied sizes with known
+field values, generated from a seed so every run sees the same documents.
+
+The field lines use the labels the fake OpenAI server looks for, so
+extraction results can be checked against ``SyntheticDocument.expected``.
+
+Run with: python -m backend.benchmarks.corpus --out corpus/ [--sizes 2000,20000,100000] [--per-size 4]
+"""
+import argparse
+import io
+import os
+import random
+import textwrap
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+SIZES = [2_000, 20_000, 100_000]
+FORMATS = ["pdf", "docx"]
+
+FIRST_NAMES = ["Sarah", "David", "Maria", "James", "Priya", "Tom", "Elena", "Kwame", "Li", "Olivia"]
+LAST_NAMES = ["Johnson", "Okafor", "Garcia", "Smith", "Patel", "Novak", "Rossi", "Mensah", "Chen", "Brown"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Vandelay", "Soylent", "Tyrell"]
+PAYMENT_TERMS = [
+    "Net 30 from the date of invoice.",
+    "Monthly installments due within 15 days of invoice.",
+    "Quarterly in advance.",
+    "50% on signature, 50% on delivery.",
+]
+TERMINATION_TERMS = [
+    "Either party may terminate with 60 days written notice.",
+    "Either party may terminate for material breach not cured within 30 days.",
+    "The Client may terminate for convenience with 90 days notice.",
+]
+CLAUSES = [
+    "The Provider shall perform the Services in a professional manner consistent with industry standards.",
+    "Each party shall keep the other party's Confidential Information secret and use it only for this Agreement.",
+    "The Provider shall indemnify the Client against third-party claims arising from the Provider's negligence.",
+    "Neither party shall be liable for indirect or consequential damages, including loss of profits.",
+    "This Agreement is governed by the laws of the State of New York.",
+    "The Provider shall maintain commercial general liability insurance of at least $1,000,000 per occurrence.",
+    "Any dispute shall first be referred to senior management of both parties for resolution.",
+    "Neither party may assign this Agreement without the prior written consent of the other party.",
+]
+
+
+@dataclass
+class SyntheticDocument:
+    file_name: str
+    content: bytes
+    format: str
+    chars: int
+    expected: dict = field(default_factory=dict)
+
+
+def contract_text(rng: random.Random, size: int) -> tuple:
+    """``(text, expected fields)`` for a contract of about ``size`` characters.
+
+    Parties and dates are near the start, money and exit terms near the end,
+    as in real agreements.
+    """
+    start = date(2023, 1, 1) + timedelta(days=rng.randrange(900))
+    end = start + timedelta(days=rng.choice([365, 730, 1095]))
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    company = rng.choice(COMPANIES)
+    expected = {
+        "contact_name": name,
+        "contact_email": f"{name.split()[0].lower()}@{company.lower()}.example.com",
+        "contact_phone": f"+1 555 {rng.randrange(100, 999)} {rng.randrange(1000, 9999)}",
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "contract_value": float(rng.randrange(5, 500) * 1000),
+        "payment_terms": rng.choice(PAYMENT_TERMS),
+        "termination_terms": rng.choice(TERMINATION_TERMS),
+    }
+    head = (
+        f"MASTER SERVICES AGREEMENT - {company.upper()} INC.\n\n"
+        f"Primary Contact: {expected['contact_name']}\n"
+        f"Email: {expected['contact_email']}\n"
+        f"Phone: {expected['contact_phone']}\n"
+        f"Effective Date: {expected['start_date']}\n\n"
+    )
+    tail = (
+        f"\n\nContract Value: ${expected['contract_value']:,.0f}\n"
+        f"Payment Terms: {expected['payment_terms']}\n"
+        f"Termination: {expected['termination_terms']}\n"
+        f"Expiration Date: {expected['end_date']}\n\n"
+    )
+    body_chars = max(size - len(head) - len(tail), 0)
+    paragraphs, length, clause = [], 0, 1
+    while length < body_chars:
+        paragraph = f"{clause}. " + " ".join(rng.choice(CLAUSES) for _ in range(4)) + "\n\n"
+        paragraphs.append(paragraph)
+        length += len(paragraph)
+        clause += 1
+    body = "".join(paragraphs)[:body_chars]
+    return head + body + tail, expected
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text: str, line_chars: int = 95, lines_per_page: int = 60) -> bytes:
+    """A minimal multi-page PDF with ``text`` in Helvetica, one object per page."""
+    lines = []
+    for paragraph in text.split("\n"):
+        lines.extend(textwrap.wrap(paragraph, line_chars) or [""])
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    font_id = 3 + 2 * len(pages)
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(len(pages)))}] /Count {len(pages)} >>",
+    ]
+    for i, page in enumerate(pages):
+        stream = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in page) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def make_docx(text: str) -> bytes:
+    from docx import Document
+
+    document = Document()
+    for paragraph in text.split("\n\n"):
+        document.add_paragraph(paragraph.strip("\n"))
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def build_corpus(sizes=SIZES, per_size: int = 4, formats=FORMATS, seed: int = 0) -> list:
+    """``per_size`` distinct documents for each size and format."""
+    rng = random.Random(seed)
+    documents = []
+    for size in sizes:
+        for fmt in formats:
+            for i in range(per_size):
+                text, expected = contract_text(rng, size)
+                content = make_pdf(text) if fmt == "pdf" else make_docx(text)
+                documents.append(SyntheticDocument(
+                    file_name=f"contract-{size}-{i}.{fmt}",
+                    content=content,
+                    format=fmt,
+                    chars=len(text),
+                    expected=expected,
+                ))
+    return documents
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", required=True, help="directory to write the documents to")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma-separated sizes in characters")
+    parser.add_argument("--per-size", type=int, default=4, help="documents per size and format")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    corpus = build_corpus(
+        [int(size) for size in args.sizes.split(",")], args.per_size, args.formats.split(","), args.seed
+    )
+    for doc in corpus:
+        with open(os.path.join(args.out, doc.file_name), "wb") as f:
+            f.write(doc.content)
+    print(f"Wrote {len(corpus)} documents ({sum(len(doc.content) for doc in corpus) / 1e6:.1f} MB) to {args.out}")
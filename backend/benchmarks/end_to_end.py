@@ -0,0 +1,364 @@
+"""
+End-to-end benchmark suite: drives the API over HTTP with a synthetic PDF/DOCX
+corpus and a local fake OpenAI server, so it runs offline and spends no tokens.
+
+The API runs under uvicorn in a subprocess against a throwaway SQLite database
+(or DATABASE_URL if set), with OPENAI_BASE_URL pointed at the fake server. One
+user signs up and logs in, a base of contracts is loaded through the bulk
+endpoint, then each operation runs a fixed number of requests at the given
+concurrency:
+
+- extract: every corpus document once (distinct documents, so the extraction
+  cache never hits); the report includes, per model tier, the documents
+  routed to it, calls, escalations, mean call latency and estimated cost,
+  read from the API's /metrics
+- upload, list: --requests each
+- export: --export-requests CSV exports, read to the end
+- chat: --chat-requests distinct questions (chat cache off unless
+  CHAT_CACHE_ENABLED is set)
+
+Throughput and p50/p95/p99 latency per operation are printed and optionally
+written as JSON. ``--baseline`` compares against an earlier JSON file and exits
+with status 1 if any operation's p95 or throughput regressed by more than
+``--tolerance``, or it saw more errors; ``--from-json`` compares a saved run
+instead of running again.
+
+Run with: python -m backend.benchmarks.end_to_end [--latency 0.3] [--jitter 0.1] [--concurrency 16] [--bad-fast-replies 0.1] [--json out.json] [--baseline old.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from backend.benchmarks.corpus import FORMATS, SIZES, build_corpus
+from backend.benchmarks.fake_openai import FakeOpenAIServer, _free_port
+
+PASSWORD = "benchmark password"
+CHECKED_FIELDS = ["contact_email", "start_date", "end_date", "contract_value"]
+
+
+def percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile of already sorted ``values``."""
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+def summarize(operation: str, timings: list, errors: int, elapsed: float) -> dict:
+    values = sorted(timings)
+    row = {"operation": operation, "requests": len(values) + errors, "errors": errors}
+    if not values:
+        return row
+    row.update(
+        throughput_rps=round(len(values) / elapsed, 2),
+        p50_ms=round(percentile(values, 0.50), 1),
+        p95_ms=round(percentile(values, 0.95), 1),
+        p99_ms=round(percentile(values, 0.99), 1),
+        max_ms=round(values[-1], 1),
+    )
+    return row
+
+
+async def run_phase(operation: str, requests: list, concurrency: int) -> tuple:
+    """Run the ``requests`` (zero-argument coroutine factories) ``concurrency`` at a time.
+
+    Returns the summary row and the results of the successful requests.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    timings, errors, results = [], [0], []
+
+    async def one(request):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await request()
+            except Exception:
+                errors[0] += 1
+                return
+            timings.append((time.perf_counter() - start) * 1000)
+            results.append(result)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(request) for request in requests])
+    return summarize(operation, timings, errors[0], time.perf_counter() - start), results
+
+
+def _checked(response):
+    response.raise_for_status()
+    return response
+
+
+def field_recall(details: dict, expected: dict) -> float:
+    found = sum(1 for name in CHECKED_FIELDS if details.get(name) == expected[name])
+    return found / len(CHECKED_FIELDS)
+
+
+def _samples(metrics_text: str) -> list:
+    """``(name, labels, value)`` for every sample in a Prometheus text exposition."""
+    samples = []
+    for line in metrics_text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        series, value = line.rsplit(" ", 1)
+        name, _, labels = series.partition("{")
+        pairs = [pair.split("=", 1) for pair in labels.rstrip("}").split(",") if pair]
+        samples.append((name, {key: raw.strip('"') for key, raw in pairs}, float(value)))
+    return samples
+
+
+def tier_report(metrics_text: str) -> dict:
+    """Per-tier routing, escalation, latency and cost figures from the extraction metrics."""
+    tiers = {}
+
+    def add(tier, key, value):
+        row = tiers.setdefault(tier, {"documents": 0, "calls": 0, "escalations": 0, "avg_ms": None, "cost_usd": 0.0})
+        row[key] += value
+
+    seconds = {}
+    for name, labels, value in _samples(metrics_text):
+        tier = labels.get("tier")
+        if name == "extraction_routed_total":
+            add(tier, "documents", int(value))
+        elif name == "extraction_escalations_total":
+            add(tier, "escalations", int(value))
+        elif name == "extraction_tier_cost_usd_total":
+            add(tier, "cost_usd", value)
+        elif name == "extraction_tier_duration_seconds_count":
+            add(tier, "calls", int(value))
+        elif name == "extraction_tier_duration_seconds_sum":
+            seconds[tier] = value
+    for tier, row in tiers.items():
+        if row["calls"]:
+            row["avg_ms"] = round(seconds.get(tier, 0.0) / row["calls"] * 1000, 1)
+        row["cost_usd"] = round(row["cost_usd"], 4)
+    return tiers
+
+
+def _seed_rows(count: int) -> list:
+    return [
+        {
+            "file_name": f"seed-{i}.pdf",
+            "contact_name": f"Counterparty {i % 200}",
+            "contact_email": f"legal{i % 200}@example.com",
+            "start_date": f"{2023 + i % 3}-{i % 12 + 1:02d}-01",
+            "end_date": f"{2025 + i % 3}-{i % 12 + 1:02d}-01",
+            "contract_value": float(1000 + i),
+            "payment_terms": "Net 30",
+            "summary": "Master services agreement.",
+        }
+        for i in range(count)
+    ]
+
+
+async def run_suite(base_url: str, fake, corpus: list, args) -> list:
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as client:
+        _checked(await client.post("/api/auth/signup", json={
+            "email": "bench@example.com", "username": "bench", "password": PASSWORD,
+        }))
+        login = await client.post("/api/auth/login", data={"username": "bench", "password": PASSWORD})
+        client.headers["Authorization"] = f"Bearer {_checked(login).json()['access_token']}"
+
+        seed_rows = _seed_rows(args.seed_contracts)
+        for start in range(0, len(seed_rows), 5000):
+            _checked(await client.post("/api/contracts/bulk", json={"contracts": seed_rows[start:start + 5000]}))
+
+        results = []
+
+        async def extract(doc):
+            response = _checked(await client.post("/api/contracts/extract", files={"file": (doc.file_name, doc.content)}))
+            return doc, response.json()
+
+        fake.reset()
+        row, extracted = await run_phase("extract", [lambda doc=doc: extract(doc) for doc in corpus], args.concurrency)
+        if extracted:
+            row["field_recall"] = round(sum(field_recall(details, doc.expected) for doc, details in extracted) / len(extracted), 3)
+        results.append({**row, "llm_calls": fake.calls, "tiers": tier_report((await client.get("/metrics")).text)})
+
+        details = [d for _, d in extracted] or _seed_rows(1)
+
+        async def upload(n):
+            body = {**details[n % len(details)], "file_name": f"upload-{n}.pdf"}
+            return _checked(await client.post("/api/contracts/upload", json=body))
+
+        row, _ = await run_phase("upload", [lambda n=n: upload(n) for n in range(args.requests)], args.concurrency)
+        results.append(row)
+
+        async def list_page():
+            return _checked(await client.get("/api/contracts", params={"limit": 20}))
+
+        row, _ = await run_phase("list", [list_page] * args.requests, args.concurrency)
+        results.append(row)
+
+        async def export():
+            async with client.stream("GET", "/api/contracts/export/csv") as response:
+                _checked(response)
+                return sum([len(chunk) async for chunk in response.aiter_bytes()])
+
+        row, sizes = await run_phase("export", [export] * args.export_requests, min(args.concurrency, 4))
+        if sizes:
+            row["bytes"] = max(sizes)
+        results.append(row)
+
+        async def chat(n):
+            question = f"Question {n}: which contracts with Counterparty {n % 200} renew in month {n % 12 + 1}?"
+            return _checked(await client.post("/api/analytics/chat", json={"message": question}))
+
+        fake.reset()
+        row, _ = await run_phase("chat", [lambda n=n: chat(n) for n in range(args.chat_requests)], args.concurrency)
+        results.append({**row, "llm_calls": fake.calls})
+    return results
+
+
+def _wait_until_up(base_url: str, server: subprocess.Popen):
+    import httpx
+
+    for _ in range(300):
+        if server.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        try:
+            httpx.get(f"{base_url}/health", timeout=1)
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError("API server did not start")
+
+
+def main(args) -> dict:
+    corpus = build_corpus(args.sizes, args.per_size, args.formats, args.seed)
+    tmp = tempfile.TemporaryDirectory()
+    bad_reply_rate = {os.environ.get("EXTRACTION_MODEL_FAST", "gpt-4o-mini"): args.bad_fast_replies}
+    with FakeOpenAIServer(latency=args.latency, jitter=args.jitter, bad_reply_rate=bad_reply_rate) as fake_server:
+        env = {
+            **os.environ,
+            "OPENAI_API_KEY": "benchmark",
+            "OPENAI_BASE_URL": fake_server.base_url,
+            "JOB_WORKERS": "0",
+            "LOG_LEVEL": "WARNING",
+        }
+        env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tmp.name, 'e2e_bench.db')}")
+        env.setdefault("RETRIEVAL_INDEX_PATH", os.path.join(tmp.name, "index.db"))
+        env.setdefault("CHAT_CACHE_ENABLED", "false")
+        env.setdefault("BCRYPT_ROUNDS", "4")
+
+        port = _free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.main:app",
+             "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+            env=env,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_until_up(base_url, server)
+            results = asyncio.run(run_suite(base_url, fake_server.fake, corpus, args))
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+            tmp.cleanup()
+
+    return {
+        "config": {
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "concurrency": args.concurrency,
+            "documents": len(corpus),
+            "sizes": args.sizes,
+            "formats": args.formats,
+            "requests": args.requests,
+            "export_requests": args.export_requests,
+            "chat_requests": args.chat_requests,
+            "seed_contracts": args.seed_contracts,
+            "seed": args.seed,
+            "bad_fast_replies": args.bad_fast_replies,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list:
+    """Regression messages for operations that got slower, lost throughput or saw more errors."""
+    previous = {row["operation"]: row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = previous.get(row["operation"])
+        if old is None:
+            continue
+        name = row["operation"]
+        if row["errors"] > old["errors"]:
+            regressions.append(f"{name}: errors {old['errors']} -> {row['errors']}")
+        if "p95_ms" in old and row.get("p95_ms", float("inf")) > old["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {old['p95_ms']} ms -> {row.get('p95_ms')} ms")
+        if "throughput_rps" in old and row.get("throughput_rps", 0) < old["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {old['throughput_rps']} -> {row.get('throughput_rps')} req/s")
+    return regressions
+
+
+def print_results(report: dict, baseline: dict = None):
+    previous = {row["operation"]: row for row in (baseline or {"results": []})["results"]}
+    print(f"{'operation':>10} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'p95 vs base':>12}")
+    for row in report["results"]:
+        old = previous.get(row["operation"], {})
+        delta = ""
+        if old.get("p95_ms") and row.get("p95_ms") is not None:
+            delta = f"{(row['p95_ms'] / old['p95_ms'] - 1) * 100:+.0f}%"
+        print(
+            f"{row['operation']:>10} {row['requests']:>9} {row['errors']:>7} {row.get('throughput_rps', '-'):>8} "
+            f"{row.get('p50_ms', '-'):>8} {row.get('p95_ms', '-'):>8} {row.get('p99_ms', '-'):>8} {delta:>12}"
+        )
+    tiers = next((row["tiers"] for row in report["results"] if row.get("tiers")), None)
+    if tiers:
+        print(f"\n{'tier':>10} {'documents':>9} {'calls':>7} {'escalated':>9} {'avg ms':>8} {'cost USD':>9}")
+        for tier, row in tiers.items():
+            print(
+                f"{tier:>10} {row['documents']:>9} {row['calls']:>7} {row['escalations']:>9} "
+                f"{row['avg_ms'] if row['avg_ms'] is not None else '-':>8} {row['cost_usd']:>9}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.3, help="fake LLM latency per call (s)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="+/- latency jitter (s)")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent requests per operation")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="document sizes in characters")
+    parser.add_argument("--per-size", type=int, default=4, help="documents per size and format")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--requests", type=int, default=200, help="upload and list requests")
+    parser.add_argument("--export-requests", type=int, default=10)
+    parser.add_argument("--chat-requests", type=int, default=50)
+    parser.add_argument("--seed-contracts", type=int, default=2000, help="contracts loaded before the run")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    parser.add_argument("--bad-fast-replies", type=float, default=0.0,
+                        help="fraction of fast-tier extraction replies that fail validation")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    parser.add_argument("--baseline", help="earlier results to compare against")
+    parser.add_argument("--from-json", help="compare these saved results instead of running")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    args = parser.parse_args()
+    args.sizes = [int(size) for size in args.sizes.split(",")]
+    args.formats = args.formats.split(",")
+
+    if args.from_json:
+        with open(args.from_json) as f:
+            report = json.load(f)
+    else:
+        report = main(args)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_results(report, baseline)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(baseline, report, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,114 @@
+"""
+Export benchmark: time to first byte, total time, output size and peak RSS of
+the CSV/Parquet/XLSX exports over a large synthetic contract table.
+
+Each format runs in a fresh subprocess so peak memory is measured per format.
+
+Run with: python -m backend.benchmarks.export [--rows 1000000] [--formats csv,parquet,xlsx] [--json out.json]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+SEED_BATCH = 20_000
+
+
+def seed(rows: int):
+    """Insert ``rows`` synthetic contracts for user 1."""
+    from sqlalchemy import insert
+
+    from backend.database import engine, init_db
+    from backend.models.contract import Contract
+
+    init_db()
+    start = date(2020, 1, 1)
+    created = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        for offset in range(0, rows, SEED_BATCH):
+            conn.execute(insert(Contract), [
+                {
+                    "user_id": 1,
+                    "file_name": f"contract-{i}.pdf",
+                    "contact_name": f"Counterparty {i % 5000}",
+                    "contact_email": f"legal{i % 5000}@example.com",
+                    "contact_phone": "+1 555 0100",
+                    "start_date": start + timedelta(days=i % 1500),
+                    "end_date": start + timedelta(days=i % 1500 + 365),
+                    "contract_value": float(1000 + i % 250_000),
+                    "payment_terms": "Net 30, monthly in arrears",
+                    "termination_terms": "Either party may terminate with 60 days written notice",
+                    "summary": "Master services agreement for software development and support services.",
+                    "created_at": created + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + SEED_BATCH, rows))
+            ])
+
+
+def run_worker(export_format: str) -> dict:
+    import backend.models.user  # noqa: F401  (mapper configuration needs every model)
+    from backend.services.export_service import EXPORTERS
+
+    start = time.perf_counter()
+    first_byte = None
+    size = 0
+    for chunk in EXPORTERS[export_format](1):
+        if first_byte is None and chunk:
+            first_byte = time.perf_counter() - start
+        size += len(chunk)
+    return {
+        "format": export_format,
+        "first_byte_s": round(first_byte, 3),
+        "total_s": round(time.perf_counter() - start, 2),
+        "mb": round(size / 1024 / 1024, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main(rows: int, formats: list) -> list:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'export_bench.db')}",
+            "RETRIEVAL_INDEX_PATH": os.path.join(tmp, "index.db"),
+        }
+        subprocess.run([sys.executable, "-m", "backend.benchmarks.export", "--seed", str(rows)], env=env, check=True)
+        results = []
+        for export_format in formats:
+            output = subprocess.run(
+                [sys.executable, "-m", "backend.benchmarks.export", "--worker", export_format],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            results.append({"rows": rows, **json.loads(output.strip().splitlines()[-1])})
+        return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--formats", default="csv,parquet,xlsx")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    parser.add_argument("--seed", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        seed(args.seed)
+    elif args.worker:
+        print(json.dumps(run_worker(args.worker)))
+    else:
+        rows = main(args.rows, args.formats.split(","))
+        print(f"{'format':>8} {'rows':>9} {'1st byte s':>10} {'total s':>8} {'MB':>7} {'peak RSS MB':>12}")
+        for row in rows:
+            print(
+                f"{row['format']:>8} {row['rows']:>9} {row['first_byte_s']:>10} {row['total_s']:>8} "
+                f"{row['mb']:>7} {row['peak_rss_mb']:>12}"
+            )
+        if args.json_path:
+            with open(args.json_path, "w") as f:
+                json.dump(rows, f, indent=2)
@@ -0,0 +1,218 @@
+"""
+Local stand-in for the OpenAI chat completions API used by the benchmarks.
+
+Replies are derived from the prompt with simple regexes, so results are
+deterministic and no tokens are spent. A forced function call (``tool_choice``)
+is answered with the reply as the call's arguments. Latency and jitter are
+configurable; with ``stream=True`` the latency applies to the first token and
+later tokens arrive every ``token_interval`` seconds. ``bad_reply_rate`` maps
+model names to the fraction of their extraction replies that come back
+without a summary, which fails validation and exercises tier escalation.
+"""
+import asyncio
+import json
+import random
+import re
+import socket
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+FIELD_PATTERNS = {
+    "contact_name": re.compile(r"Primary Contact:\s*(.+)"),
+    "contact_email": re.compile(r"Email:\s*(\S+@\S+)"),
+    "contact_phone": re.compile(r"Phone:\s*([+\d][\d\s().-]{6,}\d)"),
+    "start_date": re.compile(r"Effective Date:\s*(\d{4}-\d{2}-\d{2})"),
+    "end_date": re.compile(r"Expiration Date:\s*(\d{4}-\d{2}-\d{2})"),
+    "contract_value": re.compile(r"Contract Value:\s*\$?([\d,]+(?:\.\d+)?)"),
+    "payment_terms": re.compile(r"Payment Terms:\s*(.+)"),
+    "termination_terms": re.compile(r"Termination:\s*(.+)"),
+}
+
+
+def fake_extraction(document: str) -> dict:
+    result = {}
+    for field, pattern in FIELD_PATTERNS.items():
+        match = pattern.search(document)
+        value = match.group(1).strip() if match else None
+        if field == "contract_value" and value is not None:
+            value = float(value.replace(",", ""))
+        result[field] = value
+    result["summary"] = f"Synthetic service agreement ({len(document)} chars of text)."
+    return result
+
+
+class FakeOpenAI:
+    """ASGI app plus call/token counters."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: int = 0,
+        token_interval: float = 0.02,
+        bad_reply_rate: dict = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.token_interval = token_interval
+        self.bad_reply_rate = bad_reply_rate or {}
+        self._random = random.Random(seed)
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.streams_cancelled = 0
+        self.app = FastAPI()
+        self.app.post("/v1/chat/completions")(self._completions)
+
+    def reset(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.streams_cancelled = 0
+
+    def reply_for(self, messages: list, model: str = None) -> str:
+        prompt = messages[-1]["content"]
+        if "Document text:" in prompt:
+            document = prompt.split("Document text:", 1)[1]
+            details = fake_extraction(document)
+            if self._random.random() < self.bad_reply_rate.get(model, 0.0):
+                details["summary"] = None
+            return json.dumps(details)
+        if "summaries of consecutive parts" in prompt:
+            return "Synthetic service agreement combined from several parts."
+        return "Based on the contracts provided, here is a synthetic answer."
+
+    async def _completions(self, request: Request):
+        body = await request.json()
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        await asyncio.sleep(max(delay, 0.0))
+
+        content = self.reply_for(body["messages"], body.get("model"))
+        prompt_tokens = sum(len(m.get("content") or "") for m in body["messages"]) // 4
+        completion_tokens = len(content) // 4
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        tool = _forced_tool(body)
+        if body.get("stream"):
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            }
+            return StreamingResponse(self._stream(body, content, usage, tool), media_type="text/event-stream")
+        return {
+            "id": f"chatcmpl-fake-{self.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "tool_calls" if tool else "stop",
+                "message": _message(content, tool),
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+
+    async def _stream(self, body: dict, content: str, usage: dict, tool: str = None):
+        words = re.findall(r"\S+\s*", content)
+        try:
+            for i, word in enumerate(words):
+                if i:
+                    await asyncio.sleep(self.token_interval)
+                if tool:
+                    call = {"index": 0, "function": {"arguments": word}}
+                    if not i:
+                        call.update(id="call_fake", type="function", function={"name": tool, "arguments": word})
+                    delta = {"tool_calls": [call]}
+                else:
+                    delta = {"content": word}
+                chunk = {
+                    "id": f"chatcmpl-fake-{self.calls}",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+            if (body.get("stream_options") or {}).get("include_usage"):
+                final = {
+                    "id": f"chatcmpl-fake-{self.calls}",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [],
+                    "usage": usage,
+                }
+                yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+        except asyncio.CancelledError:
+            self.streams_cancelled += 1
+            raise
+
+
+def _forced_tool(body: dict):
+    """Name of the function the request forces a call to, if any."""
+    choice = body.get("tool_choice")
+    if isinstance(choice, dict):
+        return choice["function"]["name"]
+    return None
+
+
+def _message(content: str, tool: str = None) -> dict:
+    if tool:
+        return {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"id": "call_fake", "type": "function", "function": {"name": tool, "arguments": content}}],
+        }
+    return {"role": "assistant", "content": content}
+
+
+class FakeOpenAIServer:
+    """Runs a FakeOpenAI app with uvicorn on a background thread.
+
+    Usage::
+
+        with FakeOpenAIServer(latency=0.5) as server:
+            settings.OPENAI_BASE_URL = server.base_url
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        port: int = 0,
+        token_interval: float = 0.02,
+        bad_reply_rate: dict = None,
+    ):
+        self.fake = FakeOpenAI(latency=latency, jitter=jitter, token_interval=token_interval, bad_reply_rate=bad_reply_rate)
+        self.port = port or _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}/v1"
+        self._server = uvicorn.Server(uvicorn.Config(self.fake.app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
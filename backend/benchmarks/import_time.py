@@ -0,0 +1,88 @@
+"""
+Import-time profile and startup budget check for ``backend.main``.
+
+Runs ``python -X importtime -c "import backend.main"`` in fresh interpreters,
+prints a per-package breakdown of the fastest run, and exits with status 1 if
+the import exceeds the budget or eagerly loads a dependency that must stay
+lazy (PDF/DOCX parsers, the OpenAI SDK, authlib, export libraries).
+
+Run with: python -m backend.benchmarks.import_time [--budget-ms 1200] [--runs 3] [--json out.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+TARGET = "backend.main"
+# Must only be imported on first use
+LAZY_MODULES = ["PyPDF2", "docx", "openai", "authlib", "pandas", "pyarrow", "openpyxl"]
+DEFAULT_BUDGET_MS = 1200
+
+
+def profile_import(module: str) -> dict:
+    """Import ``module`` in a fresh interpreter; return per-module self/cumulative times in ms."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True, check=True,
+    ).stderr
+
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = {
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        }
+    return modules
+
+
+def breakdown(modules: dict, top: int) -> list:
+    """Self time summed by top-level package, largest first."""
+    totals = defaultdict(float)
+    for name, timing in modules.items():
+        totals[name.split(".")[0]] += timing["self_ms"]
+    rows = sorted(totals.items(), key=lambda item: -item[1])[:top]
+    return [{"package": package, "self_ms": round(ms, 1)} for package, ms in rows]
+
+
+def main(budget_ms: float, runs: int, top: int) -> dict:
+    profiles = [profile_import(TARGET) for _ in range(runs)]
+    best = min(profiles, key=lambda modules: modules[TARGET]["cumulative_ms"])
+    total_ms = best[TARGET]["cumulative_ms"]
+    eager = [name for name in LAZY_MODULES if name in best]
+    return {
+        "target": TARGET,
+        "total_ms": round(total_ms, 1),
+        "budget_ms": budget_ms,
+        "runs_ms": [round(p[TARGET]["cumulative_ms"], 1) for p in profiles],
+        "eagerly_imported": eager,
+        "breakdown": breakdown(best, top),
+        "ok": total_ms <= budget_ms and not eager,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_TIME_BUDGET_MS", DEFAULT_BUDGET_MS)))
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters; the fastest run is reported")
+    parser.add_argument("--top", type=int, default=15, help="packages to list in the breakdown")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    result = main(args.budget_ms, args.runs, args.top)
+    print(f"import {result['target']}: {result['total_ms']} ms (budget {result['budget_ms']} ms, runs {result['runs_ms']})")
+    for row in result["breakdown"]:
+        print(f"  {row['package']:<24} {row['self_ms']:>8} ms")
+    if result["eagerly_imported"]:
+        print(f"FAIL: imported at startup but must be lazy: {', '.join(result['eagerly_imported'])}")
+    elif not result["ok"]:
+        print("FAIL: import time over budget")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
+    sys.exit(0 if result["ok"] else 1)
@@ -0,0 +1,146 @@
+"""
+Login load benchmark: bcrypt logins under a burst, and their effect on an
+unrelated endpoint (GET /api/contracts).
+
+Starts the API with uvicorn on a background thread against a throwaway SQLite
+database, measures GET /api/contracts alone, then again while a burst of
+concurrent logins is running. This is repeated with password hashing on its
+dedicated pool and on Starlette's default threadpool (--compare-workers 0).
+
+Run with: python -m backend.benchmarks.login_load [--logins 200] [--concurrency 64] [--json out.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp.name, 'login_bench.db')}")
+os.environ.setdefault("RETRIEVAL_INDEX_PATH", os.path.join(_tmp.name, "index.db"))
+os.environ.setdefault("JOB_WORKERS", "0")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from backend.benchmarks.fake_openai import _free_port  # noqa: E402
+from backend.config import settings  # noqa: E402
+from backend.database import SessionLocal  # noqa: E402
+from backend.main import app  # noqa: E402
+from backend.models.user import User  # noqa: E402
+from backend.utils.auth import create_access_token, get_password_hash, shutdown_password_hasher  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+
+
+def _summary(timings: list) -> dict:
+    if not timings:
+        return {"count": 0}
+    values = sorted(timings)
+    return {
+        "count": len(values),
+        "p50_ms": round(statistics.median(values), 1),
+        "p99_ms": round(values[min(int(len(values) * 0.99), len(values) - 1)], 1),
+        "max_ms": round(values[-1], 1),
+    }
+
+
+async def _probe(client: httpx.AsyncClient, headers: dict, stop: asyncio.Event, timings: list):
+    """Call the unrelated endpoint back to back until stopped."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/api/contracts", headers=headers)
+        response.raise_for_status()
+        timings.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def _login(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, timings: list, rejected: list):
+    async with semaphore:
+        start = time.perf_counter()
+        response = await client.post("/api/auth/login", data={"username": "bench", "password": PASSWORD})
+        if response.status_code == 503:
+            rejected.append(1)
+            return
+        response.raise_for_status()
+        timings.append((time.perf_counter() - start) * 1000)
+
+
+async def run_case(base_url: str, token: str, logins: int, concurrency: int, idle_seconds: float) -> dict:
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency + 8)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        idle, stop = [], asyncio.Event()
+        probe = asyncio.create_task(_probe(client, headers, stop, idle))
+        await asyncio.sleep(idle_seconds)
+        stop.set()
+        await probe
+
+        login_timings, rejected, loaded = [], [], []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(client, headers, stop, loaded))
+        semaphore = asyncio.Semaphore(concurrency)
+        start = time.perf_counter()
+        await asyncio.gather(*[_login(client, semaphore, login_timings, rejected) for _ in range(logins)])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    return {
+        "logins": {**_summary(login_timings), "rejected_503": len(rejected), "per_second": round(logins / elapsed, 1)},
+        "contracts_idle": _summary(idle),
+        "contracts_during_logins": _summary(loaded),
+    }
+
+
+def main(logins: int, concurrency: int, workers: int, compare_workers: int, idle_seconds: float) -> list:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    db = SessionLocal()
+    try:
+        user = User(email="bench@example.com", username="bench", hashed_password=get_password_hash(PASSWORD))
+        db.add(user)
+        db.commit()
+        token = create_access_token({"sub": str(user.id)})
+    finally:
+        db.close()
+
+    results = []
+    try:
+        for hash_workers in (workers, compare_workers):
+            settings.PASSWORD_HASH_WORKERS = hash_workers
+            shutdown_password_hasher()
+            result = asyncio.run(run_case(f"http://127.0.0.1:{port}", token, logins, concurrency, idle_seconds))
+            label = f"dedicated pool ({hash_workers} threads)" if hash_workers > 0 else "default threadpool"
+            results.append({"password_hashing": label, "bcrypt_rounds": settings.BCRYPT_ROUNDS, **result})
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=64, help="concurrent login requests")
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS, help="dedicated hashing threads")
+    parser.add_argument("--compare-workers", type=int, default=0, help="second run; 0 = default threadpool")
+    parser.add_argument("--idle-seconds", type=float, default=2.0, help="baseline probe duration")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    rows = main(args.logins, args.concurrency, args.workers, args.compare_workers, args.idle_seconds)
+    print(json.dumps(rows, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
@@ -0,0 +1,129 @@
+"""
+Retrieval latency benchmark: BM25 search over a synthetic contract index.
+
+Builds a throwaway index of --chunks chunks spread over --users users and
+times top-k searches for typical analytics questions, both for an average
+user and for a single user that owns a large share of the chunks.
+
+Run with: python -m backend.benchmarks.retrieval [--chunks 100000] [--json out.json]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from backend.services.retrieval_service import ContractIndex
+
+CLAUSES = [
+    "Either party may terminate this Agreement upon {n} days written notice to the other party.",
+    "The Customer shall pay all undisputed invoices within {n} days of the invoice date.",
+    "This Agreement shall automatically renew for successive {n} month terms unless cancelled.",
+    "The Provider's total liability shall not exceed the fees paid in the preceding {n} months.",
+    "All Confidential Information shall be protected for {n} years after termination.",
+    "The Provider shall maintain insurance coverage of at least ${n},000 per occurrence.",
+    "Late payments accrue interest at {n} percent per month until paid in full.",
+    "Service credits of {n} percent apply when monthly uptime falls below the agreed level.",
+    "Governing law is the State of {state}; disputes are resolved by arbitration in {state}.",
+    "The Supplier warrants the deliverables against defects for {n} days from acceptance.",
+]
+STATES = ["Delaware", "New York", "California", "Texas", "Washington", "Illinois"]
+FILLER = (
+    "The parties shall cooperate in good faith and perform their obligations in a professional "
+    "manner consistent with applicable laws, regulations and industry standards. "
+)
+QUESTIONS = [
+    "What are the termination notice periods?",
+    "Which contracts renew automatically?",
+    "What is the liability cap in my agreements?",
+    "Which contracts charge late payment interest?",
+    "What governing law applies to the Delaware contracts?",
+    "How long do confidentiality obligations last?",
+    "What insurance coverage do providers need to maintain?",
+    "Are there uptime service credits?",
+]
+
+
+def synthetic_contract(rng: random.Random, chunks: int, chunk_chars: int) -> str:
+    """A contract of roughly ``chunks`` chunks, one clause per chunk-sized paragraph."""
+    paragraphs = []
+    for _ in range(chunks):
+        clause = rng.choice(CLAUSES).format(n=rng.randint(2, 120), state=rng.choice(STATES))
+        paragraph = clause + " " + FILLER * ((chunk_chars - len(clause)) // len(FILLER))
+        paragraphs.append(paragraph.strip())
+    return "\n\n".join(paragraphs)
+
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * pct / 100), len(values) - 1)]
+
+
+def time_searches(index: ContractIndex, user_id: int, k: int, rounds: int) -> dict:
+    timings = []
+    for _ in range(rounds):
+        for question in QUESTIONS:
+            start = time.perf_counter()
+            index.search(user_id, question, k)
+            timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "searches": len(timings),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def main(total_chunks: int, users: int, chunks_per_contract: int, heavy_share: float, k: int, rounds: int) -> dict:
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.db")
+        index = ContractIndex(path)
+
+        heavy_chunks = int(total_chunks * heavy_share)
+        per_user = (total_chunks - heavy_chunks) // max(users - 1, 1)
+        start = time.perf_counter()
+        indexed, contract_id = 0, 0
+        for user_id in range(1, users + 1):
+            target = heavy_chunks if user_id == 1 else per_user
+            owned = 0
+            while owned < target:
+                contract_id += 1
+                text = synthetic_contract(rng, chunks_per_contract, index.chunk_chars)
+                owned += index.index_contract(user_id, contract_id, text)
+            indexed += owned
+        build_seconds = time.perf_counter() - start
+
+        user_chunks = dict(index._connection().execute(
+            "SELECT user_id, COUNT(*) FROM chunk_owners WHERE user_id IN (1, 2) GROUP BY user_id"
+        ).fetchall())
+        return {
+            "chunks": indexed,
+            "contracts": contract_id,
+            "users": users,
+            "build_seconds": round(build_seconds, 2),
+            "index_mb": round(os.path.getsize(path) / 1024 / 1024, 1),
+            "top_k": k,
+            "typical_user": {"chunks": user_chunks.get(2, 0), **time_searches(index, 2, k, rounds)},
+            "heavy_user": {"chunks": user_chunks.get(1, 0), **time_searches(index, 1, k, rounds)},
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=100_000, help="total chunks to index")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--chunks-per-contract", type=int, default=10)
+    parser.add_argument("--heavy-share", type=float, default=0.5, help="share of chunks owned by user 1")
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--rounds", type=int, default=25, help="passes over the question set")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    result = main(args.chunks, args.users, args.chunks_per_contract, args.heavy_share, args.k, args.rounds)
+    print(json.dumps(result, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
@@ -11,7 +11,137 @@ load_dotenv(dotenv_path=env_path)
 
 class Settings:
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "")
+
+    # OpenAI HTTP client - one shared, bounded connection pool per worker
+    OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+    OPENAI_MAX_KEEPALIVE: int = int(os.getenv("OPENAI_MAX_KEEPALIVE", "10"))
+    OPENAI_CONNECT_TIMEOUT: float = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "10"))
+    OPENAI_EXTRACT_TIMEOUT: float = float(os.getenv("OPENAI_EXTRACT_TIMEOUT", "90"))
+    OPENAI_CHAT_TIMEOUT: float = float(os.getenv("OPENAI_CHAT_TIMEOUT", "60"))
+    OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+    # Document text budget shared by the parsers and the extraction prompt
+    # (0 disables a limit; the token budget is converted at ~4 chars/token)
+    EXTRACTION_CHAR_BUDGET: int = int(os.getenv("EXTRACTION_CHAR_BUDGET", "6000"))
+    EXTRACTION_TOKEN_BUDGET: int = int(os.getenv("EXTRACTION_TOKEN_BUDGET", "0"))
+
+    # How the extraction answer is constrained to the ContractCreate schema:
+    # "function" (function calling), "json_schema" (strict structured outputs,
+    # gpt-4o and later) or "text" (prompt only)
+    EXTRACTION_OUTPUT_MODE: str = os.getenv("EXTRACTION_OUTPUT_MODE", "function")
+
+    # Read emails, phone numbers, dates and contract values with regexes
+    # where unambiguous and ask the model only for the remaining fields
+    RULE_EXTRACTION_ENABLED: bool = os.getenv("RULE_EXTRACTION_ENABLED", "true").lower() == "true"
+    # Extract with the rules alone, without OpenAI: "auto" (when no API key is
+    # configured), "always" or "never" (placeholder result without a key)
+    OFFLINE_EXTRACTION: str = os.getenv("OFFLINE_EXTRACTION", "auto")
+
+    # Extraction model tiers. Documents are scored 0-1 by length, clause
+    # density and language and sent to the fast tier up to the first
+    # threshold, the standard tier up to the second and the large tier above;
+    # answers that fail validation are retried one tier up. Without routing
+    # every extraction uses the large tier.
+    MODEL_ROUTING_ENABLED: bool = os.getenv("MODEL_ROUTING_ENABLED", "true").lower() == "true"
+    EXTRACTION_MODEL_FAST: str = os.getenv("EXTRACTION_MODEL_FAST", "gpt-4o-mini")
+    EXTRACTION_MODEL_STANDARD: str = os.getenv("EXTRACTION_MODEL_STANDARD", "gpt-4o")
+    EXTRACTION_MODEL_LARGE: str = os.getenv("EXTRACTION_MODEL_LARGE", "gpt-4")
+    ROUTING_FAST_MAX_SCORE: float = float(os.getenv("ROUTING_FAST_MAX_SCORE", "0.3"))
+    ROUTING_STANDARD_MAX_SCORE: float = float(os.getenv("ROUTING_STANDARD_MAX_SCORE", "0.6"))
+
+    # Long-document mode: map-reduce extraction over overlapping chunks instead
+    # of truncating at the character budget
+    LONG_DOCUMENT_MODE: bool = os.getenv("LONG_DOCUMENT_MODE", "false").lower() == "true"
+    LONG_DOCUMENT_CHUNK_CHARS: int = int(os.getenv("LONG_DOCUMENT_CHUNK_CHARS", "6000"))
+    LONG_DOCUMENT_CHUNK_OVERLAP: int = int(os.getenv("LONG_DOCUMENT_CHUNK_OVERLAP", "500"))
+    LONG_DOCUMENT_MAX_CHUNKS: int = int(os.getenv("LONG_DOCUMENT_MAX_CHUNKS", "100"))
+    LONG_DOCUMENT_CONCURRENCY: int = int(os.getenv("LONG_DOCUMENT_CONCURRENCY", "4"))
+
+    # Analytics chat: model, and individual contracts included alongside the portfolio aggregates
+    CHAT_MODEL: str = os.getenv("CHAT_MODEL", "gpt-4")
+    CHAT_CONTEXT_CONTRACTS: int = int(os.getenv("CHAT_CONTEXT_CONTRACTS", "50"))
+
+    # Document parsing process pool (0 workers parses in the API process's threadpool)
+    EXTRACTION_WORKERS: int = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+    EXTRACTION_MAX_QUEUE: int = int(os.getenv("EXTRACTION_MAX_QUEUE", "64"))
+    EXTRACTION_TIMEOUT_SECONDS: float = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "60"))
+
+    # Batch ingestion
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", "8"))
+    BATCH_MAX_FILES: int = int(os.getenv("BATCH_MAX_FILES", "1000"))
+    BATCH_MAX_FILE_BYTES: int = int(os.getenv("BATCH_MAX_FILE_BYTES", str(25 * 1024 * 1024)))
+    # Total (uncompressed) size of the documents in one batch
+    BATCH_MAX_TOTAL_BYTES: int = int(os.getenv("BATCH_MAX_TOTAL_BYTES", str(500 * 1024 * 1024)))
+
+    # Background extraction jobs
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_BACKOFF_SECONDS: float = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "5"))
+    JOB_POLL_INTERVAL_SECONDS: float = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+    JOB_STALE_AFTER_SECONDS: int = int(os.getenv("JOB_STALE_AFTER_SECONDS", "600"))
+    JOB_MAX_QUEUED: int = int(os.getenv("JOB_MAX_QUEUED", "1000"))
+
+    # Extraction cache: "memory", "sql" or "none"
+    EXTRACTION_CACHE_BACKEND: str = os.getenv("EXTRACTION_CACHE_BACKEND", "memory")
+    EXTRACTION_CACHE_TTL_SECONDS: int = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    EXTRACTION_CACHE_MAX_ENTRIES: int = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "1000"))
+    EXTRACTION_CACHE_MAX_BYTES: int = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+    # Retrieval index over contract text for the analytics chat (local SQLite FTS5 file)
+    RETRIEVAL_ENABLED: bool = os.getenv("RETRIEVAL_ENABLED", "true").lower() == "true"
+    RETRIEVAL_INDEX_PATH: str = os.getenv("RETRIEVAL_INDEX_PATH", "./contract_index.db")
+    RETRIEVAL_MAX_CHARS: int = int(os.getenv("RETRIEVAL_MAX_CHARS", "200000"))
+    RETRIEVAL_CHUNK_CHARS: int = int(os.getenv("RETRIEVAL_CHUNK_CHARS", "1200"))
+    RETRIEVAL_CHUNK_OVERLAP: int = int(os.getenv("RETRIEVAL_CHUNK_OVERLAP", "200"))
+    RETRIEVAL_TOP_K: int = int(os.getenv("RETRIEVAL_TOP_K", "6"))
+    RETRIEVAL_STAGED_TTL_SECONDS: int = int(os.getenv("RETRIEVAL_STAGED_TTL_SECONDS", str(7 * 24 * 3600)))
+
+    # Bulk create/delete endpoints: rows per request, and rows per INSERT/DELETE statement
+    BULK_MAX_ROWS: int = int(os.getenv("BULK_MAX_ROWS", "20000"))
+    BULK_CHUNK_SIZE: int = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+
+    # Rows fetched per server-side cursor batch in contract exports
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+
+    # Analytics chat answer cache (similarity is a Jaccard threshold for paraphrases; 0 = exact only)
+    CHAT_CACHE_ENABLED: bool = os.getenv("CHAT_CACHE_ENABLED", "true").lower() == "true"
+    CHAT_CACHE_TTL_SECONDS: int = int(os.getenv("CHAT_CACHE_TTL_SECONDS", "3600"))
+    CHAT_CACHE_MAX_ENTRIES: int = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "2000"))
+    CHAT_CACHE_MAX_BYTES: int = int(os.getenv("CHAT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    CHAT_CACHE_SIMILARITY: float = float(os.getenv("CHAT_CACHE_SIMILARITY", "0"))
+
+    # Resolved principal cache in get_current_user (0 TTL disables)
+    AUTH_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+    AUTH_CACHE_MAX_ENTRIES: int = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+    # Password hashing: bcrypt cost and its dedicated thread pool (0 workers = default threadpool)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # "text" or "json" (one object per line); both include the request id
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+    # Prometheus text-format metrics at /metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./contracts.db")
+    # Async routes: derived from DATABASE_URL (aiosqlite / asyncpg) unless set
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+
+    # Database connection pool (not used for in-memory SQLite); recycle is in
+    # seconds, -1 disables it
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # SQLite: write-ahead logging lets readers proceed during a write, and
+    # busy_timeout makes writers wait for the lock instead of failing at once
+    SQLITE_WAL: bool = os.getenv("SQLITE_WAL", "true").lower() == "true"
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
 
     # CORS origins - allow localhost and production frontend
     CORS_ORIGINS: list = [
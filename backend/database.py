@@ -1,15 +1,256 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from backend.config import settings
+from backend.utils.metrics import DB_ERRORS, DB_QUERY_DURATION, add_collector, gauge
+
+
+class PoolMetrics:
+    """Thread-safe counters for connection checkouts and the time spent waiting for one."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.connections_created = 0
+        self.connections_invalidated = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def record_connect(self):
+        with self._lock:
+            self.connections_created += 1
+
+    def record_invalidate(self):
+        with self._lock:
+            self.connections_invalidated += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total / waits * 1000, 3) if waits else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "connections_created": self.connections_created,
+                "connections_invalidated": self.connections_invalidated,
+            }
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection.
+
+    The wait covers blocking on a full pool and opening a new (overflow)
+    connection, but not the pre-ping, which runs after the checkout.
+    """
+
+    metrics = pool_metrics
+    # Log as SQLAlchemy's pool (quiet unless echo_pool is set), not under backend.*
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.QueuePool"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """The async engine's pool, with its own metrics."""
+
+    metrics = async_pool_metrics
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _engine_options(url, poolclass) -> dict:
+    """create_engine() keyword arguments for the configured database."""
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if _is_memory_sqlite(url):
+            # In-memory databases live on a single connection; keep SQLAlchemy's pool
+            return options
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+_STATEMENT_KINDS = {"select", "insert", "update", "delete", "with", "pragma", "create", "alter"}
+
+
+def _statement_kind(statement: str) -> str:
+    kind = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else ""
+    return kind if kind in _STATEMENT_KINDS else "other"
+
+
+def _configure_connections(engine, url, metrics: PoolMetrics, label: str):
+    """Count connections, apply the SQLite pragmas to each new one and time every statement."""
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        DB_QUERY_DURATION.observe(time.perf_counter() - started, engine=label, operation=_statement_kind(statement))
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(exception_context):
+        DB_ERRORS.inc(engine=label)
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start"):
+            connection.info["query_start"].pop()
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.record_connect()
+        if url.get_backend_name() != "sqlite":
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+            if settings.SQLITE_WAL and not _is_memory_sqlite(url):
+                cursor.execute("PRAGMA journal_mode = WAL")
+                # NORMAL is durable across application crashes in WAL mode and
+                # avoids an fsync on every commit
+                cursor.execute("PRAGMA synchronous = NORMAL")
+        finally:
+            cursor.close()
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.record_invalidate()
+
+
+_url = make_url(settings.DATABASE_URL)
+engine = create_engine(_url, **_engine_options(_url, InstrumentedQueuePool))
+_configure_connections(engine, _url, pool_metrics, "sync")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers used when ASYNC_DATABASE_URL is not set
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+_async_engine = None
+_async_session_factory = None
+
+
+def async_database_url():
+    """ASYNC_DATABASE_URL, or DATABASE_URL with its driver swapped for the async one."""
+    if settings.ASYNC_DATABASE_URL:
+        return make_url(settings.ASYNC_DATABASE_URL)
+    backend = _url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {backend}; set ASYNC_DATABASE_URL")
+    return _url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def get_async_engine():
+    """Get or create the async engine (same database and pool settings as ``engine``).
+
+    Created on first use so the async driver is only imported when needed.
+    An in-memory SQLite DATABASE_URL gets a separate, empty database here.
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = async_database_url()
+        _async_engine = create_async_engine(url, **_engine_options(url, InstrumentedAsyncQueuePool))
+        _configure_connections(_async_engine.sync_engine, url, async_pool_metrics, "async")
+        _async_session_factory = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+async def dispose_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
+def _pool_stats(pool, metrics: PoolMetrics) -> dict:
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            # overflow() counts from -pool_size while the pool is filling up
+            overflow=max(pool.overflow(), 0),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+        )
+    stats.update(metrics.stats())
+    return stats
+
+
+def pool_stats() -> dict:
+    """Current pool occupancy plus cumulative checkout metrics."""
+    return _pool_stats(engine.pool, pool_metrics)
+
+
+def async_pool_stats() -> Optional[dict]:
+    """Same as ``pool_stats`` for the async engine; None until it is first used."""
+    if _async_engine is None:
+        return None
+    return _pool_stats(_async_engine.pool, async_pool_metrics)
+
+
+def _collect_pool_metrics():
+    pools = [("sync", pool_stats()), ("async", async_pool_stats())]
+    pools = [(label, stats) for label, stats in pools if stats is not None]
+    yield gauge("db_pool_checked_out", "Connections currently checked out.",
+                [({"engine": label}, stats.get("checked_out")) for label, stats in pools])
+    yield gauge("db_pool_overflow", "Overflow connections currently open.",
+                [({"engine": label}, stats.get("overflow")) for label, stats in pools])
+    yield ("db_pool_checkouts_total", "counter", "Connection checkouts.",
+           [({"engine": label}, stats["checkouts"]) for label, stats in pools])
+    yield ("db_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection.",
+           [({"engine": label}, stats["timeouts"]) for label, stats in pools])
+    yield gauge("db_pool_checkout_wait_max_seconds", "Longest checkout wait so far.",
+                [({"engine": label}, stats["wait_ms_max"] / 1000) for label, stats in pools])
+
+
+add_collector(_collect_pool_metrics)
+
 Base = declarative_base()
 
 def get_db():
@@ -19,7 +260,22 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
+
 def init_db():
     from backend.models.contract import Contract
     from backend.models.user import User
+    from backend.models.extraction_cache import ExtractionCacheEntry
+    from backend.models.extraction_job import ExtractionJob
+    from backend.models.schema_migration import SchemaMigration
+    from backend.models.contract_aggregate import UserContractStats, ContractAggregate
+    from backend.migrations import run_migrations
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    # create_all skips existing tables, so add indexes introduced since they were created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
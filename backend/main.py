@@ -1,17 +1,41 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.sessions import SessionMiddleware
 
 from backend.config import settings
-from backend.database import init_db
-from backend.routers import contracts_router, analytics_router
+from backend.database import async_pool_stats, dispose_async_engine, engine, init_db, pool_stats
+from backend.routers import contracts_router, analytics_router, jobs_router
 from backend.routers.auth import router as auth_router
+from backend.services.ai_service import close_client
+from backend.services.file_service import shutdown_extraction_engine
+from backend.services.job_service import get_job_workers
+from backend.utils.auth import shutdown_password_hasher
+from backend.utils.log import REQUEST_ID_HEADER, RequestIdMiddleware, configure_logging
+from backend.utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, render as render_metrics
+
+configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
 
-# Initialize database
-init_db()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create tables and run migrations at startup rather than at import time,
+    # so importing the app (tooling, workers, tests) stays cheap
+    await run_in_threadpool(init_db)
+    await get_job_workers().start()
+    yield
+    await get_job_workers().stop()
+    # Release the shared OpenAI connection pool, async DB pool and parser processes on shutdown
+    await close_client()
+    await dispose_async_engine()
+    shutdown_extraction_engine()
+    shutdown_password_hasher()
 
 # Create FastAPI app
-app = FastAPI(title="Contract Management API")
+app = FastAPI(title="Contract Management API", lifespan=lifespan)
 
 # CORS middleware - must be added FIRST to handle preflight requests
 app.add_middleware(
@@ -20,20 +44,50 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Document-Key", REQUEST_ID_HEADER],
 )
 
 # Session middleware (required for OAuth)
 app.add_middleware(SessionMiddleware, secret_key="your-secret-key-change-this-in-production")
 
+# Request metrics, and request ids for log correlation (outermost, so every log line has one)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(contracts_router)
 app.include_router(analytics_router)
+app.include_router(jobs_router)
 
 @app.get("/")
 def read_root():
     return {"message": "Contract Management API"}
 
+@app.get("/health")
+def health():
+    """Database reachability and connection pool metrics (503 if the database is down)."""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        database = "ok"
+    except Exception as e:
+        database = f"error: {type(e).__name__}"
+    body = {
+        "status": "ok" if database == "ok" else "degraded",
+        "database": database,
+        "pool": pool_stats(),
+        "async_pool": async_pool_stats(),
+    }
+    return JSONResponse(body, status_code=200 if database == "ok" else 503)
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        """Prometheus scrape endpoint (this worker process only)."""
+        return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,106 @@
+"""
+Lightweight, idempotent schema migrations run by init_db.
+
+create_all only creates missing tables, so changes to existing tables are
+applied here. Each migration runs once; applied versions are recorded in
+the schema_migrations table.
+"""
+import logging
+
+from sqlalchemy import inspect, text, Date
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.models.schema_migration import SchemaMigration
+from backend.utils.dates import normalize_date
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def typed_contract_dates(engine: Engine):
+    """Normalize contracts.start_date/end_date and convert them to DATE.
+
+    Values are parsed with normalize_date; anything unparseable becomes NULL.
+    SQLite stores DATE as ISO text, so there only the values are rewritten;
+    other databases also get the column type changed.
+    """
+    with engine.begin() as conn:
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                text(
+                    "SELECT id, start_date, end_date FROM contracts "
+                    "WHERE id > :last_id ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+            ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            updates = []
+            for contract_id, start_date, end_date in rows:
+                start = normalize_date(start_date)
+                end = normalize_date(end_date)
+                start_iso = start.isoformat() if start else None
+                end_iso = end.isoformat() if end else None
+                if (start_iso, end_iso) != (_as_text(start_date), _as_text(end_date)):
+                    updates.append({"id": contract_id, "start_date": start_iso, "end_date": end_iso})
+            if updates:
+                conn.execute(
+                    text("UPDATE contracts SET start_date = :start_date, end_date = :end_date WHERE id = :id"),
+                    updates,
+                )
+
+        if engine.dialect.name != "sqlite":
+            columns = {c["name"]: c["type"] for c in inspect(conn).get_columns("contracts")}
+            for column in ("start_date", "end_date"):
+                if not isinstance(columns[column], Date):
+                    conn.execute(text(
+                        f"ALTER TABLE contracts ALTER COLUMN {column} TYPE DATE USING {column}::date"
+                    ))
+
+
+def _as_text(value):
+    if value is None:
+        return None
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def extraction_job_owner(engine: Engine):
+    """Add extraction_jobs.user_id to tables created before jobs had owners.
+
+    Existing jobs keep a NULL owner and are no longer visible through the API.
+    """
+    with engine.begin() as conn:
+        columns = {c["name"] for c in inspect(conn).get_columns("extraction_jobs")}
+        if "user_id" not in columns:
+            conn.execute(text("ALTER TABLE extraction_jobs ADD COLUMN user_id INTEGER REFERENCES users(id)"))
+
+
+MIGRATIONS = [
+    ("0001_typed_contract_dates", typed_contract_dates),
+    ("0002_extraction_job_owner", extraction_job_owner),
+]
+
+
+def run_migrations(engine: Engine):
+    """Apply pending migrations in order."""
+    with Session(engine) as db:
+        applied = {version for (version,) in db.query(SchemaMigration.version)}
+
+    for version, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        logger.info("Applying migration %s", version)
+        migrate(engine)
+        with Session(engine) as db:
+            db.add(SchemaMigration(version=version))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another process applied it concurrently
+                db.rollback()
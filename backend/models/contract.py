@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Text, Date, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from backend.database import Base
@@ -12,8 +12,8 @@ class Contract(Base):
     contact_name = Column(String)
     contact_email = Column(String)
     contact_phone = Column(String)
-    start_date = Column(String)
-    end_date = Column(String)
+    start_date = Column(Date)
+    end_date = Column(Date)
     contract_value = Column(Float)
     payment_terms = Column(Text)
     termination_terms = Column(Text)
@@ -22,3 +22,13 @@ class Contract(Base):
 
     # Relationship
     user = relationship("User", back_populates="contracts")
+
+    __table_args__ = (
+        # Keyset pagination on (created_at, id) and the list filters
+        Index("ix_contracts_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_contracts_user_start_date", "user_id", "start_date"),
+        # Expiry and renewal queries
+        Index("ix_contracts_user_end_date", "user_id", "end_date"),
+        Index("ix_contracts_user_value", "user_id", "contract_value"),
+        Index("ix_contracts_user_contact", "user_id", "contact_name"),
+    )
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from datetime import datetime
+from backend.database import Base
+
+class UserContractStats(Base):
+    """Per-user portfolio totals, maintained incrementally on create/delete."""
+    __tablename__ = "user_contract_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    contract_count = Column(Integer, nullable=False, default=0)
+    valued_count = Column(Integer, nullable=False, default=0)  # Contracts with a contract_value
+    total_value = Column(Float, nullable=False, default=0.0)
+    version = Column(Integer, nullable=False, default=0)  # Bumped on every change to the user's contracts
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ContractAggregate(Base):
+    """Contract count and value per user, dimension and bucket.
+
+    Dimensions: "start_month" and "end_month" (bucket YYYY-MM) and
+    "counterparty" (bucket is the contact name).
+    """
+    __tablename__ = "contract_aggregates"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    dimension = Column(String, primary_key=True)
+    bucket = Column(String, primary_key=True)
+    contract_count = Column(Integer, nullable=False, default=0)
+    total_value = Column(Float, nullable=False, default=0.0)
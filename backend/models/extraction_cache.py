@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime
+from datetime import datetime
+from backend.database import Base
+
+class ExtractionCacheEntry(Base):
+    __tablename__ = "extraction_cache"
+
+    key = Column(String, primary_key=True)
+    text = Column(Text, nullable=False)
+    details = Column(Text, nullable=False)  # JSON-encoded extraction result
+    size = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
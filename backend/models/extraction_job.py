@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, LargeBinary, Index, ForeignKey
+from datetime import datetime
+from backend.database import Base
+
+class ExtractionJob(Base):
+    __tablename__ = "extraction_jobs"
+
+    id = Column(String, primary_key=True)
+    # Owner; only they can see or retry the job (NULL for jobs queued before jobs had owners)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, dead
+    file_name = Column(String, nullable=False)
+    content = Column(LargeBinary, nullable=True)  # Cleared once the job succeeds
+    result = Column(Text, nullable=True)  # JSON-encoded extraction result
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)
+    locked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_extraction_jobs_status_run_after", "status", "run_after"),
+    )
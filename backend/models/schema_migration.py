@@ -0,0 +1,9 @@
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from backend.database import Base
+
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+
+    version = Column(String, primary_key=True)
+    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False)
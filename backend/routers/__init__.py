@@ -1,4 +1,5 @@
 from backend.routers.contracts import router as contracts_router
 from backend.routers.analytics import router as analytics_router
+from backend.routers.jobs import router as jobs_router
 
-__all__ = ["contracts_router", "analytics_router"]
+__all__ = ["contracts_router", "analytics_router", "jobs_router"]
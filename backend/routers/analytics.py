@@ -1,25 +1,150 @@
+import asyncio
+import logging
+import time
+
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from backend.config import settings
 from backend.database import get_db
 from backend.schemas.contract import ChatMessage, ChatResponse
-from backend.services.ai_service import chat_with_contracts
-from backend.services.contract_service import get_user_contracts
+from backend.services.ai_service import chat_with_contracts, stream_chat_with_contracts
+from backend.services.aggregate_service import get_portfolio_summary, get_contract_set_version
+from backend.services.chat_cache import get_chat_cache
+from backend.services.contract_service import get_recent_contracts
+from backend.services.retrieval_service import get_contract_index
 from backend.utils.auth import get_current_user
+from backend.utils.metrics import CHAT_TTFT
+from backend.utils.sse import sse_event
 from backend.models.user import User
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 
+async def _chat_context(db: Session, user_id: int, message: str):
+    """Aggregates, recent contracts and retrieved excerpts for a chat question.
+
+    The queries run on the threadpool, and the session is closed afterwards so
+    its connection goes back to the pool before the (slow) LLM call instead of
+    being held until the response is sent.
+    """
+    def load():
+        try:
+            return get_portfolio_summary(db, user_id), get_recent_contracts(db, user_id, settings.CHAT_CONTEXT_CONTRACTS)
+        finally:
+            db.close()
+
+    portfolio, contracts = await run_in_threadpool(load)
+    index = get_contract_index()
+    passages = []
+    if index is not None:
+        passages = await run_in_threadpool(index.search, user_id, message, settings.RETRIEVAL_TOP_K)
+    return portfolio, contracts, passages
+
+def _cache_scope(db: Session, user_id: int):
+    """Chat cache and the scope of the user's current contract set (None, None when disabled)."""
+    cache = get_chat_cache()
+    if cache is None:
+        return None, None
+    return cache, cache.scope(user_id, get_contract_set_version(db, user_id))
+
+@router.get("/summary")
+def analytics_summary(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Precomputed portfolio aggregates for the current user."""
+    return get_portfolio_summary(db, current_user.id)
+
+@router.get("/chat/cache")
+def chat_cache_stats(current_user: User = Depends(get_current_user)):
+    """Hit/miss counters and size of the chat answer cache."""
+    cache = get_chat_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_analytics(
     message: ChatMessage,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Chat with AI about the current user's contracts."""
+    """Chat with AI about the current user's contracts.
+
+    Answers are cached per question until the user's contracts change.
+    """
     try:
-        contracts = get_user_contracts(db, current_user.id)
-        response = await chat_with_contracts(message.message, contracts)
+        cache, scope = await run_in_threadpool(_cache_scope, db, current_user.id)
+        if cache is not None:
+            cached = cache.get(scope, message.message)
+            if cached is not None:
+                return ChatResponse(response=cached, cached=True)
+
+        portfolio, contracts, passages = await _chat_context(db, current_user.id, message.message)
+        response = await chat_with_contracts(message.message, portfolio, contracts, passages)
+        if cache is not None and response:
+            cache.set(scope, message.message, response)
         return ChatResponse(response=response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/chat/stream")
+async def chat_analytics_stream(
+    message: ChatMessage,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Chat with AI about the current user's contracts, streamed as server-sent events.
+
+    Each ``data:`` event carries ``{"delta": "..."}`` with the next piece of
+    the answer. The stream ends with a ``done`` event holding the
+    time-to-first-token and total time in milliseconds, or an ``error``
+    event. If the client disconnects, the upstream completion is cancelled.
+    A cached answer is sent as a single delta, with ``"cached": true`` in the
+    ``done`` event.
+    """
+    try:
+        cache, scope = await run_in_threadpool(_cache_scope, db, current_user.id)
+        cached = cache.get(scope, message.message) if cache is not None else None
+        if cached is None:
+            portfolio, contracts, passages = await _chat_context(db, current_user.id, message.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def cached_events():
+        yield sse_event({"delta": cached})
+        yield sse_event({"ttft_ms": 0.0, "total_ms": 0.0, "cached": True}, event="done")
+
+    async def events():
+        started = time.perf_counter()
+        ttft_ms = None
+        answer = []
+        tokens = stream_chat_with_contracts(message.message, portfolio, contracts, passages)
+        try:
+            async for delta in tokens:
+                if ttft_ms is None:
+                    ttft = time.perf_counter() - started
+                    CHAT_TTFT.observe(ttft)
+                    ttft_ms = round(ttft * 1000, 1)
+                    logger.info("Chat stream time to first token: %s ms", ttft_ms)
+                answer.append(delta)
+                yield sse_event({"delta": delta})
+            if cache is not None and answer:
+                cache.set(scope, message.message, "".join(answer))
+            total_ms = round((time.perf_counter() - started) * 1000, 1)
+            yield sse_event({"ttft_ms": ttft_ms, "total_ms": total_ms, "cached": False}, event="done")
+        except asyncio.CancelledError:
+            logger.info("Chat stream cancelled after %.0f ms: client disconnected", (time.perf_counter() - started) * 1000)
+            raise
+        except Exception as e:
+            yield sse_event({"error": f"Error processing chat: {str(e)}"}, event="error")
+        finally:
+            await tokens.aclose()
+
+    return StreamingResponse(
+        cached_events() if cached is not None else events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
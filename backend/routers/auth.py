@@ -1,27 +1,32 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
-import httpx
+from starlette.concurrency import run_in_threadpool
 
 from backend.database import get_db
 from backend.models.user import User
 from backend.schemas.user import UserCreate, UserResponse, Token
 from backend.utils.auth import (
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
     create_access_token,
     get_current_user
 )
-from backend.utils.google_oauth import oauth
+from backend.utils.google_oauth import get_oauth
 from backend.config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
 
-@router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def signup(user_data: UserCreate, db: Session = Depends(get_db)):
-    """Create a new user account."""
+# The async routes below run their (blocking) database work in the threadpool
+# and only await the password hasher on the event loop
+
+def _check_available(db: Session, user_data: UserCreate):
     # Check if email already exists
     if db.query(User).filter(User.email == user_data.email).first():
         raise HTTPException(
@@ -36,29 +41,53 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
             detail="Username already taken"
         )
 
+    # End the read transaction so no pooled connection is held during the slow hash
+    db.rollback()
+
+
+def _add_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def _login_credentials(db: Session, username: str):
+    """``(user id, password hash)`` for a username, or ``(None, None)``."""
+    user = db.query(User).filter(User.username == username).first()
+    # Return the connection to the pool before the slow hash; a burst of
+    # logins must not exhaust the database pool while waiting on bcrypt
+    db.close()
+    return (user.id, user.hashed_password) if user else (None, None)
+
+
+@router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+    """Create a new user account."""
+    await run_in_threadpool(_check_available, db, user_data)
+
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     new_user = User(
         email=user_data.email,
         username=user_data.username,
         hashed_password=hashed_password
     )
-
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-
-    return new_user
+    return await run_in_threadpool(_add_user, db, new_user)
 
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    """Authenticate user and return access token."""
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    """Authenticate user and return access token.
+
+    Password hashing runs on a dedicated, bounded pool (see PasswordHasher),
+    so a burst of logins cannot starve other routes.
+    """
     # Find user by username
-    user = db.query(User).filter(User.username == form_data.username).first()
+    user_id, hashed_password = await run_in_threadpool(_login_credentials, db, form_data.username)
 
     # Verify user exists and password is correct
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if user_id is None or not await verify_password_async(form_data.password, hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -66,7 +95,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
         )
 
     # Create access token
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data={"sub": str(user_id)})
 
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -81,7 +110,7 @@ def get_current_user_info(current_user: User = Depends(get_current_user)):
 async def google_login(request: Request):
     """Redirect to Google OAuth login page."""
     redirect_uri = settings.GOOGLE_REDIRECT_URI
-    return await oauth.google.authorize_redirect(request, redirect_uri)
+    return await get_oauth().google.authorize_redirect(request, redirect_uri)
 
 
 @router.get("/google/callback")
@@ -89,7 +118,7 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
     """Handle Google OAuth callback."""
     try:
         # Get the access token from Google
-        token = await oauth.google.authorize_access_token(request)
+        token = await get_oauth().google.authorize_access_token(request)
 
         # Get user info from Google
         user_info = token.get('userinfo')
@@ -143,11 +172,10 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
 
         # Create access token
         access_token = create_access_token(data={"sub": str(user.id)})
-        print(f"DEBUG: Created token for user {user.id} ({user.email}): {access_token[:20]}...")
+        logger.info("Google sign-in for user %s", user.id)
 
         # Redirect to frontend with token
         frontend_url = f"{settings.FRONTEND_URL}/auth/callback?token={access_token}"
-        print(f"DEBUG: Redirecting to: {frontend_url[:80]}...")
         return RedirectResponse(url=frontend_url)
 
     except Exception as e:
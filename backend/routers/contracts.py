@@ -1,21 +1,40 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
-import io
-import pandas as pd
-
-from backend.database import get_db
-from backend.schemas.contract import ContractResponse, ContractCreate
-from backend.services.file_service import extract_text_from_file
-from backend.services.ai_service import extract_contract_details
+from typing import List, Dict, Any, Literal, Optional
+from datetime import date
+import json
+
+from backend.config import settings
+from backend.database import get_async_db, get_db
+from backend.schemas.contract import (
+    BulkContractCreate,
+    BulkCreateResponse,
+    BulkDeleteRequest,
+    BulkDeleteResponse,
+    ContractCreate,
+    ContractResponse,
+)
+from backend.services.extraction_cache import document_hash
+from backend.services.extraction_service import extract_document, stream_extract_document
+from backend.services.export_service import EXPORT_MEDIA_TYPES, prepare_export
+from backend.services.batch_service import ALLOWED_EXTENSIONS, collect_documents, run_batch
 from backend.services.contract_service import (
-    create_contract,
-    get_user_contracts,
-    get_contract_by_id,
-    delete_contract_by_id
+    bulk_create_contracts_async,
+    bulk_delete_contracts_async,
+    validate_bulk_rows,
+    create_contract_async,
+    list_user_contracts_async,
+    get_upcoming_renewals_async,
+    get_contract_by_id_async,
+    delete_contract_by_id_async
 )
-from backend.utils.auth import get_current_user
+from backend.utils.auth import get_current_user, get_current_user_async
+from backend.utils.metrics import stage
+from backend.utils.sse import sse_event
 from backend.models.user import User
 
 router = APIRouter(prefix="/api/contracts", tags=["contracts"])
@@ -26,46 +45,93 @@ async def extract_options():
     return {}
 
 @router.post("/extract")
-async def extract_contract(file: UploadFile = File(...)):
-    """Extract contract details from file without saving to database."""
+async def extract_contract(response: Response, file: UploadFile = File(...)):
+    """Extract contract details from file without saving to database.
+
+    The ``X-Document-Key`` response header identifies the document's text;
+    pass it as ``document_key`` to /upload to add the contract to the
+    retrieval index used by the analytics chat.
+    """
     try:
         # Validate file type
-        allowed_extensions = ['pdf', 'docx', 'doc']
         file_extension = file.filename.lower().split('.')[-1]
 
-        if file_extension not in allowed_extensions:
+        if file_extension not in ALLOWED_EXTENSIONS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
+                detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
             )
 
         # Read file content
-        content = await file.read()
+        with stage("upload_read"):
+            content = await file.read()
 
-        # Extract text from file
-        text = extract_text_from_file(content, file.filename)
-
-        # Extract contract details using AI
-        details = await extract_contract_details(text)
+        # Extract text and contract details (served from cache on re-upload)
+        details = await extract_document(content, file.filename)
+        response.headers["X-Document-Key"] = document_hash(content)
 
         # Return extracted details with file name
         return {
             "file_name": file.filename,
             **details
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/extract/stream")
+async def extract_contract_stream(file: UploadFile = File(...)):
+    """Extract contract details as server-sent events, field by field.
+
+    Each ``field`` event carries ``{"field": name, "value": value}`` as soon
+    as the model has produced that field. The stream ends with a ``done``
+    event holding the same body /extract returns, or an ``error`` event
+    with ``{"status": ..., "detail": ...}``. ``X-Document-Key`` is set as
+    for /extract.
+    """
+    file_extension = file.filename.lower().split('.')[-1]
+    if file_extension not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+
+    with stage("upload_read"):
+        content = await file.read()
+
+    async def events():
+        try:
+            async for event in stream_extract_document(content, file.filename):
+                if "details" in event:
+                    yield sse_event({"file_name": file.filename, **event["details"]}, event="done")
+                else:
+                    yield sse_event(event, event="field")
+        except HTTPException as e:
+            yield sse_event({"status": e.status_code, "detail": e.detail}, event="error")
+        except Exception as e:
+            yield sse_event({"status": 500, "detail": str(e)}, event="error")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Document-Key": document_hash(content),
+        },
+    )
+
 @router.post("/upload", response_model=ContractResponse)
 async def upload_contract(
     contract_data: ContractCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Save contract with provided data to database."""
     try:
         # Create contract in database with provided data and current user
-        contract = create_contract(
+        contract = await create_contract_async(
             db,
             contract_data.dict(exclude={'file_name'}),
             contract_data.file_name,
@@ -74,74 +140,179 @@ async def upload_contract(
 
         return contract
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("", response_model=List[ContractResponse])
-def get_contracts(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@router.post("/batch")
+async def batch_upload_contracts(
+    files: List[UploadFile] = File(...),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Extract and save many contracts (PDF, DOCX or zip archives) in one request.
+
+    Progress is streamed back as newline-delimited JSON: a ``started`` event,
+    one ``file`` event per document as it finishes, and a final ``complete``
+    event listing the saved contract ids.
+    """
+    # The multipart parser has already spooled large files to disk; documents
+    # are read from there one batch slot at a time
+    uploads = [(file.filename, file.file) for file in files]
+    documents = await run_in_threadpool(collect_documents, uploads)
+    user_id = current_user.id
+
+    async def stream():
+        async for event in run_batch(documents, user_id):
+            yield json.dumps(event, default=str) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def bulk_create(
+    request: BulkContractCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Save many contracts in one transaction (e.g. migrating existing records).
+
+    Each row is validated separately. Invalid rows are reported in
+    ``errors`` by their index and the valid ones are saved, unless
+    ``atomic`` is set, in which case any invalid row fails the request
+    with 422 and nothing is saved.
+    """
+    if len(request.contracts) > settings.BULK_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"Too many contracts; the limit is {settings.BULK_MAX_ROWS}")
+
+    valid, errors = validate_bulk_rows(request.contracts)
+    if errors and request.atomic:
+        raise HTTPException(status_code=422, detail={"message": "Invalid rows; nothing was saved", "errors": errors})
+
+    try:
+        ids = await bulk_create_contracts_async(db, [(data, file_name) for _, data, file_name in valid], current_user.id)
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "created": [{"index": index, "id": contract_id} for (index, _, _), contract_id in zip(valid, ids)],
+        "errors": errors,
+    }
+
+@router.post("/bulk/delete", response_model=BulkDeleteResponse)
+async def bulk_delete(
+    request: BulkDeleteRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Delete many of the current user's contracts in one transaction.
+
+    Ids that don't exist or belong to another user are returned in ``not_found``.
+    """
+    if len(request.ids) > settings.BULK_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"Too many ids; the limit is {settings.BULK_MAX_ROWS}")
+
+    try:
+        deleted = await bulk_delete_contracts_async(db, request.ids, current_user.id)
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    found = set(deleted)
+    return {"deleted": deleted, "not_found": [i for i in dict.fromkeys(request.ids) if i not in found]}
+
+@router.get("", response_model=None, responses={200: {"model": List[ContractResponse]}})
+async def get_contracts(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size; omit to return every contract"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,file_name,end_date"),
+    start_date_from: Optional[date] = None,
+    start_date_to: Optional[date] = None,
+    end_date_from: Optional[date] = None,
+    end_date_to: Optional[date] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    contact: Optional[str] = Query(None, description="Matches contact name or email, case-insensitive"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
-    """Get all contracts for the current user."""
-    return get_user_contracts(db, current_user.id)
+    """Get the current user's contracts, oldest first.
+
+    Supports keyset pagination (``limit`` + ``cursor``; the next cursor is
+    returned in the ``X-Next-Cursor`` header), column projection with
+    ``fields`` and server-side filters.
+    """
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        rows, next_cursor = await list_user_contracts_async(
+            db,
+            current_user.id,
+            limit=limit,
+            cursor=cursor,
+            fields=field_list,
+            start_date_from=start_date_from,
+            start_date_to=start_date_to,
+            end_date_from=end_date_from,
+            end_date_to=end_date_to,
+            min_value=min_value,
+            max_value=max_value,
+            contact=contact,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if field_list:
+        return jsonable_encoder(rows)
+    return [ContractResponse.model_validate(row) for row in rows]
+
+@router.get("/renewals", response_model=List[ContractResponse])
+async def get_renewals(
+    days: int = Query(90, ge=0, le=3650, description="Look-ahead window in days"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Get the current user's contracts that end within the next ``days`` days."""
+    return await get_upcoming_renewals_async(db, current_user.id, days)
 
 @router.get("/{contract_id}", response_model=ContractResponse)
-def get_contract(
+async def get_contract(
     contract_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get a specific contract by ID for the current user."""
-    contract = get_contract_by_id(db, contract_id, current_user.id)
+    contract = await get_contract_by_id_async(db, contract_id, current_user.id)
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
     return contract
 
 @router.delete("/{contract_id}")
-def delete_contract(
+async def delete_contract(
     contract_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Delete a contract by ID for the current user."""
-    success = delete_contract_by_id(db, contract_id, current_user.id)
+    success = await delete_contract_by_id_async(db, contract_id, current_user.id)
     if not success:
         raise HTTPException(status_code=404, detail="Contract not found")
     return {"message": "Contract deleted successfully"}
 
-@router.get("/export/csv")
-def export_contracts_csv(
+@router.get("/export/{export_format}")
+def export_contracts(
+    export_format: Literal["csv", "parquet", "xlsx"],
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Export all contracts for the current user to CSV."""
-    contracts = get_user_contracts(db, current_user.id)
-    
-    # Convert to DataFrame
-    data = [{
-        "ID": c.id,
-        "File Name": c.file_name,
-        "Contact Name": c.contact_name,
-        "Contact Email": c.contact_email,
-        "Contact Phone": c.contact_phone,
-        "Start Date": c.start_date,
-        "End Date": c.end_date,
-        "Contract Value": c.contract_value,
-        "Payment Terms": c.payment_terms,
-        "Termination Terms": c.termination_terms,
-        "Summary": c.summary,
-        "Created At": c.created_at
-    } for c in contracts]
-    
-    df = pd.DataFrame(data)
-    
-    # Create CSV in memory
-    stream = io.StringIO()
-    df.to_csv(stream, index=False)
-    stream.seek(0)
-    
+    """Export all contracts for the current user as CSV, Parquet or XLSX.
+
+    Rows are read with a server-side cursor and written incrementally, so
+    memory stays flat regardless of the number of contracts. This route
+    stays sync: the exporters are blocking generators on their own session,
+    which StreamingResponse already runs in the threadpool.
+    """
+    body = prepare_export(db, current_user.id, export_format)
     return StreamingResponse(
-        iter([stream.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=contracts.csv"}
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f"attachment; filename=contracts.{export_format}"}
     )
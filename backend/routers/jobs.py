@@ -0,0 +1,68 @@
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from backend.database import get_db
+from backend.models.user import User
+from backend.services.batch_service import ALLOWED_EXTENSIONS
+from backend.services.job_service import (
+    enqueue_extraction,
+    get_job_workers,
+    job_to_dict,
+    load_job,
+    requeue_dead_job,
+    TERMINAL_STATUSES,
+)
+from backend.utils.auth import get_current_user_async
+
+router = APIRouter(prefix="/api/contracts/extract/jobs", tags=["extraction jobs"])
+
+@router.post("", status_code=202)
+async def create_extraction_job(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Queue a document for extraction and return a job id to poll."""
+    file_extension = file.filename.lower().split('.')[-1]
+    if file_extension not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+
+    content = await file.read()
+    job = await run_in_threadpool(enqueue_extraction, db, content, file.filename, current_user.id)
+    get_job_workers().notify()
+    return job_to_dict(job)
+
+@router.get("/{job_id}")
+async def get_extraction_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=60, description="Seconds to wait for the job to finish (long polling)"),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Get the status of an extraction job, and its result once it has succeeded.
+
+    Each lookup runs in the threadpool on its own session, so no pooled
+    connection is held while long polling.
+    """
+    job = await run_in_threadpool(load_job, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if wait and job["status"] not in TERMINAL_STATUSES:
+        await get_job_workers().wait_for(job_id, wait)
+        job = await run_in_threadpool(load_job, job_id, current_user.id)
+
+    return job
+
+@router.post("/{job_id}/retry")
+async def retry_extraction_job(job_id: str, current_user: User = Depends(get_current_user_async)):
+    """Requeue a dead-lettered job."""
+    job = await run_in_threadpool(requeue_dead_job, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # On the event loop: the workers' wakeup event is not thread-safe
+    get_job_workers().notify()
+    return job
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
+from typing import Any, List, Optional
+from datetime import date, datetime
 
 class ContractCreate(BaseModel):
     file_name: str
@@ -13,6 +13,8 @@ class ContractCreate(BaseModel):
     payment_terms: Optional[str] = None
     termination_terms: Optional[str] = None
     summary: Optional[str] = None
+    # X-Document-Key returned by /extract; links the saved contract to its text for retrieval
+    document_key: Optional[str] = None
 
 class ContractResponse(BaseModel):
     id: int
@@ -20,8 +22,8 @@ class ContractResponse(BaseModel):
     contact_name: Optional[str]
     contact_email: Optional[str]
     contact_phone: Optional[str]
-    start_date: Optional[str]
-    end_date: Optional[str]
+    start_date: Optional[date]
+    end_date: Optional[date]
     contract_value: Optional[float]
     payment_terms: Optional[str]
     termination_terms: Optional[str]
@@ -31,8 +33,35 @@ class ContractResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class BulkContractCreate(BaseModel):
+    # Rows are validated one by one against ContractCreate so that invalid
+    # rows are reported individually instead of rejecting the request
+    contracts: List[Any]
+    # Save nothing if any row is invalid
+    atomic: bool = False
+
+class BulkRowError(BaseModel):
+    index: int
+    errors: List[dict]
+
+class BulkCreatedRow(BaseModel):
+    index: int
+    id: int
+
+class BulkCreateResponse(BaseModel):
+    created: List[BulkCreatedRow]
+    errors: List[BulkRowError]
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[int]
+
+class BulkDeleteResponse(BaseModel):
+    deleted: List[int]
+    not_found: List[int]
+
 class ChatMessage(BaseModel):
     message: str
 
 class ChatResponse(BaseModel):
     response: str
+    cached: bool = False
@@ -1,17 +1,40 @@
-from backend.services.pdf_service import extract_text_from_pdf
-from backend.services.docx_service import extract_text_from_docx
-from backend.services.file_service import extract_text_from_file
-from backend.services.ai_service import extract_contract_details, chat_with_contracts
-from backend.services.contract_service import create_contract, get_user_contracts, get_contract_by_id, delete_contract_by_id
+"""
+Service layer.
 
-__all__ = [
-    "extract_text_from_pdf",
-    "extract_text_from_docx",
-    "extract_text_from_file",
-    "extract_contract_details",
-    "chat_with_contracts",
-    "create_contract",
-    "get_user_contracts",
-    "get_contract_by_id",
-    "delete_contract_by_id",
-]
+Names are re-exported lazily (PEP 562), so importing one service module does
+not pull in every other service and its heavy dependencies.
+"""
+import importlib
+
+_EXPORTS = {
+    "extract_text_from_pdf": "backend.services.pdf_service",
+    "extract_text_from_docx": "backend.services.docx_service",
+    "extract_text_from_file": "backend.services.file_service",
+    "extract_text_from_file_async": "backend.services.file_service",
+    "extract_contract_details": "backend.services.ai_service",
+    "chat_with_contracts": "backend.services.ai_service",
+    "extract_document": "backend.services.extraction_service",
+    "create_contract": "backend.services.contract_service",
+    "get_user_contracts": "backend.services.contract_service",
+    "get_contract_by_id": "backend.services.contract_service",
+    "delete_contract_by_id": "backend.services.contract_service",
+    "create_contract_async": "backend.services.contract_service",
+    "get_contract_by_id_async": "backend.services.contract_service",
+    "delete_contract_by_id_async": "backend.services.contract_service",
+    "bulk_create_contracts": "backend.services.contract_service",
+    "bulk_delete_contracts": "backend.services.contract_service",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
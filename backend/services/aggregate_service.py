@@ -0,0 +1,186 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from backend.models.contract import Contract
+from backend.models.contract_aggregate import UserContractStats, ContractAggregate
+
+TOP_COUNTERPARTIES = 10
+MONTHS_OF_HISTORY = 24
+
+
+def _buckets(contract: Contract):
+    """(dimension, bucket) pairs a contract contributes to."""
+    if contract.start_date:
+        yield "start_month", contract.start_date.strftime("%Y-%m")
+    if contract.end_date:
+        yield "end_month", contract.end_date.strftime("%Y-%m")
+    if contract.contact_name and contract.contact_name.strip():
+        yield "counterparty", contract.contact_name.strip()[:200]
+
+
+def rebuild_user_aggregates(db: Session, user_id: int):
+    """Recompute a user's aggregates from their contracts (no commit)."""
+    db.query(ContractAggregate).filter(ContractAggregate.user_id == user_id).delete()
+
+    totals = defaultdict(lambda: [0, 0.0])
+    contract_count, valued_count, total_value = 0, 0, 0.0
+    rows = db.query(Contract.start_date, Contract.end_date, Contract.contact_name, Contract.contract_value).filter(
+        Contract.user_id == user_id
+    )
+    for row in rows:
+        contract_count += 1
+        if row.contract_value is not None:
+            valued_count += 1
+            total_value += row.contract_value
+        for key in _buckets(row):
+            totals[key][0] += 1
+            totals[key][1] += row.contract_value or 0.0
+
+    db.add_all([
+        ContractAggregate(user_id=user_id, dimension=dimension, bucket=bucket, contract_count=count, total_value=value)
+        for (dimension, bucket), (count, value) in totals.items()
+    ])
+
+    stats = db.get(UserContractStats, user_id)
+    if stats is None:
+        stats = UserContractStats(user_id=user_id, version=0)
+        db.add(stats)
+    stats.contract_count = contract_count
+    stats.valued_count = valued_count
+    stats.total_value = total_value
+    stats.version = (stats.version or 0) + 1
+    db.flush()
+
+
+def _apply(db: Session, user_id: int, contracts: Iterable[Contract], sign: int):
+    stats = db.get(UserContractStats, user_id)
+    if stats is None:
+        # First change since aggregates were introduced: build from scratch,
+        # which already reflects the pending (flushed) change.
+        db.flush()
+        rebuild_user_aggregates(db, user_id)
+        return
+
+    deltas = defaultdict(lambda: [0, 0.0])
+    count, valued, value_total = 0, 0, 0.0
+    for contract in contracts:
+        count += 1
+        if contract.contract_value is not None:
+            valued += 1
+            value_total += contract.contract_value
+        for key in _buckets(contract):
+            deltas[key][0] += 1
+            deltas[key][1] += contract.contract_value or 0.0
+
+    # Relative UPDATEs so concurrent requests for the same user don't lose increments
+    db.execute(
+        update(UserContractStats)
+        .where(UserContractStats.user_id == user_id)
+        .values(
+            contract_count=UserContractStats.contract_count + sign * count,
+            valued_count=UserContractStats.valued_count + sign * valued,
+            total_value=UserContractStats.total_value + sign * value_total,
+            version=UserContractStats.version + 1,
+        )
+    )
+    for (dimension, bucket), (bucket_count, bucket_value) in deltas.items():
+        updated = db.execute(
+            update(ContractAggregate)
+            .where(
+                ContractAggregate.user_id == user_id,
+                ContractAggregate.dimension == dimension,
+                ContractAggregate.bucket == bucket,
+            )
+            .values(
+                contract_count=ContractAggregate.contract_count + sign * bucket_count,
+                total_value=ContractAggregate.total_value + sign * bucket_value,
+            )
+        ).rowcount
+        if not updated and sign > 0:
+            db.add(ContractAggregate(
+                user_id=user_id, dimension=dimension, bucket=bucket,
+                contract_count=bucket_count, total_value=bucket_value,
+            ))
+    db.flush()
+    db.query(ContractAggregate).filter(
+        ContractAggregate.user_id == user_id,
+        ContractAggregate.contract_count <= 0,
+    ).delete(synchronize_session=False)
+    db.expire(stats)
+
+
+def record_contracts_added(db: Session, user_id: int, contracts: Iterable[Contract]):
+    """Update aggregates for newly added (flushed, uncommitted) contracts."""
+    _apply(db, user_id, contracts, 1)
+
+
+def record_contracts_removed(db: Session, user_id: int, contracts: Iterable[Contract]):
+    """Update aggregates for deleted (flushed, uncommitted) contracts."""
+    _apply(db, user_id, contracts, -1)
+
+
+def get_user_stats(db: Session, user_id: int) -> UserContractStats:
+    """The user's totals row, building aggregates first if they don't exist yet."""
+    stats = db.get(UserContractStats, user_id)
+    if stats is None:
+        rebuild_user_aggregates(db, user_id)
+        db.commit()
+        stats = db.get(UserContractStats, user_id)
+    return stats
+
+
+def get_contract_set_version(db: Session, user_id: int) -> int:
+    """Changes whenever any of the user's contracts is added or removed."""
+    return get_user_stats(db, user_id).version
+
+
+def get_portfolio_summary(db: Session, user_id: int, today: Optional[date] = None) -> dict:
+    """Compact analytics snapshot for a user's whole portfolio."""
+    today = today or date.today()
+    stats = get_user_stats(db, user_id)
+
+    rows = db.query(ContractAggregate).filter(ContractAggregate.user_id == user_id).all()
+    by_dimension = defaultdict(list)
+    for row in rows:
+        by_dimension[row.dimension].append(row)
+
+    first_month = (today.replace(day=1) - timedelta(days=31 * MONTHS_OF_HISTORY)).strftime("%Y-%m")
+    current_month = today.strftime("%Y-%m")
+    value_by_month = {
+        row.bucket: {"contracts": row.contract_count, "value": round(row.total_value, 2)}
+        for row in sorted(by_dimension["start_month"], key=lambda r: r.bucket)
+        if row.bucket >= first_month
+    }
+    expiring_by_month = {
+        row.bucket: row.contract_count
+        for row in sorted(by_dimension["end_month"], key=lambda r: r.bucket)
+        if current_month <= row.bucket
+    }
+    top_counterparties = [
+        {"name": row.bucket, "contracts": row.contract_count, "value": round(row.total_value, 2)}
+        for row in sorted(by_dimension["counterparty"], key=lambda r: (-r.total_value, -r.contract_count))[:TOP_COUNTERPARTIES]
+    ]
+
+    def expiring_within(days: int) -> int:
+        return db.query(func.count(Contract.id)).filter(
+            Contract.user_id == user_id,
+            Contract.end_date >= today,
+            Contract.end_date <= today + timedelta(days=days),
+        ).scalar()
+
+    return {
+        "as_of": today.isoformat(),
+        "total_contracts": stats.contract_count,
+        "contracts_with_value": stats.valued_count,
+        "total_value": round(stats.total_value, 2),
+        "average_value": round(stats.total_value / stats.valued_count, 2) if stats.valued_count else None,
+        "expiring_next_30_days": expiring_within(30),
+        "expiring_next_90_days": expiring_within(90),
+        "expiring_by_month": expiring_by_month,
+        "value_by_start_month": value_by_month,
+        "top_counterparties": top_counterparties,
+    }
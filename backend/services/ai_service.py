@@ -1,47 +1,282 @@
+import asyncio
 import json
-from openai import OpenAI
-from typing import List
+import logging
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Sequence, Tuple
 from backend.config import settings
 from backend.models.contract import Contract
+from backend.services.model_router import escalation_tier, route, tier_model, validation_problem
+from backend.services.rule_extraction import RULES_VERSION, extract_rule_fields, offline_details
+from backend.utils.metrics import (
+    EXTRACTION_ESCALATIONS,
+    LLM_COST,
+    LLM_DURATION,
+    LLM_JSON_PARSE,
+    LLM_REQUESTS,
+    LLM_TOKENS,
+    RULE_FIELDS,
+    TIER_COST,
+    TIER_DURATION,
+    stage,
+)
+from backend.utils.partial_json import JSONObjectStream, repair_json
+from backend.utils.text import extraction_char_budget, parse_char_budget, split_into_chunks
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
 
 # Lazy initialization of OpenAI client
 _client = None
 
-def get_client():
-    """Get or create OpenAI client."""
+def get_client() -> "AsyncOpenAI":
+    """Get or create the shared async OpenAI client.
+
+    All calls on a worker share one bounded httpx connection pool, so a burst
+    of extractions queues for a connection instead of opening unbounded sockets.
+    The openai package is imported here, on first use, to keep startup fast.
+    """
     global _client
     if _client is None:
-        _client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        import httpx
+        from openai import AsyncOpenAI
+
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE,
+            ),
+            timeout=httpx.Timeout(settings.OPENAI_EXTRACT_TIMEOUT, connect=settings.OPENAI_CONNECT_TIMEOUT),
+        )
+        _client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+            http_client=http_client,
+        )
     return _client
 
+async def close_client():
+    """Close the shared OpenAI client and its connection pool."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+# USD per million (prompt, completion) tokens, for the llm_cost_usd_total estimate
+MODEL_PRICES = {
+    "gpt-4": (30.0, 60.0),
+    "gpt-4-turbo": (10.0, 30.0),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-3.5-turbo": (0.5, 1.5),
+}
+
+def usage_cost(model: str, usage) -> float:
+    """Estimated USD cost of a response's ``usage`` (0 for models without a known price)."""
+    prices = MODEL_PRICES.get(model)
+    if usage is None or not prices:
+        return 0.0
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+def record_llm_usage(model: str, operation: str, usage) -> float:
+    """Count the tokens and estimated cost reported in a response's ``usage``; returns the cost."""
+    if usage is None:
+        return 0.0
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    LLM_TOKENS.inc(prompt_tokens, model=model, operation=operation, kind="prompt")
+    LLM_TOKENS.inc(completion_tokens, model=model, operation=operation, kind="completion")
+    cost = usage_cost(model, usage)
+    if model in MODEL_PRICES:
+        LLM_COST.inc(cost, model=model, operation=operation)
+    return cost
+
+async def create_completion(operation: str, **kwargs):
+    """``chat.completions.create`` (non-streaming) with latency, outcome, token and cost metrics."""
+    model = kwargs["model"]
+    start = time.perf_counter()
+    try:
+        response = await get_client().chat.completions.create(**kwargs)
+    except Exception:
+        LLM_REQUESTS.inc(model=model, operation=operation, outcome="error")
+        raise
+    finally:
+        LLM_DURATION.observe(time.perf_counter() - start, model=model, operation=operation)
+    LLM_REQUESTS.inc(model=model, operation=operation, outcome="ok")
+    record_llm_usage(model, operation, response.usage)
+    return response
+
+# Bump whenever the extraction prompt changes so cached results are not reused
+EXTRACTION_PROMPT_VERSION = "2"
+
+def _models_version() -> str:
+    if not settings.MODEL_ROUTING_ENABLED:
+        return settings.EXTRACTION_MODEL_LARGE
+    return (
+        f"{settings.EXTRACTION_MODEL_FAST}<{settings.ROUTING_FAST_MAX_SCORE}<{settings.EXTRACTION_MODEL_STANDARD}"
+        f"<{settings.ROUTING_STANDARD_MAX_SCORE}<{settings.EXTRACTION_MODEL_LARGE}"
+    )
+
+def extraction_version() -> str:
+    """Identify the prompt, models and text budget that produce extraction results."""
+    mode = "long" if settings.LONG_DOCUMENT_MODE else "short"
+    rules = f"rules{RULES_VERSION}" if settings.RULE_EXTRACTION_ENABLED else "norules"
+    return (
+        f"{EXTRACTION_PROMPT_VERSION}:{_models_version()}:{settings.EXTRACTION_OUTPUT_MODE}:{rules}:"
+        f"{extraction_char_budget() or 'all'}:{mode}:{parse_char_budget() or 'all'}"
+    )
+
+DETAIL_FIELDS = [
+    "contact_name",
+    "contact_email",
+    "contact_phone",
+    "start_date",
+    "end_date",
+    "contract_value",
+    "payment_terms",
+    "termination_terms",
+    "summary",
+]
+
+def fallback_details(contact_name: str, summary: str) -> dict:
+    """Placeholder extraction result returned when the AI call cannot be made."""
+    return {
+        "contact_name": contact_name,
+        "contact_email": None,
+        "contact_phone": None,
+        "start_date": None,
+        "end_date": None,
+        "contract_value": None,
+        "payment_terms": None,
+        "termination_terms": None,
+        "summary": summary
+    }
+
+def offline_extraction() -> bool:
+    """Whether extraction runs on the rule-based extractor alone, without OpenAI."""
+    mode = settings.OFFLINE_EXTRACTION
+    return mode == "always" or (mode == "auto" and not settings.OPENAI_API_KEY)
+
+def missing_api_key_details() -> dict:
+    return fallback_details(
+        "API Key Not Configured",
+        "Please configure your OpenAI API key in the .env file to enable AI extraction."
+    )
+
+def extraction_error_details(error: Exception) -> dict:
+    return fallback_details(
+        f"Error: {str(error)}",
+        f"Error extracting contract details: {str(error)}"
+    )
+
 async def extract_contract_details(text: str) -> dict:
     """Extract contract details using OpenAI."""
+    if offline_extraction():
+        return offline_details(text)
 
     # Check if API key is configured
     if not settings.OPENAI_API_KEY or settings.OPENAI_API_KEY == "":
-        print("WARNING: OpenAI API key not configured!")
+        logger.warning("OpenAI API key not configured")
+        return missing_api_key_details()
+
+    try:
+        with stage("llm_extract"):
+            return await request_contract_details(text)
+    except Exception as e:
+        logger.exception("Error extracting contract details: %s", e)
+        return extraction_error_details(e)
+
+FIELD_DESCRIPTIONS = {
+    "contact_name": "Full name of the primary contact person, signatory, or party (employer, employee, vendor, client, etc.)",
+    "contact_email": "Email address if present",
+    "contact_phone": "Phone number with country code if present",
+    "start_date": "Effective/start date in YYYY-MM-DD format (employment start date, contract effective date, lease start, etc.)",
+    "end_date": "End/expiration date in YYYY-MM-DD format if specified (not all contracts have this - employment may be indefinite, some contracts auto-renew)",
+    "contract_value": "Numeric value of the contract/agreement (salary, contract amount, lease amount, etc.) - extract the number only without currency symbols. For employment, use annual salary. For recurring payments, use total contract value if stated.",
+    "payment_terms": "Description of payment terms, salary structure, or compensation details",
+    "termination_terms": "Description of termination, resignation, cancellation, or exit conditions",
+    "summary": "A concise 3-5 sentence summary explaining: (1) what type of document this is, (2) the key parties involved, (3) the main purpose/obligations, and (4) key terms or dates",
+}
+
+EXTRACTION_FUNCTION = "record_contract_details"
+
+def extraction_schema(fields: Sequence[str] = DETAIL_FIELDS) -> dict:
+    """JSON schema of an extraction result, generated from ContractCreate.
+
+    Covers ``fields``, by default all DETAIL_FIELDS (never ``file_name`` or
+    ``document_key``, which the model does not produce). Every field is
+    required but nullable and no other properties are allowed, as OpenAI's
+    strict mode requires.
+    """
+    from backend.schemas.contract import ContractCreate
+
+    model_schema = ContractCreate.model_json_schema()["properties"]
+    properties = {}
+    for field in fields:
+        spec = model_schema[field]
+        types = [option["type"] for option in spec.get("anyOf", [spec])]
+        properties[field] = {"type": types, "description": FIELD_DESCRIPTIONS[field]}
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(fields),
+        "additionalProperties": False,
+    }
+
+def _output_format(fields: Sequence[str]) -> dict:
+    """Request arguments that constrain the answer to ``extraction_schema(fields)``.
+
+    "function" forces a call to a function taking the details as arguments
+    (supported by every current chat model), "json_schema" uses strict
+    structured outputs (gpt-4o and later), "text" relies on the prompt alone.
+    """
+    mode = settings.EXTRACTION_OUTPUT_MODE
+    if mode == "function":
+        return {
+            "tools": [{
+                "type": "function",
+                "function": {
+                    "name": EXTRACTION_FUNCTION,
+                    "description": "Record the details extracted from the contract document.",
+                    "parameters": extraction_schema(fields),
+                },
+            }],
+            "tool_choice": {"type": "function", "function": {"name": EXTRACTION_FUNCTION}},
+        }
+    if mode == "json_schema":
         return {
-            "contact_name": "API Key Not Configured",
-            "contact_email": None,
-            "contact_phone": None,
-            "start_date": None,
-            "end_date": None,
-            "contract_value": None,
-            "payment_terms": None,
-            "termination_terms": None,
-            "summary": "Please configure your OpenAI API key in the .env file to enable AI extraction."
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {"name": "contract_details", "strict": True, "schema": extraction_schema(fields)},
+            },
         }
+    return {}
 
-    try:
-        print(f"Extracting contract details from text (length: {len(text)} chars)...")
-        print(f"First 200 chars: {text[:200]}")
+def _prompt_text(text: str) -> str:
+    """The part of ``text`` an extraction prompt includes (and routing scores)."""
+    return text[:extraction_char_budget()]
+
+def _extraction_request(
+    text: str, model: str, part: Optional[Tuple[int, int]] = None, fields: Sequence[str] = DETAIL_FIELDS
+) -> dict:
+    """``chat.completions.create`` arguments for extracting ``fields`` from ``text`` with ``model``."""
+    part_note = ""
+    if part:
+        part_note = f"""
+NOTE: This text is part {part[0]} of {part[1]} of a longer document. Use null for any field that is not stated in this part, and summarize only this part.
+"""
 
-        response = get_client().chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an intelligent contract analysis assistant. You can analyze ANY type of contract or agreement document (employment agreements, vendor contracts, service agreements, leases, NDAs, etc.) and extract relevant information in a structured way.
+    return dict(
+        model=model,
+        messages=[
+            {
+                "role": "system",
+                "content": """You are an intelligent contract analysis assistant. You can analyze ANY type of contract or agreement document (employment agreements, vendor contracts, service agreements, leases, NDAs, etc.) and extract relevant information in a structured way.
 
 Your task is to:
 1. Identify what type of document this is
@@ -49,22 +284,12 @@ Your task is to:
 3. Return a structured JSON response with the information you find
 
 IMPORTANT: Return ONLY valid JSON, no markdown, no code blocks, no explanations."""
-                },
-                {
-                    "role": "user",
-                    "content": f"""Analyze this document and extract all relevant contractual information. Return a JSON object with the following structure:
-
-{{
-  "contact_name": "Full name of the primary contact person, signatory, or party (employer, employee, vendor, client, etc.)",
-  "contact_email": "Email address if present",
-  "contact_phone": "Phone number with country code if present",
-  "start_date": "Effective/start date in YYYY-MM-DD format (employment start date, contract effective date, lease start, etc.)",
-  "end_date": "End/expiration date in YYYY-MM-DD format if specified (not all contracts have this - employment may be indefinite, some contracts auto-renew)",
-  "contract_value": "Numeric value of the contract/agreement (salary, contract amount, lease amount, etc.) - extract the number only without currency symbols. For employment, use annual salary. For recurring payments, use total contract value if stated.",
-  "payment_terms": "Description of payment terms, salary structure, or compensation details",
-  "termination_terms": "Description of termination, resignation, cancellation, or exit conditions",
-  "summary": "A concise 3-5 sentence summary explaining: (1) what type of document this is, (2) the key parties involved, (3) the main purpose/obligations, and (4) key terms or dates"
-}}
+            },
+            {
+                "role": "user",
+                "content": f"""Analyze this document and extract all relevant contractual information. Return a JSON object with the following structure:
+
+{json.dumps({field: FIELD_DESCRIPTIONS[field] for field in fields}, indent=2)}
 
 INSTRUCTIONS:
 - Extract information intelligently based on the document type
@@ -74,60 +299,338 @@ INSTRUCTIONS:
 - Be flexible: "start_date" could be employment start, contract effective date, lease commencement, etc.
 - "contact_name" should be the most relevant person (employee for employment agreement, vendor contact for service contract, etc.)
 - In the summary, clearly state what type of document this is
-
+{part_note}
 Document text:
-{text[:6000]}
+{_prompt_text(text)}
 
 Return ONLY the JSON object, nothing else."""
-                }
-            ],
-            temperature=0.2,
-            max_tokens=1200
-        )
+            }
+        ],
+        temperature=0.2,
+        max_tokens=1200,
+        timeout=settings.OPENAI_EXTRACT_TIMEOUT,
+        **_output_format(fields),
+    )
+
+def _answer_text(message) -> str:
+    """The JSON answer in a response message or stream delta: function arguments or content."""
+    if message.tool_calls:
+        return message.tool_calls[0].function.arguments or ""
+    return message.content or ""
+
+def rule_fields(text: str) -> dict:
+    """Fields the rule-based extractor is confident about (none when it is disabled)."""
+    if not settings.RULE_EXTRACTION_ENABLED:
+        return {}
+    with stage("rules"):
+        fields = extract_rule_fields(text)
+    for field in fields:
+        RULE_FIELDS.inc(field=field)
+    return fields
 
-        content = response.choices[0].message.content
-        print(f"OpenAI Response: {content}")
+async def request_contract_details(
+    text: str, part: Optional[Tuple[int, int]] = None, tier: Optional[str] = None
+) -> dict:
+    """Ask OpenAI for contract details; raises if the call or JSON parsing fails.
 
-        # Try to parse JSON from the response
+    Fields found by ``rule_fields`` (in all of ``text``, not just the part
+    that fits the prompt) are not asked for and take precedence. The model
+    is that of ``tier``, by default the one ``route`` picks for the part of
+    ``text`` the prompt includes.
+    ``part`` is ``(index, total)`` when ``text`` is one chunk of a longer document.
+    """
+    logger.debug("Extracting contract details from %d chars of text", len(text))
+    known = rule_fields(text)
+    return await _request_details(text, part, known, tier or route(_prompt_text(text)))
+
+async def _request_details(text: str, part: Optional[Tuple[int, int]], known: dict, tier: str) -> dict:
+    """Extract the fields not in ``known``, moving up a tier while the answer fails validation."""
+    remaining = [field for field in DETAIL_FIELDS if field not in known]
+    while True:
+        model = tier_model(tier)
+        start = time.perf_counter()
+        try:
+            response = await create_completion("extract", **_extraction_request(text, model, part, remaining))
+        finally:
+            TIER_DURATION.observe(time.perf_counter() - start, tier=tier)
+        TIER_COST.inc(usage_cost(model, response.usage), tier=tier)
+
+        content = _answer_text(response.choices[0].message)
+        logger.debug("OpenAI response: %s", content)
+        next_tier = escalation_tier(tier)
         try:
-            # First try direct JSON parsing
-            result = json.loads(content)
-            print(f"Successfully parsed JSON: {result}")
+            with stage("json_parse"):
+                details = {**parse_json_response(content), **known}
+        except ValueError:
+            if next_tier is None:
+                raise
+            problem = "parse_error"
+        else:
+            problem = validation_problem(details, partial=part is not None)
+            if problem is None or next_tier is None:
+                return details
+        logger.info("Extraction by the %s tier failed validation (%s); retrying on %s", tier, problem, next_tier)
+        EXTRACTION_ESCALATIONS.inc(tier=tier, reason=problem)
+        tier = next_tier
+
+async def stream_contract_details(text: str) -> AsyncIterator[dict]:
+    """Like ``request_contract_details``, but report fields while the answer streams in.
+
+    Yields ``{"field": name, "value": value}`` as soon as each field's value
+    is complete (rule-based fields first, before the model is called), then
+    ``{"details": {...}}`` with the whole parsed (and, if needed, repaired)
+    answer. If the answer fails validation it is requested again from the
+    next tier up, and fields whose value changed are reported again. Raises
+    if the call or JSON parsing fails. Closing the generator cancels the
+    upstream completion.
+    """
+    known = rule_fields(text)
+    for name, value in known.items():
+        yield {"field": name, "value": value}
+    remaining = [field for field in DETAIL_FIELDS if field not in known]
+    tier = route(_prompt_text(text))
+    model = tier_model(tier)
+
+    start = time.perf_counter()
+    outcome = "error"
+    parser = JSONObjectStream()
+    pieces = []
+    try:
+        stream = await get_client().chat.completions.create(
+            **_extraction_request(text, model, fields=remaining),
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        try:
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    TIER_COST.inc(record_llm_usage(model, "extract_stream", chunk.usage), tier=tier)
+                if not chunk.choices:
+                    continue
+                piece = _answer_text(chunk.choices[0].delta)
+                if not piece:
+                    continue
+                pieces.append(piece)
+                for name, value in parser.feed(piece):
+                    if name in remaining:
+                        yield {"field": name, "value": value}
+            outcome = "ok"
+        except (asyncio.CancelledError, GeneratorExit):
+            outcome = "cancelled"
+            raise
+        finally:
+            await asyncio.shield(stream.close())
+    finally:
+        elapsed = time.perf_counter() - start
+        LLM_REQUESTS.inc(model=model, operation="extract_stream", outcome=outcome)
+        LLM_DURATION.observe(elapsed, model=model, operation="extract_stream")
+        TIER_DURATION.observe(elapsed, tier=tier)
+
+    next_tier = escalation_tier(tier)
+    try:
+        with stage("json_parse"):
+            details = {**parse_json_response("".join(pieces)), **known}
+    except ValueError:
+        if next_tier is None:
+            raise
+        details, problem = {}, "parse_error"
+    else:
+        problem = validation_problem(details)
+    if problem is not None and next_tier is not None:
+        logger.info("Extraction by the %s tier failed validation (%s); retrying on %s", tier, problem, next_tier)
+        EXTRACTION_ESCALATIONS.inc(tier=tier, reason=problem)
+        streamed = {**details, **parser.fields}
+        details = await _request_details(text, None, known, next_tier)
+        for name in remaining:
+            if name in details and (name not in streamed or details[name] != streamed[name]):
+                yield {"field": name, "value": details[name]}
+    yield {"details": details}
+
+def parse_json_response(content: str) -> dict:
+    """Parse the model's JSON object answer.
+
+    Falls back to a markdown code block in the answer, and then to repairing
+    it locally (see ``repair_json``) rather than asking the model again.
+    Raises ValueError if no JSON object can be recovered; valid JSON of
+    another type (a list, a string) is not an answer either.
+    """
+    try:
+        result = json.loads(content)
+        if isinstance(result, dict):
+            LLM_JSON_PARSE.inc(method="direct")
             return result
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error: {e}")
-            # If response is not pure JSON, try to extract JSON from markdown code blocks
-            if "```json" in content:
-                json_str = content.split("```json")[1].split("```")[0].strip()
-                result = json.loads(json_str)
-                print(f"Extracted from ```json block: {result}")
+    except json.JSONDecodeError as e:
+        logger.debug("Response is not plain JSON: %s", e)
+    # The answer wrapped in a markdown code block
+    for marker, method in (("```json", "json_block"), ("```", "code_block")):
+        if marker in content:
+            try:
+                result = json.loads(content.split(marker)[1].split("```")[0].strip())
+            except (IndexError, json.JSONDecodeError):
+                break
+            if isinstance(result, dict):
+                LLM_JSON_PARSE.inc(method=method)
                 return result
-            elif "```" in content:
-                json_str = content.split("```")[1].split("```")[0].strip()
-                result = json.loads(json_str)
-                print(f"Extracted from ``` block: {result}")
-                return result
-            else:
-                print(f"Could not parse JSON. Raw content: {content}")
-                raise ValueError("Could not parse JSON from OpenAI response")
-    except Exception as e:
-        print(f"Error extracting contract details: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return {
-            "contact_name": f"Error: {str(e)}",
-            "contact_email": None,
-            "contact_phone": None,
-            "start_date": None,
-            "end_date": None,
-            "contract_value": None,
-            "payment_terms": None,
-            "termination_terms": None,
-            "summary": f"Error extracting contract details: {str(e)}"
-        }
+            break
+    try:
+        result = json.loads(repair_json(content))
+    except json.JSONDecodeError:
+        result = None
+    if isinstance(result, dict):
+        logger.info("Repaired malformed JSON in OpenAI response")
+        LLM_JSON_PARSE.inc(method="repaired")
+        return result
+    LLM_JSON_PARSE.inc(method="failed")
+    logger.warning("Could not parse JSON from OpenAI response: %s", content[:500])
+    raise ValueError("Could not parse JSON from OpenAI response")
+
+async def extract_long_contract_details(text: str) -> Tuple[dict, bool]:
+    """Map-reduce extraction for documents longer than the prompt budget.
+
+    The text is split into overlapping chunks, each chunk is extracted
+    concurrently (at most LONG_DOCUMENT_CONCURRENCY calls in flight), and the
+    per-chunk results are reconciled into a single ContractCreate-shaped dict.
+    Returns that dict and whether every chunk was extracted; a result merged
+    from only some chunks should not be cached. Raises if every chunk failed.
+    """
+    chunks = split_into_chunks(
+        text,
+        extraction_char_budget() or settings.LONG_DOCUMENT_CHUNK_CHARS,
+        settings.LONG_DOCUMENT_CHUNK_OVERLAP,
+    )[:settings.LONG_DOCUMENT_MAX_CHUNKS]
+    # Every chunk is extracted on one tier, routed on a prompt-sized part of
+    # the document like a single-call extraction
+    tier = route(_prompt_text(text))
+    if len(chunks) <= 1:
+        return await request_contract_details(text, tier=tier), True
+
+    logger.info("Long document mode: %d chars in %d chunks", len(text), len(chunks))
+    semaphore = asyncio.Semaphore(settings.LONG_DOCUMENT_CONCURRENCY)
+
+    async def extract_chunk(index: int, chunk: str):
+        async with semaphore:
+            try:
+                return await request_contract_details(chunk, part=(index + 1, len(chunks)), tier=tier)
+            except Exception as e:
+                logger.warning("Chunk %d/%d failed: %s", index + 1, len(chunks), e)
+                return None
+
+    results = await asyncio.gather(*(extract_chunk(i, chunk) for i, chunk in enumerate(chunks)))
+    partials = [r for r in results if isinstance(r, dict)]
+    if not partials:
+        raise ValueError("Extraction failed for every chunk of the document")
+
+    merged = merge_chunk_details(partials)
+    summaries = _unique([p.get("summary") for p in partials])
+    if len(summaries) > 1:
+        try:
+            merged["summary"] = await summarize_chunk_summaries(summaries, tier_model(tier))
+        except Exception as e:
+            logger.warning("Summary reduce step failed, using first chunk summary: %s", e)
+    return merged, len(partials) == len(chunks)
+
+def _unique(values) -> list:
+    seen = []
+    for value in values:
+        if isinstance(value, str):
+            value = value.strip()
+        if value in (None, "") or value in seen:
+            continue
+        seen.append(value)
+    return seen
+
+def _to_float(value) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(",", "").replace("$", "").strip())
+    except ValueError:
+        return None
+
+def coerce_details(details: dict) -> dict:
+    """Restrict a model response to the ContractCreate fields with usable types."""
+    result = {}
+    for field in DETAIL_FIELDS:
+        value = details.get(field)
+        if field == "contract_value":
+            value = _to_float(value)
+        elif value is not None and not isinstance(value, str):
+            value = json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+        result[field] = value
+    return result
+
+def _most_common(values: list, prefer=min):
+    """Most frequently reported value; ties are broken by ``prefer``."""
+    if not values:
+        return None
+    counts = Counter(values)
+    top = max(counts.values())
+    return prefer(v for v, n in counts.items() if n == top)
+
+def merge_chunk_details(partials: List[dict]) -> dict:
+    """Reconcile per-chunk extraction results, given in document order."""
+    def first(field):
+        values = _unique([p.get(field) for p in partials])
+        return values[0] if values else None
+
+    values = [v for v in (_to_float(p.get("contract_value")) for p in partials) if v is not None]
+    summaries = _unique([p.get("summary") for p in partials])
+
+    return {
+        # Parties and contacts are normally introduced at the top of the document
+        "contact_name": first("contact_name"),
+        "contact_email": first("contact_email"),
+        "contact_phone": first("contact_phone"),
+        # Dates: the value most chunks agree on; ties favour the widest term
+        "start_date": _most_common([p["start_date"] for p in partials if p.get("start_date")], prefer=min),
+        "end_date": _most_common([p["end_date"] for p in partials if p.get("end_date")], prefer=max),
+        "contract_value": _most_common(values, prefer=max),
+        "payment_terms": "\n".join(_unique([p.get("payment_terms") for p in partials])) or None,
+        "termination_terms": "\n".join(_unique([p.get("termination_terms") for p in partials])) or None,
+        "summary": summaries[0] if summaries else None,
+    }
 
-async def chat_with_contracts(message: str, contracts: List[Contract]) -> str:
-    """Chat with AI about contracts data."""
+async def summarize_chunk_summaries(summaries: List[str], model: str) -> str:
+    """Combine per-chunk summaries into one 3-5 sentence document summary."""
+    parts = "\n\n".join(f"Part {i + 1}: {summary}" for i, summary in enumerate(summaries))
+    response = await create_completion(
+        "summarize",
+        model=model,
+        messages=[
+            {
+                "role": "system",
+                "content": "You are an intelligent contract analysis assistant."
+            },
+            {
+                "role": "user",
+                "content": f"""The following are summaries of consecutive parts of one contract document. Write a single concise 3-5 sentence summary of the whole document explaining: (1) what type of document this is, (2) the key parties involved, (3) the main purpose/obligations, and (4) key terms or dates.
+
+{parts}
+
+Return ONLY the summary text."""
+            }
+        ],
+        temperature=0.2,
+        max_tokens=400,
+        timeout=settings.OPENAI_EXTRACT_TIMEOUT
+    )
+    return response.choices[0].message.content.strip()
+
+def _chat_messages(
+    message: str,
+    portfolio: dict,
+    contracts: List[Contract],
+    passages: Optional[List[dict]] = None,
+) -> List[dict]:
+    """Build the chat prompt.
+
+    ``portfolio`` holds precomputed aggregates over all of the user's
+    contracts; ``contracts`` is only a bounded sample of individual contracts,
+    and ``passages`` are the top-k document excerpts retrieved for the
+    question, so the prompt size does not grow with the portfolio.
+    """
     # Prepare contract data for context
     contract_data = [{
         "id": c.id,
@@ -139,25 +642,90 @@ async def chat_with_contracts(message: str, contracts: List[Contract]) -> str:
         "summary": c.summary
     } for c in contracts]
 
+    excerpts = ""
+    if passages:
+        excerpts = "\n\nExcerpts from the contract documents that best match the question:\n" + "\n\n".join(
+            f"[contract {p['contract_id']}] {p['text']}" for p in passages
+        )
+
+    return [
+        {
+            "role": "system",
+            "content": f"""You are a contract analytics assistant.
+
+Portfolio aggregates, exact and covering ALL of the user's contracts:
+{json.dumps(portfolio, separators=(",", ":"), default=str)}
+
+The {len(contract_data)} most recently added contracts (out of {portfolio.get("total_contracts", len(contract_data))} in total):
+{json.dumps(contract_data, separators=(",", ":"), default=str)}{excerpts}
+
+Answer questions about these contracts. Use the aggregates for totals, counts, values, trends, expirations and counterparties. Use the individual contracts and the excerpts for details and exact clause wording, and say so when a question needs contracts that are not listed. Provide insights, statistics, and analysis based on the data."""
+        },
+        {
+            "role": "user",
+            "content": message
+        }
+    ]
+
+async def chat_with_contracts(
+    message: str,
+    portfolio: dict,
+    contracts: List[Contract],
+    passages: Optional[List[dict]] = None,
+) -> str:
+    """Chat with AI about contracts data (see ``_chat_messages`` for the context)."""
     try:
-        response = get_client().chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"""You are a contract analytics assistant. You have access to the following contracts data:
-                    {json.dumps(contract_data, indent=2)}
-
-                    Answer questions about these contracts. Provide insights, statistics, and analysis based on the data."""
-                },
-                {
-                    "role": "user",
-                    "content": message
-                }
-            ],
-            temperature=0.7
+        response = await create_completion(
+            "chat",
+            model=settings.CHAT_MODEL,
+            messages=_chat_messages(message, portfolio, contracts, passages),
+            temperature=0.7,
+            timeout=settings.OPENAI_CHAT_TIMEOUT
         )
 
         return response.choices[0].message.content
     except Exception as e:
         raise Exception(f"Error processing chat: {str(e)}")
+
+async def stream_chat_with_contracts(
+    message: str,
+    portfolio: dict,
+    contracts: List[Contract],
+    passages: Optional[List[dict]] = None,
+) -> AsyncIterator[str]:
+    """Like ``chat_with_contracts``, but yield the answer text as it is generated.
+
+    Closing the generator (e.g. because the client disconnected) closes the
+    upstream HTTP response, which cancels the completion.
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        stream = await get_client().chat.completions.create(
+            model=settings.CHAT_MODEL,
+            messages=_chat_messages(message, portfolio, contracts, passages),
+            temperature=0.7,
+            timeout=settings.OPENAI_CHAT_TIMEOUT,
+            stream=True,
+            # The last chunk then carries the token usage
+            stream_options={"include_usage": True},
+        )
+        try:
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    record_llm_usage(settings.CHAT_MODEL, "chat_stream", chunk.usage)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+            outcome = "ok"
+        except (asyncio.CancelledError, GeneratorExit):
+            outcome = "cancelled"
+            raise
+        finally:
+            # Shielded so the upstream response is closed even while this task is being cancelled
+            await asyncio.shield(stream.close())
+    finally:
+        LLM_REQUESTS.inc(model=settings.CHAT_MODEL, operation="chat_stream", outcome=outcome)
+        LLM_DURATION.observe(time.perf_counter() - start, model=settings.CHAT_MODEL, operation="chat_stream")
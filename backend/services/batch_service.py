@@ -0,0 +1,195 @@
+import asyncio
+import os
+import zipfile
+from dataclasses import dataclass
+from functools import partial
+from typing import AsyncIterator, BinaryIO, Callable, List, Tuple
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.schemas.contract import ContractCreate
+from backend.services.ai_service import coerce_details
+from backend.services.contract_service import create_contracts
+from backend.services.extraction_cache import document_hash
+from backend.services.extraction_service import extract_document
+
+ALLOWED_EXTENSIONS = ['pdf', 'docx', 'doc']
+
+
+def _extension(filename: str) -> str:
+    return filename.lower().split('.')[-1]
+
+
+@dataclass
+class BatchDocument:
+    """A document in a batch; its content is only read (blocking) when it is extracted."""
+    file_name: str
+    size: int
+    read: Callable[[], bytes]
+
+
+def _read_upload(file: BinaryIO) -> bytes:
+    file.seek(0)
+    return file.read()
+
+
+def _upload_size(file: BinaryIO) -> int:
+    size = file.seek(0, os.SEEK_END)
+    file.seek(0)
+    return size
+
+
+def expand_archive(file: BinaryIO, archive_name: str) -> List[BatchDocument]:
+    """Return the supported documents inside a zip archive.
+
+    Only the archive's directory is read here; sizes come from the entries'
+    declared (uncompressed) sizes, which also bound what a read returns.
+    """
+    try:
+        archive = zipfile.ZipFile(file)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail=f"{archive_name} is not a valid zip archive")
+
+    documents = []
+    for info in archive.infolist():
+        name = os.path.basename(info.filename)
+        if info.is_dir() or not name or name.startswith('.') or info.filename.startswith('__MACOSX'):
+            continue
+        if _extension(name) not in ALLOWED_EXTENSIONS:
+            continue
+        if info.file_size > settings.BATCH_MAX_FILE_BYTES:
+            raise HTTPException(status_code=400, detail=f"{info.filename} in {archive_name} is too large")
+        documents.append(BatchDocument(name, info.file_size, partial(archive.read, info)))
+    return documents
+
+
+def collect_documents(uploads: List[Tuple[str, BinaryIO]]) -> List[BatchDocument]:
+    """Flatten uploaded files and zip archives into documents, without reading their content.
+
+    ``uploads`` are ``(file_name, file)`` pairs; the files (spooled to disk
+    by the multipart parser when large) must stay open until the batch has
+    run, which FastAPI >= 0.118 guarantees for a streamed response. The document count and total size are checked here, before
+    anything is read into memory. Blocking; run it in the threadpool.
+    """
+    documents = []
+    total_bytes = 0
+    for filename, file in uploads:
+        extension = _extension(filename)
+        if extension == 'zip':
+            found = expand_archive(file, filename)
+        elif extension in ALLOWED_EXTENSIONS:
+            size = _upload_size(file)
+            if size > settings.BATCH_MAX_FILE_BYTES:
+                raise HTTPException(status_code=400, detail=f"{filename} is too large")
+            found = [BatchDocument(filename, size, partial(_read_upload, file))]
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid file type for {filename}. Allowed types: {', '.join(ALLOWED_EXTENSIONS + ['zip'])}"
+            )
+
+        documents.extend(found)
+        total_bytes += sum(document.size for document in found)
+        if len(documents) > settings.BATCH_MAX_FILES:
+            raise HTTPException(status_code=400, detail=f"Too many documents; the limit is {settings.BATCH_MAX_FILES}")
+        if total_bytes > settings.BATCH_MAX_TOTAL_BYTES:
+            raise HTTPException(
+                status_code=400, detail=f"Batch too large; the limit is {settings.BATCH_MAX_TOTAL_BYTES} bytes of documents"
+            )
+
+    if not documents:
+        raise HTTPException(status_code=400, detail="No PDF or DOCX documents found in upload")
+    return documents
+
+
+def _save_contracts(items: List[Tuple[dict, str]], user_id: int) -> List[int]:
+    db = SessionLocal()
+    try:
+        return create_contracts(db, items, user_id)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def run_batch(documents: List[BatchDocument], user_id: int) -> AsyncIterator[dict]:
+    """Extract documents concurrently and save them in a single transaction.
+
+    A document's content is only read once it gets one of the
+    BATCH_CONCURRENCY slots, so at most that many are held in memory.
+
+    Yields one event per finished document as soon as it completes, then a
+    final ``complete`` event with the ids of the saved contracts.
+    """
+    total = len(documents)
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+    async def process(index: int, document: BatchDocument):
+        filename = document.file_name
+        async with semaphore:
+            try:
+                content = await run_in_threadpool(document.read)
+                details = await extract_document(content, filename, strict=True)
+                contract = ContractCreate(
+                    file_name=filename, document_key=document_hash(content), **coerce_details(details)
+                )
+                return index, contract, None
+            except HTTPException as e:
+                return index, None, str(e.detail)
+            except Exception as e:
+                return index, None, str(e)
+
+    tasks = [
+        asyncio.create_task(process(index, document))
+        for index, document in enumerate(documents)
+    ]
+    extracted = {}
+    try:
+        yield {"event": "started", "total": total}
+
+        completed = 0
+        for next_done in asyncio.as_completed(tasks):
+            index, contract, error = await next_done
+            completed += 1
+            event = {
+                "event": "file",
+                "index": index,
+                "file_name": documents[index].file_name,
+                "completed": completed,
+                "total": total,
+            }
+            if error is None:
+                extracted[index] = contract
+                event.update(status="extracted", details=contract.dict(exclude={'file_name', 'document_key'}))
+            else:
+                event.update(status="failed", error=error)
+            yield event
+    finally:
+        # The client went away or something failed: stop outstanding work
+        for task in tasks:
+            task.cancel()
+
+    created = []
+    if extracted:
+        order = sorted(extracted)
+        items = [(extracted[i].dict(exclude={'file_name'}), extracted[i].file_name) for i in order]
+        try:
+            ids = await run_in_threadpool(_save_contracts, items, user_id)
+        except Exception as e:
+            yield {"event": "error", "error": f"Failed to save contracts: {str(e)}"}
+            return
+        created = [
+            {"index": i, "file_name": extracted[i].file_name, "id": contract_id}
+            for i, contract_id in zip(order, ids)
+        ]
+
+    yield {
+        "event": "complete",
+        "total": total,
+        "created": created,
+        "failed": total - len(extracted),
+    }
@@ -0,0 +1,196 @@
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from backend.config import settings
+from backend.services.retrieval_service import STOPWORDS
+from backend.utils.cache import LRUCache
+from backend.utils.metrics import CACHE_REQUESTS
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_CAPITALIZED = re.compile(r"\b[A-Z][\w&-]*")
+
+# Words that change what a question asks for even when the rest of it matches:
+# periods, months, ordering, comparison and negation
+KEY_WORDS = frozenset([
+    "day", "days", "week", "weeks", "month", "months", "quarter", "quarters", "year", "years",
+    "today", "yesterday", "tomorrow", "this", "next", "last", "previous", "current", "past", "upcoming",
+    "january", "february", "march", "april", "may", "june", "july", "august", "september",
+    "october", "november", "december", "before", "after", "since", "until", "over", "under",
+    "above", "below", "more", "less", "most", "least", "highest", "lowest", "largest", "smallest",
+    "biggest", "top", "bottom", "first", "earliest", "latest", "oldest", "newest",
+    "not", "no", "without", "except", "expired", "active", "renewed", "terminated",
+])
+
+# cache_requests_total result label for each lookup counter
+_LOOKUP_RESULTS = {"exact_hits": "hit", "similar_hits": "similar_hit", "misses": "miss"}
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return " ".join(_WORD.findall(question.lower()))
+
+
+def question_terms(normalized: str) -> FrozenSet[str]:
+    """Content words of a normalized question, with plurals folded ("expires" == "expire")."""
+    terms = set()
+    for word in normalized.split():
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.add(word)
+    return frozenset(terms)
+
+
+def key_terms(question: str) -> FrozenSet[str]:
+    """Terms two questions must share for one's answer to serve the other.
+
+    Numbers, ``KEY_WORDS`` and capitalized names after the first word
+    ("contracts with Acme" is not "contracts with Globex").
+    """
+    words = normalize_question(question).split()
+    keys = {word for word in words if word in KEY_WORDS or any(char.isdigit() for char in word)}
+    names = _CAPITALIZED.findall(question)[1:] if question[:1].isupper() else _CAPITALIZED.findall(question)
+    keys.update(name.lower() for name in names if name != "I")
+    return frozenset(keys)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class CachedAnswer:
+    question: str
+    terms: FrozenSet[str]
+    keys: FrozenSet[str]
+    answer: str
+
+
+class ChatResponseCache:
+    """In-process cache of analytics chat answers.
+
+    Answers are keyed on the normalized question within a scope of
+    ``(user_id, contract_set_version, day)``: any upload or delete bumps the
+    user's contract set version, and the day keeps relative answers ("what
+    expires this month") from outliving the date they were computed on. With
+    ``similarity`` > 0, a question that misses exactly is also served by a
+    cached question from the same scope whose content words overlap at least
+    that much (Jaccard) and whose ``key_terms`` are exactly the same. Only
+    the questions indexed under that scope are scanned, never other users'.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, max_bytes: int, similarity: float = 0.0):
+        self.similarity = similarity
+        self._cache = LRUCache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            max_bytes=max_bytes,
+            sizeof=lambda entry: len(entry.question) + len(entry.answer.encode("utf-8")),
+        )
+        self._lock = threading.Lock()
+        # scope -> {normalized question: (terms, key terms)} for the similarity scan
+        self._index: Dict[Tuple, Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]] = {}
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def scope(user_id: int, contract_set_version: int, today: Optional[date] = None) -> Tuple:
+        return (user_id, contract_set_version, (today or date.today()).isoformat())
+
+    def get(self, scope: Tuple, question: str) -> Optional[str]:
+        normalized = normalize_question(question)
+        entry = self._cache.get((scope, normalized))
+        if entry is not None:
+            self._count("exact_hits")
+            return entry.answer
+
+        if self.similarity > 0:
+            terms, keys = question_terms(normalized), key_terms(question)
+            best, best_score = None, 0.0
+            for candidate, (candidate_terms, candidate_keys) in self._scope_questions(scope):
+                if candidate_keys != keys:
+                    continue
+                score = jaccard(terms, candidate_terms)
+                if score >= self.similarity and score > best_score:
+                    best, best_score = candidate, score
+            if best is not None:
+                entry = self._cache.get((scope, best))
+                if entry is not None:
+                    self._count("similar_hits")
+                    return entry.answer
+
+        self._count("misses")
+        return None
+
+    def set(self, scope: Tuple, question: str, answer: str):
+        normalized = normalize_question(question)
+        entry = CachedAnswer(normalized, question_terms(normalized), key_terms(question), answer)
+        self._cache.set((scope, normalized), entry)
+        if self.similarity > 0:
+            with self._lock:
+                # A user's older scopes (earlier contract set versions or days) can never match again
+                for stale in [other for other in self._index if other[0] == scope[0] and other != scope]:
+                    del self._index[stale]
+                self._index.setdefault(scope, {})[normalized] = (entry.terms, entry.keys)
+
+    def clear(self):
+        self._cache.clear()
+        with self._lock:
+            self._index.clear()
+
+    def stats(self) -> dict:
+        cache_stats = self._cache.stats()
+        with self._lock:
+            lookups = self.exact_hits + self.similar_hits + self.misses
+            return {
+                "entries": cache_stats["entries"],
+                "bytes": cache_stats["bytes"],
+                "evictions": cache_stats["evictions"],
+                "exact_hits": self.exact_hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.exact_hits + self.similar_hits) / lookups, 4) if lookups else None,
+            }
+
+    def _scope_questions(self, scope: Tuple) -> list:
+        """Indexed questions of ``scope`` still in the cache; drops the evicted or expired ones."""
+        with self._lock:
+            questions = list(self._index.get(scope, {}).items())
+        live = []
+        for normalized, features in questions:
+            if self._cache.peek((scope, normalized)) is None:
+                with self._lock:
+                    self._index.get(scope, {}).pop(normalized, None)
+            else:
+                live.append((normalized, features))
+        return live
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+        CACHE_REQUESTS.inc(cache="chat", result=_LOOKUP_RESULTS[counter])
+
+
+_cache = None
+
+
+def get_chat_cache() -> Optional[ChatResponseCache]:
+    """Get or create the chat response cache, or None when disabled."""
+    global _cache
+    if not settings.CHAT_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ChatResponseCache(
+            max_entries=settings.CHAT_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.CHAT_CACHE_TTL_SECONDS,
+            max_bytes=settings.CHAT_CACHE_MAX_BYTES,
+            similarity=settings.CHAT_CACHE_SIMILARITY,
+        )
+    return _cache
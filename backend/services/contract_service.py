@@ -1,33 +1,317 @@
+import base64
+import logging
+from datetime import date, datetime, timedelta
+from pydantic import ValidationError
+from sqlalchemy import Select, and_, delete, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from typing import Any, List, Optional, Tuple
+from backend.config import settings
 from backend.models.contract import Contract
 from backend.schemas.contract import ContractCreate
+from backend.services.aggregate_service import record_contracts_added, record_contracts_removed
+from backend.services.retrieval_service import get_contract_index
+from backend.utils.dates import normalize_date
 
-def create_contract(db: Session, contract_data: dict, file_name: str, user_id: int) -> Contract:
-    """Create a new contract in the database."""
-    contract = Contract(
+logger = logging.getLogger(__name__)
+
+def _contract_values(contract_data: dict, file_name: str, user_id: int) -> dict:
+    return dict(
         user_id=user_id,
         file_name=file_name,
         contact_name=contract_data.get("contact_name"),
         contact_email=contract_data.get("contact_email"),
         contact_phone=contract_data.get("contact_phone"),
-        start_date=contract_data.get("start_date"),
-        end_date=contract_data.get("end_date"),
+        start_date=normalize_date(contract_data.get("start_date")),
+        end_date=normalize_date(contract_data.get("end_date")),
         contract_value=contract_data.get("contract_value"),
         payment_terms=contract_data.get("payment_terms"),
         termination_terms=contract_data.get("termination_terms"),
         summary=contract_data.get("summary")
     )
 
+def _build_contract(contract_data: dict, file_name: str, user_id: int) -> Contract:
+    return Contract(**_contract_values(contract_data, file_name, user_id))
+
+def _index_documents(user_id: int, documents: List[Tuple[int, Optional[str]]]):
+    """Index the staged text of newly saved contracts (``(contract_id, document_key)`` pairs).
+
+    The index is a separate store, so this runs after commit and a failure
+    only costs retrieval context, never the save itself.
+    """
+    index = get_contract_index()
+    if index is None:
+        return
+    for contract_id, document_key in documents:
+        if not document_key:
+            continue
+        try:
+            index.index_staged_document(user_id, contract_id, document_key)
+        except Exception as e:
+            logger.warning("Failed to index contract %s: %s", contract_id, e)
+
+def _unindex_contracts(user_id: int, contract_ids: List[int]):
+    index = get_contract_index()
+    if index is None:
+        return
+    try:
+        index.remove_contracts(user_id, contract_ids)
+    except Exception as e:
+        logger.warning("Failed to remove contracts from the index: %s", e)
+
+def create_contract(db: Session, contract_data: dict, file_name: str, user_id: int) -> Contract:
+    """Create a new contract in the database."""
+    contract = _build_contract(contract_data, file_name, user_id)
+
     db.add(contract)
+    db.flush()
+    record_contracts_added(db, user_id, [contract])
     db.commit()
     db.refresh(contract)
+    _index_documents(user_id, [(contract.id, contract_data.get("document_key"))])
     return contract
 
+def create_contracts(db: Session, items: List[Tuple[dict, str]], user_id: int) -> List[int]:
+    """Create several contracts in one transaction.
+
+    ``items`` are ``(contract_data, file_name)`` pairs. Returns the new ids in
+    the same order; nothing is saved if any row fails.
+    """
+    contracts = [_build_contract(data, file_name, user_id) for data, file_name in items]
+    db.add_all(contracts)
+    db.flush()
+    ids = [contract.id for contract in contracts]
+    record_contracts_added(db, user_id, contracts)
+    db.commit()
+    _index_documents(user_id, [(contract_id, data.get("document_key")) for contract_id, (data, _) in zip(ids, items)])
+    return ids
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+# Columns the aggregates need, returned by the bulk INSERT/DELETE statements
+_AGGREGATE_COLUMNS = (Contract.id, Contract.start_date, Contract.end_date, Contract.contact_name, Contract.contract_value)
+
+def _bulk_insert(db: Session, items: List[Tuple[dict, str]], user_id: int) -> List[int]:
+    """INSERT ... RETURNING in chunks and update the aggregates, without committing."""
+    rows = []
+    for chunk in _chunks(items, settings.BULK_CHUNK_SIZE):
+        rows.extend(db.execute(
+            insert(Contract).returning(*_AGGREGATE_COLUMNS, sort_by_parameter_order=True),
+            [_contract_values(data, file_name, user_id) for data, file_name in chunk],
+        ).all())
+    # One aggregate update for the whole batch: one statement per touched bucket
+    if rows:
+        record_contracts_added(db, user_id, rows)
+    return [row.id for row in rows]
+
+def _bulk_delete(db: Session, contract_ids: List[int], user_id: int) -> List[int]:
+    """Set-based DELETE ... RETURNING in chunks and update the aggregates, without committing."""
+    rows = []
+    for chunk in _chunks(list(dict.fromkeys(contract_ids)), settings.BULK_CHUNK_SIZE):
+        rows.extend(db.execute(
+            delete(Contract)
+            .where(Contract.user_id == user_id, Contract.id.in_(chunk))
+            .returning(*_AGGREGATE_COLUMNS),
+            execution_options={"synchronize_session": False},
+        ).all())
+    if rows:
+        record_contracts_removed(db, user_id, rows)
+    return [row.id for row in rows]
+
+def bulk_create_contracts(db: Session, items: List[Tuple[dict, str]], user_id: int) -> List[int]:
+    """Insert many contracts with chunked ``INSERT ... RETURNING`` in one transaction.
+
+    ``items`` are ``(contract_data, file_name)`` pairs, already validated.
+    Returns the new ids in the same order.
+    """
+    ids = _bulk_insert(db, items, user_id)
+    db.commit()
+    _index_documents(user_id, [(contract_id, data.get("document_key")) for contract_id, (data, _) in zip(ids, items)])
+    return ids
+
+def bulk_delete_contracts(db: Session, contract_ids: List[int], user_id: int) -> List[int]:
+    """Delete the user's contracts among ``contract_ids`` in one transaction.
+
+    Returns the ids actually deleted; ids that don't exist or belong to
+    another user are ignored.
+    """
+    deleted = _bulk_delete(db, contract_ids, user_id)
+    db.commit()
+    if deleted:
+        _unindex_contracts(user_id, deleted)
+    return deleted
+
+def validate_bulk_rows(rows: List[Any]) -> Tuple[List[Tuple[int, dict, str]], List[dict]]:
+    """Validate raw rows against ContractCreate one by one.
+
+    Returns ``(valid, errors)``: ``valid`` holds ``(index, contract_data,
+    file_name)`` for each good row, ``errors`` one ``{"index", "errors"}``
+    entry per bad row, so a single bad row doesn't reject the whole batch.
+    """
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            contract = ContractCreate.model_validate(row)
+        except ValidationError as e:
+            errors.append({
+                "index": index,
+                "errors": [
+                    {"field": ".".join(str(part) for part in error["loc"]) or None, "message": error["msg"]}
+                    for error in e.errors()
+                ],
+            })
+            continue
+        valid.append((index, contract.model_dump(exclude={"file_name"}), contract.file_name))
+    return valid, errors
+
 def get_user_contracts(db: Session, user_id: int) -> List[Contract]:
     """Get all contracts for a specific user."""
     return db.query(Contract).filter(Contract.user_id == user_id).all()
 
+CONTRACT_FIELDS = [
+    "id",
+    "file_name",
+    "contact_name",
+    "contact_email",
+    "contact_phone",
+    "start_date",
+    "end_date",
+    "contract_value",
+    "payment_terms",
+    "termination_terms",
+    "summary",
+    "created_at",
+]
+
+def encode_cursor(created_at: datetime, contract_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{contract_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a pagination cursor; raises ValueError if it is malformed."""
+    try:
+        created_at, contract_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(contract_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def _list_statement(
+    user_id: int,
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[List[str]],
+    start_date_from: Optional[date],
+    start_date_to: Optional[date],
+    end_date_from: Optional[date],
+    end_date_to: Optional[date],
+    min_value: Optional[float],
+    max_value: Optional[float],
+    contact: Optional[str],
+) -> Select:
+    """SELECT for one page of ``list_user_contracts`` (one extra row past ``limit``)."""
+    if fields:
+        unknown = [f for f in fields if f not in CONTRACT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        # The cursor needs created_at and id even when they are not requested
+        selected = list(dict.fromkeys(fields + ["id", "created_at"]))
+        query = select(*[getattr(Contract, f) for f in selected])
+    else:
+        query = select(Contract)
+
+    query = query.where(Contract.user_id == user_id)
+    if start_date_from:
+        query = query.where(Contract.start_date >= start_date_from)
+    if start_date_to:
+        query = query.where(Contract.start_date <= start_date_to)
+    if end_date_from:
+        query = query.where(Contract.end_date >= end_date_from)
+    if end_date_to:
+        query = query.where(Contract.end_date <= end_date_to)
+    if min_value is not None:
+        query = query.where(Contract.contract_value >= min_value)
+    if max_value is not None:
+        query = query.where(Contract.contract_value <= max_value)
+    if contact:
+        # Match the text literally: % and _ in it are not wildcards
+        escaped = contact.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"%{escaped}%"
+        query = query.where(or_(
+            Contract.contact_name.ilike(pattern, escape="\\"),
+            Contract.contact_email.ilike(pattern, escape="\\"),
+        ))
+
+    if cursor:
+        after_created_at, after_id = decode_cursor(cursor)
+        query = query.where(or_(
+            Contract.created_at > after_created_at,
+            and_(Contract.created_at == after_created_at, Contract.id > after_id),
+        ))
+
+    query = query.order_by(Contract.created_at, Contract.id)
+    if limit is not None:
+        # Fetch one extra row to know whether another page exists
+        query = query.limit(limit + 1)
+    return query
+
+def _page(result, limit: Optional[int], fields: Optional[List[str]]) -> Tuple[list, Optional[str]]:
+    rows = result.all() if fields else result.scalars().all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    if fields:
+        rows = [{f: getattr(row, f) for f in fields} for row in rows]
+    return rows, next_cursor
+
+def list_user_contracts(
+    db: Session,
+    user_id: int,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    start_date_from: Optional[date] = None,
+    start_date_to: Optional[date] = None,
+    end_date_from: Optional[date] = None,
+    end_date_to: Optional[date] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    contact: Optional[str] = None,
+) -> Tuple[list, Optional[str]]:
+    """Page through a user's contracts ordered by (created_at, id).
+
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    With ``fields`` only those columns are loaded and rows are dicts,
+    otherwise rows are Contract objects.
+    """
+    query = _list_statement(
+        user_id, limit, cursor, fields,
+        start_date_from, start_date_to, end_date_from, end_date_to, min_value, max_value, contact,
+    )
+    return _page(db.execute(query), limit, fields)
+
+def get_recent_contracts(db: Session, user_id: int, limit: int) -> List[Contract]:
+    """The user's most recently added contracts, newest first."""
+    return db.query(Contract).filter(Contract.user_id == user_id).order_by(
+        Contract.created_at.desc(), Contract.id.desc()
+    ).limit(limit).all()
+
+def get_upcoming_renewals(db: Session, user_id: int, days: int, today: Optional[date] = None) -> List[Contract]:
+    """Contracts ending within the next ``days`` days, soonest first.
+
+    Answered by the (user_id, end_date) index without loading other contracts.
+    """
+    today = today or date.today()
+    return db.query(Contract).filter(
+        Contract.user_id == user_id,
+        Contract.end_date >= today,
+        Contract.end_date <= today + timedelta(days=days)
+    ).order_by(Contract.end_date, Contract.id).all()
+
 def get_contract_by_id(db: Session, contract_id: int, user_id: int) -> Optional[Contract]:
     """Get a specific contract by ID, ensuring it belongs to the user."""
     return db.query(Contract).filter(
@@ -45,5 +329,93 @@ def delete_contract_by_id(db: Session, contract_id: int, user_id: int) -> bool:
         return False
 
     db.delete(contract)
+    db.flush()
+    record_contracts_removed(db, user_id, [contract])
     db.commit()
+    _unindex_contracts(user_id, [contract_id])
+    return True
+
+# Async versions for the async routes. Reads are native async queries; the
+# aggregate bookkeeping is shared with the sync path through run_sync, and the
+# retrieval index (a local SQLite file) is updated in the threadpool.
+
+async def create_contract_async(db: AsyncSession, contract_data: dict, file_name: str, user_id: int) -> Contract:
+    """Async ``create_contract``."""
+    contract = _build_contract(contract_data, file_name, user_id)
+
+    db.add(contract)
+    await db.flush()
+    await db.run_sync(record_contracts_added, user_id, [contract])
+    await db.commit()
+    await db.refresh(contract)
+    await run_in_threadpool(_index_documents, user_id, [(contract.id, contract_data.get("document_key"))])
+    return contract
+
+async def list_user_contracts_async(
+    db: AsyncSession,
+    user_id: int,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    start_date_from: Optional[date] = None,
+    start_date_to: Optional[date] = None,
+    end_date_from: Optional[date] = None,
+    end_date_to: Optional[date] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    contact: Optional[str] = None,
+) -> Tuple[list, Optional[str]]:
+    """Async ``list_user_contracts``."""
+    query = _list_statement(
+        user_id, limit, cursor, fields,
+        start_date_from, start_date_to, end_date_from, end_date_to, min_value, max_value, contact,
+    )
+    return _page(await db.execute(query), limit, fields)
+
+async def get_upcoming_renewals_async(db: AsyncSession, user_id: int, days: int, today: Optional[date] = None) -> List[Contract]:
+    """Async ``get_upcoming_renewals``."""
+    today = today or date.today()
+    result = await db.execute(select(Contract).where(
+        Contract.user_id == user_id,
+        Contract.end_date >= today,
+        Contract.end_date <= today + timedelta(days=days)
+    ).order_by(Contract.end_date, Contract.id))
+    return list(result.scalars().all())
+
+async def get_contract_by_id_async(db: AsyncSession, contract_id: int, user_id: int) -> Optional[Contract]:
+    """Async ``get_contract_by_id``."""
+    result = await db.execute(select(Contract).where(
+        Contract.id == contract_id,
+        Contract.user_id == user_id
+    ))
+    return result.scalars().first()
+
+async def delete_contract_by_id_async(db: AsyncSession, contract_id: int, user_id: int) -> bool:
+    """Async ``delete_contract_by_id``."""
+    contract = await get_contract_by_id_async(db, contract_id, user_id)
+    if not contract:
+        return False
+
+    await db.delete(contract)
+    await db.flush()
+    await db.run_sync(record_contracts_removed, user_id, [contract])
+    await db.commit()
+    await run_in_threadpool(_unindex_contracts, user_id, [contract_id])
     return True
+
+async def bulk_create_contracts_async(db: AsyncSession, items: List[Tuple[dict, str]], user_id: int) -> List[int]:
+    """Async ``bulk_create_contracts``."""
+    ids = await db.run_sync(_bulk_insert, items, user_id)
+    await db.commit()
+    await run_in_threadpool(
+        _index_documents, user_id, [(contract_id, data.get("document_key")) for contract_id, (data, _) in zip(ids, items)]
+    )
+    return ids
+
+async def bulk_delete_contracts_async(db: AsyncSession, contract_ids: List[int], user_id: int) -> List[int]:
+    """Async ``bulk_delete_contracts``."""
+    deleted = await db.run_sync(_bulk_delete, contract_ids, user_id)
+    await db.commit()
+    if deleted:
+        await run_in_threadpool(_unindex_contracts, user_id, deleted)
+    return deleted
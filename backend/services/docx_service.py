@@ -1,14 +1,19 @@
 import io
-import docx
+from typing import Iterator, Optional
 from fastapi import HTTPException
+from backend.utils.text import join_within_budget
 
-def extract_text_from_docx(file_content: bytes) -> str:
-    """Extract text content from a DOCX file."""
+def iter_docx_paragraphs(file_content: bytes) -> Iterator[str]:
+    """Yield each DOCX paragraph's text followed by a newline."""
+    import docx
+
+    doc = docx.Document(io.BytesIO(file_content))
+    for paragraph in doc.paragraphs:
+        yield paragraph.text + "\n"
+
+def extract_text_from_docx(file_content: bytes, max_chars: Optional[int] = None) -> str:
+    """Extract text content from a DOCX file, stopping after ``max_chars`` characters."""
     try:
-        doc = docx.Document(io.BytesIO(file_content))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        return join_within_budget(iter_docx_paragraphs(file_content), max_chars)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading DOCX: {str(e)}")
@@ -0,0 +1,196 @@
+import csv
+import io
+import tempfile
+from typing import Iterator
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models.contract import Contract
+
+# (header, column) pairs, in export order
+EXPORT_COLUMNS = [
+    ("ID", Contract.id),
+    ("File Name", Contract.file_name),
+    ("Contact Name", Contract.contact_name),
+    ("Contact Email", Contract.contact_email),
+    ("Contact Phone", Contract.contact_phone),
+    ("Start Date", Contract.start_date),
+    ("End Date", Contract.end_date),
+    ("Contract Value", Contract.contract_value),
+    ("Payment Terms", Contract.payment_terms),
+    ("Termination Terms", Contract.termination_terms),
+    ("Summary", Contract.summary),
+    ("Created At", Contract.created_at),
+]
+EXPORT_HEADERS = [header for header, _ in EXPORT_COLUMNS]
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+PARQUET_ROW_GROUP_SIZE = 65536
+XLSX_MAX_ROWS = 1048576 - 1  # Excel's sheet limit, minus the header row
+FILE_CHUNK_SIZE = 256 * 1024
+
+
+def iter_contract_rows(user_id: int, batch_size: int) -> Iterator[list]:
+    """Yield lists of up to ``batch_size`` row tuples for a user's contracts, in id order.
+
+    Rows are streamed from a server-side cursor (``yield_per``) on a session
+    owned by the generator, so memory does not grow with the export size and
+    the export can outlive the request's session.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            select(*[column for _, column in EXPORT_COLUMNS])
+            .where(Contract.user_id == user_id)
+            .order_by(Contract.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+    finally:
+        db.close()
+
+
+class _Buffer(io.RawIOBase):
+    """Write-only sink whose contents are drained after every write batch."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_csv(user_id: int) -> Iterator[bytes]:
+    """CSV export; the header is sent before the first row is read."""
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator="\n")
+    writer.writerow(EXPORT_HEADERS)
+    yield text.getvalue().encode("utf-8")
+
+    for rows in iter_contract_rows(user_id, settings.EXPORT_BATCH_SIZE):
+        text.seek(0)
+        text.truncate()
+        writer.writerows(rows)
+        yield text.getvalue().encode("utf-8")
+
+
+def stream_parquet(user_id: int) -> Iterator[bytes]:
+    """Parquet export, sent one row group at a time."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("ID", pa.int64()),
+        ("File Name", pa.string()),
+        ("Contact Name", pa.string()),
+        ("Contact Email", pa.string()),
+        ("Contact Phone", pa.string()),
+        ("Start Date", pa.date32()),
+        ("End Date", pa.date32()),
+        ("Contract Value", pa.float64()),
+        ("Payment Terms", pa.string()),
+        ("Termination Terms", pa.string()),
+        ("Summary", pa.string()),
+        ("Created At", pa.timestamp("us")),
+    ])
+    sink = _Buffer()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    pending = []
+
+    def flush():
+        columns = list(zip(*pending))
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema,
+        ))
+        pending.clear()
+        return sink.drain()
+
+    try:
+        for rows in iter_contract_rows(user_id, settings.EXPORT_BATCH_SIZE):
+            pending.extend(rows)
+            if len(pending) >= PARQUET_ROW_GROUP_SIZE:
+                yield flush()
+        if pending:
+            yield flush()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_xlsx(user_id: int) -> Iterator[bytes]:
+    """XLSX export.
+
+    The zip container can only be written once the sheet is complete, so
+    rows go to a write-only workbook spooled on disk and the finished file
+    is streamed afterwards; memory stays flat but the first byte is sent
+    at the end.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Contracts")
+    sheet.append(EXPORT_HEADERS)
+    for rows in iter_contract_rows(user_id, settings.EXPORT_BATCH_SIZE):
+        for row in rows:
+            sheet.append(row)
+
+    with tempfile.TemporaryFile() as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(FILE_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def prepare_export(db: Session, user_id: int, export_format: str) -> Iterator[bytes]:
+    """Validate an export before the response starts and return its generator.
+
+    Optional dependencies and format limits are checked here, because once
+    streaming has begun errors can no longer change the status code.
+    """
+    if export_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    elif export_format == "xlsx":
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="XLSX export requires openpyxl")
+        count = db.query(func.count(Contract.id)).filter(Contract.user_id == user_id).scalar()
+        if count > XLSX_MAX_ROWS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{count} contracts exceed the XLSX limit of {XLSX_MAX_ROWS} rows; use CSV or Parquet",
+            )
+    return EXPORTERS[export_format](user_id)
+
+
+EXPORTERS = {
+    "csv": stream_csv,
+    "parquet": stream_parquet,
+    "xlsx": stream_xlsx,
+}
@@ -0,0 +1,184 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models.extraction_cache import ExtractionCacheEntry
+from backend.services.ai_service import extraction_version
+from backend.utils.cache import LRUCache
+
+
+@dataclass
+class CachedExtraction:
+    text: str
+    details: dict
+
+
+def document_hash(file_content: bytes) -> str:
+    """SHA-256 of the uploaded bytes."""
+    return hashlib.sha256(file_content).hexdigest()
+
+
+def cache_key(file_content: bytes) -> str:
+    """Cache key for a document: content hash plus the prompt/model version."""
+    return f"{document_hash(file_content)}:{extraction_version()}"
+
+
+def _entry_size(text: str, details: dict) -> int:
+    return len(text.encode("utf-8")) + len(json.dumps(details).encode("utf-8"))
+
+
+class MemoryExtractionCache:
+    """Per-process LRU cache; lost on restart."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int, ttl_seconds: int, max_bytes: int):
+        self._cache = LRUCache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            max_bytes=max_bytes,
+            sizeof=lambda entry: _entry_size(entry.text, entry.details),
+        )
+
+    def get(self, key: str) -> Optional[CachedExtraction]:
+        return self._cache.get(key)
+
+    def set(self, key: str, text: str, details: dict):
+        self._cache.set(key, CachedExtraction(text=text, details=details))
+
+    def delete(self, key: str):
+        self._cache.delete(key)
+
+    def clear(self):
+        self._cache.clear()
+
+
+class SQLExtractionCache:
+    """Persistent cache stored in the ``extraction_cache`` table.
+
+    Entries are evicted by ``last_accessed_at`` once the table exceeds the
+    entry or byte limit, and expire ``ttl_seconds`` after they were written.
+    Concurrent writes of the same key (two requests extracting the same
+    document at once) are safe: the last one wins.
+    """
+
+    blocking = True
+
+    def __init__(self, max_entries: int, ttl_seconds: int, max_bytes: int, session_factory=SessionLocal):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._session_factory = session_factory
+
+    def get(self, key: str) -> Optional[CachedExtraction]:
+        db = self._session_factory()
+        try:
+            entry = db.get(ExtractionCacheEntry, key)
+            if entry is None:
+                return None
+            now = datetime.utcnow()
+            if entry.created_at < now - timedelta(seconds=self.ttl_seconds):
+                db.delete(entry)
+                db.commit()
+                return None
+            entry.last_accessed_at = now
+            db.commit()
+            return CachedExtraction(text=entry.text, details=json.loads(entry.details))
+        finally:
+            db.close()
+
+    def set(self, key: str, text: str, details: dict):
+        size = _entry_size(text, details)
+        if size > self.max_bytes:
+            return
+        db = self._session_factory()
+        try:
+            now = datetime.utcnow()
+            values = dict(text=text, details=json.dumps(details), size=size, created_at=now, last_accessed_at=now)
+            entry = db.query(ExtractionCacheEntry).filter(ExtractionCacheEntry.key == key)
+            if not entry.update(values, synchronize_session=False):
+                db.add(ExtractionCacheEntry(key=key, **values))
+                try:
+                    db.flush()
+                except IntegrityError:
+                    # Another request cached the same document in the meantime
+                    db.rollback()
+                    entry.update(values, synchronize_session=False)
+            self._evict(db, now)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def delete(self, key: str):
+        db = self._session_factory()
+        try:
+            db.query(ExtractionCacheEntry).filter(ExtractionCacheEntry.key == key).delete()
+            db.commit()
+        finally:
+            db.close()
+
+    def clear(self):
+        db = self._session_factory()
+        try:
+            db.query(ExtractionCacheEntry).delete()
+            db.commit()
+        finally:
+            db.close()
+
+    def _evict(self, db, now: datetime):
+        count, total_bytes = db.query(func.count(), func.coalesce(func.sum(ExtractionCacheEntry.size), 0)).one()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        cutoff = now - timedelta(seconds=self.ttl_seconds)
+        db.query(ExtractionCacheEntry).filter(ExtractionCacheEntry.created_at < cutoff).delete()
+
+        rows = (
+            db.query(ExtractionCacheEntry.key, ExtractionCacheEntry.size)
+            .order_by(ExtractionCacheEntry.last_accessed_at.desc())
+            .all()
+        )
+        total_bytes = 0
+        stale = []
+        for index, (key, size) in enumerate(rows):
+            total_bytes += size or 0
+            if index >= self.max_entries or total_bytes > self.max_bytes:
+                stale.append(key)
+        if stale:
+            db.query(ExtractionCacheEntry).filter(
+                ExtractionCacheEntry.key.in_(stale)
+            ).delete(synchronize_session=False)
+
+
+_cache = None
+
+
+def get_extraction_cache():
+    """Get or create the configured extraction cache, or None when disabled."""
+    global _cache
+    if _cache is None:
+        backend = settings.EXTRACTION_CACHE_BACKEND.lower()
+        options = dict(
+            max_entries=settings.EXTRACTION_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.EXTRACTION_CACHE_TTL_SECONDS,
+            max_bytes=settings.EXTRACTION_CACHE_MAX_BYTES,
+        )
+        if backend == "memory":
+            _cache = MemoryExtractionCache(**options)
+        elif backend == "sql":
+            _cache = SQLExtractionCache(**options)
+        elif backend in ("none", "off", ""):
+            return None
+        else:
+            raise ValueError(f"Unknown EXTRACTION_CACHE_BACKEND: {settings.EXTRACTION_CACHE_BACKEND}")
+    return _cache
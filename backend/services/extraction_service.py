@@ -0,0 +1,175 @@
+import logging
+from typing import AsyncIterator, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.config import settings
+from backend.services.file_service import extract_text_from_file_async
+from backend.services.ai_service import (
+    request_contract_details,
+    stream_contract_details,
+    extract_long_contract_details,
+    missing_api_key_details,
+    extraction_error_details,
+    offline_extraction,
+)
+from backend.services.extraction_cache import get_extraction_cache, cache_key, document_hash
+from backend.services.retrieval_service import get_contract_index
+from backend.services.rule_extraction import offline_details
+from backend.utils.metrics import cache_lookup, stage
+from backend.utils.text import extraction_char_budget, parse_char_budget
+
+logger = logging.getLogger(__name__)
+
+
+async def _call(cache, method: str, *args):
+    fn = getattr(cache, method)
+    if cache.blocking:
+        return await run_in_threadpool(fn, *args)
+    return fn(*args)
+
+
+async def _stage_text(file_content: bytes, text: str):
+    """Keep the document text for the retrieval index under its document key."""
+    index = get_contract_index()
+    if index is None or not text:
+        return
+    try:
+        await run_in_threadpool(index.stage_document, document_hash(file_content), text)
+    except Exception as e:
+        logger.warning("Failed to stage document text for retrieval: %s", e)
+
+
+async def _cached_details(cache, key: str, file_content: bytes, filename: str) -> Optional[dict]:
+    if cache is None:
+        return None
+    cached = await _call(cache, "get", key)
+    cache_lookup("extraction", cached is not None)
+    if cached is None:
+        return None
+    logger.info("Extraction cache hit for %s", filename)
+    await _stage_text(file_content, cached.text)
+    return dict(cached.details)
+
+
+async def _document_text(file_content: bytes, filename: str) -> str:
+    # Only parse as much of the document as the extraction prompt(s) and index will use
+    with stage("parse"):
+        return await extract_text_from_file_async(file_content, filename, parse_char_budget())
+
+
+def _is_long_document(text: str) -> bool:
+    budget = extraction_char_budget()
+    return settings.LONG_DOCUMENT_MODE and budget is not None and len(text) > budget
+
+
+async def _remember(cache, key: str, file_content: bytes, text: str, details: dict, complete: bool = True):
+    """Cache a successful extraction and stage its text; ``complete`` is False for partial results."""
+    if not complete:
+        # Some chunks failed: a later upload should try them again rather than get this result
+        logger.warning("Not caching an extraction merged from only some chunks")
+    elif cache is not None:
+        # The extraction has succeeded (and been paid for); a cache failure must not fail it
+        try:
+            await _call(cache, "set", key, text, details)
+        except Exception as e:
+            logger.warning("Failed to cache extraction result: %s", e)
+    await _stage_text(file_content, text)
+
+
+async def extract_document(file_content: bytes, filename: str, strict: bool = False) -> dict:
+    """Extract contract details from an uploaded document.
+
+    Results are cached by content hash and prompt/model version, so a repeat
+    upload of the same bytes skips both parsing and the OpenAI call.
+    Placeholder, error and partial (some chunks failed) results are never
+    cached; with ``strict`` the first two are raised as exceptions instead
+    of being returned. In offline mode the
+    result comes from the rule-based extractor and is not cached either. The
+    text of successful extractions is staged for the retrieval index under
+    ``document_hash(file_content)``.
+    """
+    cache = get_extraction_cache()
+    key = cache_key(file_content)
+
+    cached = await _cached_details(cache, key, file_content, filename)
+    if cached is not None:
+        return cached
+
+    text = await _document_text(file_content, filename)
+
+    if offline_extraction():
+        await _stage_text(file_content, text)
+        return offline_details(text)
+
+    if not settings.OPENAI_API_KEY:
+        logger.warning("OpenAI API key not configured")
+        if strict:
+            raise ValueError("OpenAI API key not configured")
+        return missing_api_key_details()
+
+    complete = True
+    try:
+        with stage("llm_extract"):
+            if _is_long_document(text):
+                details, complete = await extract_long_contract_details(text)
+            else:
+                details = await request_contract_details(text)
+    except Exception as e:
+        logger.warning("Error extracting contract details from %s: %s", filename, e)
+        if strict:
+            raise
+        return extraction_error_details(e)
+
+    await _remember(cache, key, file_content, text, details, complete)
+    return details
+
+
+async def stream_extract_document(file_content: bytes, filename: str) -> AsyncIterator[dict]:
+    """Like ``extract_document``, but yield each field as soon as the model has produced it.
+
+    Yields ``{"field": name, "value": value}`` events and then one
+    ``{"details": {...}}`` event with the complete result. Cache hits,
+    offline, placeholder and error results, and documents extracted in long-document
+    mode (whose fields are only known once all chunks are merged) produce
+    only the ``details`` event. Parsing errors are raised.
+    """
+    cache = get_extraction_cache()
+    key = cache_key(file_content)
+
+    cached = await _cached_details(cache, key, file_content, filename)
+    if cached is not None:
+        yield {"details": cached}
+        return
+
+    text = await _document_text(file_content, filename)
+
+    if offline_extraction():
+        await _stage_text(file_content, text)
+        yield {"details": offline_details(text)}
+        return
+
+    if not settings.OPENAI_API_KEY:
+        logger.warning("OpenAI API key not configured")
+        yield {"details": missing_api_key_details()}
+        return
+
+    details = None
+    complete = True
+    try:
+        with stage("llm_extract"):
+            if _is_long_document(text):
+                details, complete = await extract_long_contract_details(text)
+            else:
+                async for event in stream_contract_details(text):
+                    if "details" in event:
+                        details = event["details"]
+                    else:
+                        yield event
+    except Exception as e:
+        logger.warning("Error extracting contract details from %s: %s", filename, e)
+        yield {"details": extraction_error_details(e)}
+        return
+
+    await _remember(cache, key, file_content, text, details, complete)
+    yield {"details": details}
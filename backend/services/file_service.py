@@ -1,17 +1,150 @@
+import asyncio
+import multiprocessing
+from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from backend.config import settings
 from backend.services.pdf_service import extract_text_from_pdf
 from backend.services.docx_service import extract_text_from_docx
 
-def extract_text_from_file(file_content: bytes, filename: str) -> str:
-    """Extract text from a file based on its extension."""
+def extract_text_from_file(file_content: bytes, filename: str, max_chars: Optional[int] = None) -> str:
+    """Extract text from a file based on its extension.
+
+    When ``max_chars`` is given, parsing stops once that much text is available.
+    """
     file_extension = filename.lower().split('.')[-1]
-    
+
     if file_extension == 'pdf':
-        return extract_text_from_pdf(file_content)
+        return extract_text_from_pdf(file_content, max_chars)
     elif file_extension in ['docx', 'doc']:
-        return extract_text_from_docx(file_content)
+        return extract_text_from_docx(file_content, max_chars)
     else:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported file type: {file_extension}. Please upload PDF or DOCX files."
         )
+
+
+class DocumentExtractionError(Exception):
+    """Picklable stand-in for an HTTPException raised inside a worker process."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _extract_in_worker(file_content: bytes, filename: str, max_chars: Optional[int]) -> str:
+    try:
+        return extract_text_from_file(file_content, filename, max_chars)
+    except HTTPException as e:
+        raise DocumentExtractionError(e.status_code, str(e.detail))
+
+
+class ExtractionEngine:
+    """Parses documents in a pool of worker processes.
+
+    PDF/DOCX parsing is CPU-bound, so it runs outside the API process: the
+    event loop stays responsive and parsing scales across cores. At most
+    ``workers + max_queue`` documents are admitted at once; further requests
+    are rejected with 503. A document that exceeds ``timeout`` or crashes its
+    worker only fails itself - the pool is torn down and recreated.
+    """
+
+    def __init__(self, workers: int, max_queue: int, timeout: float):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool = None
+        self._generation = 0
+        self._pending = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def _restart_pool(self, generation: int):
+        """Kill the pool that failed, unless it has already been replaced."""
+        if self._pool is None or generation != self._generation:
+            return
+        pool, self._pool = self._pool, None
+        self._generation += 1
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def extract_text(self, file_content: bytes, filename: str, max_chars: Optional[int] = None) -> str:
+        if self._pending >= self.workers + self.max_queue:
+            raise HTTPException(status_code=503, detail="Document extraction queue is full, please retry shortly")
+
+        if self.workers <= 0:
+            self._pending += 1
+            try:
+                return await run_in_threadpool(extract_text_from_file, file_content, filename, max_chars)
+            finally:
+                self._pending -= 1
+
+        self._pending += 1
+        try:
+            # A broken pool may have been caused by another document, so
+            # retry once on a fresh pool before blaming this one.
+            for attempt in range(2):
+                pool = self._get_pool()
+                generation = self._generation
+                future = asyncio.get_running_loop().run_in_executor(
+                    pool, _extract_in_worker, file_content, filename, max_chars
+                )
+                try:
+                    return await asyncio.wait_for(future, timeout=self.timeout)
+                except DocumentExtractionError as e:
+                    raise HTTPException(status_code=e.status_code, detail=e.detail)
+                except asyncio.TimeoutError:
+                    self._restart_pool(generation)
+                    raise HTTPException(
+                        status_code=422,
+                        detail=f"Timed out extracting text from {filename} after {self.timeout:g}s"
+                    )
+                except BrokenProcessPool:
+                    self._restart_pool(generation)
+                    if attempt:
+                        raise HTTPException(
+                            status_code=422,
+                            detail=f"The document parser crashed while reading {filename}"
+                        )
+        finally:
+            self._pending -= 1
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_engine = None
+
+def get_extraction_engine() -> ExtractionEngine:
+    """Get or create the shared extraction engine."""
+    global _engine
+    if _engine is None:
+        _engine = ExtractionEngine(
+            workers=settings.EXTRACTION_WORKERS,
+            max_queue=settings.EXTRACTION_MAX_QUEUE,
+            timeout=settings.EXTRACTION_TIMEOUT_SECONDS,
+        )
+    return _engine
+
+def shutdown_extraction_engine():
+    global _engine
+    if _engine is not None:
+        _engine.shutdown()
+        _engine = None
+
+async def extract_text_from_file_async(file_content: bytes, filename: str, max_chars: Optional[int] = None) -> str:
+    """Extract text from a file without blocking the event loop."""
+    return await get_extraction_engine().extract_text(file_content, filename, max_chars)
@@ -0,0 +1,336 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models.extraction_job import ExtractionJob
+from backend.services.ai_service import coerce_details
+from backend.services.extraction_cache import document_hash
+from backend.services.extraction_service import extract_document
+from backend.utils.log import request_id_var
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "dead")
+# Stale job sweeps run at most this many poll intervals apart
+_SWEEP_EVERY_POLLS = 30
+
+
+def enqueue_extraction(db: Session, file_content: bytes, file_name: str, user_id: int) -> ExtractionJob:
+    """Add an extraction job owned by ``user_id`` to the queue."""
+    queued = db.query(ExtractionJob).filter(ExtractionJob.status.in_(("queued", "running"))).count()
+    if queued >= settings.JOB_MAX_QUEUED:
+        raise HTTPException(status_code=503, detail="Extraction queue is full, please retry shortly")
+
+    job = ExtractionJob(
+        id=uuid.uuid4().hex,
+        user_id=user_id,
+        status="queued",
+        file_name=file_name,
+        content=file_content,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def get_job(db: Session, job_id: str) -> Optional[ExtractionJob]:
+    return db.query(ExtractionJob).filter(ExtractionJob.id == job_id).first()
+
+
+def get_user_job(db: Session, job_id: str, user_id: int) -> Optional[ExtractionJob]:
+    """A job, only if it belongs to ``user_id``."""
+    return db.query(ExtractionJob).filter(ExtractionJob.id == job_id, ExtractionJob.user_id == user_id).first()
+
+
+def load_job(job_id: str, user_id: int) -> Optional[dict]:
+    """``job_to_dict`` of a user's job, read on a short-lived session of its own (blocking)."""
+    db = SessionLocal()
+    try:
+        job = get_user_job(db, job_id, user_id)
+        return job_to_dict(job) if job else None
+    finally:
+        db.close()
+
+
+def retry_dead_job(db: Session, job_id: str, user_id: int) -> Optional[ExtractionJob]:
+    """Move a user's dead-lettered job back onto the queue with a fresh attempt budget."""
+    job = get_user_job(db, job_id, user_id)
+    if job is None or job.status != "dead":
+        return job
+    job.status = "queued"
+    job.attempts = 0
+    job.error = None
+    job.run_after = datetime.utcnow()
+    job.finished_at = None
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def requeue_dead_job(job_id: str, user_id: int) -> Optional[dict]:
+    """``retry_dead_job`` on a short-lived session of its own (blocking); returns ``job_to_dict``."""
+    db = SessionLocal()
+    try:
+        job = retry_dead_job(db, job_id, user_id)
+        return job_to_dict(job) if job else None
+    finally:
+        db.close()
+
+
+def job_to_dict(job: ExtractionJob) -> dict:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "file_name": job.file_name,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "error": job.error,
+        "result": {"file_name": job.file_name, **json.loads(job.result)} if job.result else None,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def claim_next_job(db: Session) -> Optional[str]:
+    """Atomically mark the oldest runnable job as running and return its id.
+
+    The conditional UPDATE makes claiming safe when several worker
+    processes poll the same table.
+    """
+    now = datetime.utcnow()
+    candidates = (
+        db.query(ExtractionJob.id)
+        .filter(ExtractionJob.status == "queued", ExtractionJob.run_after <= now)
+        .order_by(ExtractionJob.run_after, ExtractionJob.created_at)
+        .limit(5)
+        .all()
+    )
+    for (job_id,) in candidates:
+        claimed = db.execute(
+            update(ExtractionJob)
+            .where(ExtractionJob.id == job_id, ExtractionJob.status == "queued")
+            .values(status="running", locked_at=now, attempts=ExtractionJob.attempts + 1, updated_at=now)
+        ).rowcount
+        db.commit()
+        if claimed:
+            return job_id
+    return None
+
+
+def requeue_stale_jobs(db: Session, active_job_ids: Iterable[str] = ()) -> int:
+    """Requeue running jobs whose worker died (e.g. the process restarted).
+
+    ``active_job_ids`` are the jobs the caller is still running; their lock
+    is refreshed first so a long extraction is not mistaken for a dead one.
+    """
+    now = datetime.utcnow()
+    active_job_ids = list(active_job_ids)
+    if active_job_ids:
+        db.execute(
+            update(ExtractionJob)
+            .where(ExtractionJob.id.in_(active_job_ids), ExtractionJob.status == "running")
+            .values(locked_at=now)
+        )
+    cutoff = now - timedelta(seconds=settings.JOB_STALE_AFTER_SECONDS)
+    count = db.execute(
+        update(ExtractionJob)
+        .where(ExtractionJob.status == "running", ExtractionJob.locked_at < cutoff)
+        .values(status="queued", locked_at=None, run_after=now)
+    ).rowcount
+    db.commit()
+    return count
+
+
+def _load_job_input(job_id: str):
+    db = SessionLocal()
+    try:
+        job = get_job(db, job_id)
+        return job.content, job.file_name
+    finally:
+        db.close()
+
+
+def _finish_job(job_id: str, result: Optional[dict], error: Optional[str], retryable: bool = True) -> str:
+    """Record the outcome of an attempt; failed attempts are retried or dead-lettered."""
+    db = SessionLocal()
+    try:
+        job = get_job(db, job_id)
+        now = datetime.utcnow()
+        job.locked_at = None
+        if error is None:
+            job.status = "succeeded"
+            job.result = json.dumps(result)
+            job.error = None
+            job.content = None
+            job.finished_at = now
+        elif not retryable or job.attempts >= job.max_attempts:
+            job.status = "dead"
+            job.error = error
+            job.finished_at = now
+        else:
+            job.status = "queued"
+            job.error = error
+            backoff = settings.JOB_RETRY_BACKOFF_SECONDS * (2 ** (job.attempts - 1))
+            job.run_after = now + timedelta(seconds=backoff)
+        db.commit()
+        return job.status
+    finally:
+        db.close()
+
+
+class JobWorkerPool:
+    """In-process workers draining the extraction_jobs table.
+
+    ``concurrency`` bounds how many extractions run at once in this process.
+    Workers poll the table, and are woken immediately when a job is
+    enqueued locally. Callers can wait for a job with ``wait_for``. Every
+    ``sweep_interval`` seconds one worker requeues jobs left running by
+    a worker that died, so they do not wait for the next restart.
+    """
+
+    def __init__(self, concurrency: int, poll_interval: float):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        # Well inside JOB_STALE_AFTER_SECONDS, so this process's own locks stay fresh
+        self.sweep_interval = min(poll_interval * _SWEEP_EVERY_POLLS, settings.JOB_STALE_AFTER_SECONDS / 4)
+        self._next_sweep = 0.0
+        self._active = set()
+        self._tasks = []
+        self._wakeup = asyncio.Event()
+        # job id -> [event set when the job finishes, number of waiters]
+        self._waiters: Dict[str, list] = {}
+
+    async def start(self):
+        if self._tasks or self.concurrency <= 0:
+            return
+        await self._sweep()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers because a job was enqueued."""
+        self._wakeup.set()
+
+    async def wait_for(self, job_id: str, timeout: float):
+        """Wait up to ``timeout`` seconds for a job to reach a terminal state."""
+        waiter = self._waiters.setdefault(job_id, [asyncio.Event(), 0])
+        waiter[1] += 1
+        try:
+            await asyncio.wait_for(waiter[0].wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiter[1] -= 1
+            # The last waiter to give up removes the event; a finished job has already removed it
+            if not waiter[1] and self._waiters.get(job_id) is waiter:
+                del self._waiters[job_id]
+
+    def _requeue_stale(self, active_job_ids: list) -> int:
+        db = SessionLocal()
+        try:
+            return requeue_stale_jobs(db, active_job_ids)
+        finally:
+            db.close()
+
+    async def _sweep(self):
+        self._next_sweep = time.monotonic() + self.sweep_interval
+        try:
+            requeued = await run_in_threadpool(self._requeue_stale, list(self._active))
+        except Exception as e:
+            logger.warning("Job worker failed to requeue stale jobs: %s", e)
+            return
+        if requeued:
+            logger.info("Requeued %d stale extraction job(s)", requeued)
+
+    def _claim(self) -> Optional[str]:
+        db = SessionLocal()
+        try:
+            return claim_next_job(db)
+        finally:
+            db.close()
+
+    async def _run(self):
+        while True:
+            if time.monotonic() >= self._next_sweep:
+                await self._sweep()
+            # Clear before claiming so an enqueue that races the claim still wakes us
+            self._wakeup.clear()
+            try:
+                job_id = await run_in_threadpool(self._claim)
+            except Exception as e:
+                logger.warning("Job worker failed to claim a job: %s", e)
+                job_id = None
+
+            if job_id is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._process(job_id)
+
+    async def _process(self, job_id: str):
+        # Correlate the job's log lines the way request ids do for requests
+        token = request_id_var.set(f"job-{job_id}")
+        self._active.add(job_id)
+        try:
+            await self._process_job(job_id)
+        finally:
+            self._active.discard(job_id)
+            request_id_var.reset(token)
+
+    async def _process_job(self, job_id: str):
+        result, error, retryable = None, None, True
+        try:
+            content, file_name = await run_in_threadpool(_load_job_input, job_id)
+            details = await extract_document(content, file_name, strict=True)
+            result = {**coerce_details(details), "document_key": document_hash(content)}
+        except asyncio.CancelledError:
+            raise
+        except HTTPException as e:
+            # Client errors (bad or unsupported documents) will not succeed on retry
+            error = str(e.detail)
+            retryable = e.status_code >= 500
+        except Exception as e:
+            error = str(e)
+
+        if error is not None:
+            logger.warning("Extraction job failed: %s", error)
+        status = await run_in_threadpool(_finish_job, job_id, result, error, retryable)
+        if status in TERMINAL_STATUSES:
+            waiter = self._waiters.pop(job_id, None)
+            if waiter is not None:
+                waiter[0].set()
+
+
+_workers = None
+
+
+def get_job_workers() -> JobWorkerPool:
+    """Get or create this process's job worker pool."""
+    global _workers
+    if _workers is None:
+        _workers = JobWorkerPool(
+            concurrency=settings.JOB_WORKERS,
+            poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+        )
+    return _workers
@@ -0,0 +1,129 @@
+"""
+Model tiers for extraction and the routing between them.
+
+Each document gets a cheap complexity score in [0, 1] from its length, the
+density of legal clause language and whether it reads as English. The score
+picks the cheapest tier whose threshold it is under (fast, then standard,
+then large). An answer that does not parse or fails ``validation_problem``
+is retried one tier up, so the large model only sees the documents the
+smaller ones got wrong.
+"""
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from backend.config import settings
+from backend.services.rule_extraction import EMAIL
+from backend.utils.metrics import EXTRACTION_COMPLEXITY, EXTRACTION_ROUTED
+
+TIERS = ["fast", "standard", "large"]
+
+# Length at which the length component of the score saturates
+_LONG_DOCUMENT_CHARS = 60_000
+# Clause markers per 1000 words at which the density component saturates
+_DENSE_CLAUSES_PER_1000_WORDS = 30
+# English function words below which a text is taken to be in another language
+_MIN_ENGLISH_RATIO = 0.12
+# Scoring only looks at the start of the document
+_SAMPLE_CHARS = 12_000
+
+CLAUSE_MARKERS = re.compile(
+    r"\b(?:shall|hereby|herein|hereof|hereunder|thereof|whereas|notwithstanding|pursuant\s+to|provided\s+that"
+    r"|subject\s+to|indemnif\w*|liabilit\w*|warrant\w*|(?:section|clause|article)\s+\d+)\b"
+)
+WORD = re.compile(r"[^\W\d_]+")
+ENGLISH_WORDS = frozenset(["the", "and", "of", "to", "in", "a", "or", "be", "by", "for", "with", "this", "that", "any", "is"])
+
+
+@dataclass
+class DocumentProfile:
+    chars: int
+    clause_density: float
+    english_ratio: float
+    score: float
+
+
+def profile_document(text: str) -> DocumentProfile:
+    """Score how hard ``text`` is to extract from; O(sample size), no model calls."""
+    sample = text[:_SAMPLE_CHARS].lower()
+    words = WORD.findall(sample)
+    clauses = len(CLAUSE_MARKERS.findall(sample))
+    density = clauses * 1000 / len(words) if words else 0.0
+    english = sum(word in ENGLISH_WORDS for word in words) / len(words) if words else 0.0
+
+    score = (
+        0.5 * min(len(text) / _LONG_DOCUMENT_CHARS, 1.0)
+        + 0.25 * min(density / _DENSE_CLAUSES_PER_1000_WORDS, 1.0)
+        # Other languages (and garbled text) are left to the larger models
+        + (0.35 if english < _MIN_ENGLISH_RATIO else 0.0)
+    )
+    return DocumentProfile(len(text), round(density, 1), round(english, 3), round(min(score, 1.0), 3))
+
+
+def tier_model(tier: str) -> str:
+    return {
+        "fast": settings.EXTRACTION_MODEL_FAST,
+        "standard": settings.EXTRACTION_MODEL_STANDARD,
+        "large": settings.EXTRACTION_MODEL_LARGE,
+    }[tier]
+
+
+def route(text: str) -> str:
+    """The tier to extract ``text`` with; always "large" when routing is disabled."""
+    if not settings.MODEL_ROUTING_ENABLED:
+        return "large"
+    profile = profile_document(text)
+    if profile.score <= settings.ROUTING_FAST_MAX_SCORE:
+        tier = "fast"
+    elif profile.score <= settings.ROUTING_STANDARD_MAX_SCORE:
+        tier = "standard"
+    else:
+        tier = "large"
+    EXTRACTION_COMPLEXITY.observe(profile.score)
+    EXTRACTION_ROUTED.inc(tier=tier)
+    return tier
+
+
+def escalation_tier(tier: str) -> Optional[str]:
+    """The next larger tier, or None for the largest (or when routing is disabled)."""
+    if not settings.MODEL_ROUTING_ENABLED or tier == TIERS[-1]:
+        return None
+    return TIERS[TIERS.index(tier) + 1]
+
+
+def _iso_date(value) -> bool:
+    try:
+        date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def validation_problem(details: dict, partial: bool = False) -> Optional[str]:
+    """Why an extraction answer should not be trusted, or None if it looks sound.
+
+    Checks field formats and consistency, not correctness. ``partial`` is
+    set for one chunk of a longer document, where most fields may be null.
+    """
+    for field in ("start_date", "end_date"):
+        if details.get(field) is not None and not _iso_date(details[field]):
+            return "bad_date"
+    if details.get("start_date") and details.get("end_date"):
+        if date.fromisoformat(details["end_date"]) < date.fromisoformat(details["start_date"]):
+            return "date_order"
+    value = details.get("contract_value")
+    if value is not None:
+        try:
+            if float(str(value).replace(",", "").replace("$", "")) < 0:
+                return "bad_value"
+        except ValueError:
+            return "bad_value"
+    email = details.get("contact_email")
+    if email is not None and not (isinstance(email, str) and EMAIL.fullmatch(email.strip())):
+        return "bad_email"
+    if not isinstance(details.get("summary"), str) or not details["summary"].strip():
+        return "no_summary"
+    if not partial and all(details.get(field) in (None, "") for field in details if field != "summary"):
+        return "empty"
+    return None
@@ -1,14 +1,19 @@
 import io
-import PyPDF2
+from typing import Iterator, Optional
 from fastapi import HTTPException
+from backend.utils.text import join_within_budget
 
-def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text content from a PDF file."""
+def iter_pdf_pages(file_content: bytes) -> Iterator[str]:
+    """Yield the text of each PDF page, parsing pages only as they are consumed."""
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+    for page in pdf_reader.pages:
+        yield page.extract_text() or ""
+
+def extract_text_from_pdf(file_content: bytes, max_chars: Optional[int] = None) -> str:
+    """Extract text content from a PDF file, stopping after ``max_chars`` characters."""
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
+        return join_within_budget(iter_pdf_pages(file_content), max_chars)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading PDF: {str(e)}")
@@ -0,0 +1,171 @@
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from backend.config import settings
+from backend.utils.text import split_into_chunks
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from", "has", "have",
+    "how", "i", "in", "is", "it", "its", "me", "my", "of", "on", "or", "our", "show", "tell", "that",
+    "the", "their", "there", "this", "to", "was", "we", "what", "when", "where", "which", "who", "why",
+    "will", "with", "you", "your", "all", "any", "about", "contract", "contracts",
+}
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(question: str) -> Optional[str]:
+    """Turn a free-form question into an FTS5 OR-query of its content words."""
+    terms = []
+    for word in _WORD.findall(question.lower()):
+        if word in STOPWORDS or len(word) < 2 or word in terms:
+            continue
+        terms.append(word)
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}"' for term in terms[:32])
+
+
+class ContractIndex:
+    """Per-user full-text index over contract document text (SQLite FTS5, BM25).
+
+    Lives in its own local SQLite file, independent of DATABASE_URL. Extracted
+    text is first staged by document hash; when the contract is saved the
+    staged text is split into overlapping chunks and indexed under the owning
+    user. Each chunk also carries an ``owner`` token, so a search only touches
+    that user's postings.
+    """
+
+    def __init__(self, path: str, chunk_chars: int = 1200, chunk_overlap: int = 200):
+        self.path = path
+        self.chunk_chars = chunk_chars
+        self.chunk_overlap = chunk_overlap
+        self._local = threading.local()
+        self._create_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS staged_documents ("
+                "doc_key TEXT PRIMARY KEY, text TEXT NOT NULL, staged_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5("
+                "content, owner, contract_id UNINDEXED, chunk_no UNINDEXED, "
+                "tokenize='porter unicode61')"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS chunk_owners ("
+                "chunk_rowid INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, contract_id INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_chunk_owners_contract ON chunk_owners (user_id, contract_id)")
+
+    @staticmethod
+    def _owner(user_id: int) -> str:
+        return f"u{user_id}"
+
+    def stage_document(self, doc_key: str, text: str):
+        """Keep extracted text until the contract it belongs to is saved."""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO staged_documents (doc_key, text, staged_at) VALUES (?, ?, ?)",
+                (doc_key, text, time.time()),
+            )
+            conn.execute(
+                "DELETE FROM staged_documents WHERE staged_at < ?",
+                (time.time() - settings.RETRIEVAL_STAGED_TTL_SECONDS,),
+            )
+
+    def index_contract(self, user_id: int, contract_id: int, text: str) -> int:
+        """(Re)index a contract's text; returns the number of chunks."""
+        chunks = split_into_chunks(text, self.chunk_chars, self.chunk_overlap)
+        conn = self._connection()
+        with conn:
+            self._delete(conn, user_id, [contract_id])
+            for chunk_no, chunk in enumerate(chunks):
+                cursor = conn.execute(
+                    "INSERT INTO chunks (content, owner, contract_id, chunk_no) VALUES (?, ?, ?, ?)",
+                    (chunk, self._owner(user_id), contract_id, chunk_no),
+                )
+                conn.execute(
+                    "INSERT INTO chunk_owners (chunk_rowid, user_id, contract_id) VALUES (?, ?, ?)",
+                    (cursor.lastrowid, user_id, contract_id),
+                )
+        return len(chunks)
+
+    def index_staged_document(self, user_id: int, contract_id: int, doc_key: str) -> bool:
+        """Index previously staged text for a saved contract, if it is still staged."""
+        row = self._connection().execute(
+            "SELECT text FROM staged_documents WHERE doc_key = ?", (doc_key,)
+        ).fetchone()
+        if row is None:
+            return False
+        self.index_contract(user_id, contract_id, row[0])
+        return True
+
+    def remove_contracts(self, user_id: int, contract_ids: Iterable[int]):
+        conn = self._connection()
+        with conn:
+            self._delete(conn, user_id, list(contract_ids))
+
+    def _delete(self, conn: sqlite3.Connection, user_id: int, contract_ids: List[int]):
+        for contract_id in contract_ids:
+            rowids = [
+                (rowid,) for (rowid,) in conn.execute(
+                    "SELECT chunk_rowid FROM chunk_owners WHERE user_id = ? AND contract_id = ?",
+                    (user_id, contract_id),
+                )
+            ]
+            if rowids:
+                conn.executemany("DELETE FROM chunks WHERE rowid = ?", rowids)
+                conn.execute(
+                    "DELETE FROM chunk_owners WHERE user_id = ? AND contract_id = ?",
+                    (user_id, contract_id),
+                )
+
+    def search(self, user_id: int, question: str, k: int) -> List[dict]:
+        """Top-k chunks of the user's contracts for a question, best first."""
+        match = build_match_query(question)
+        if match is None:
+            return []
+        rows = self._connection().execute(
+            "SELECT contract_id, chunk_no, content, bm25(chunks, 1.0, 0.0) AS score "
+            "FROM chunks WHERE chunks MATCH ? ORDER BY score LIMIT ?",
+            (f'owner:"{self._owner(user_id)}" AND content:({match})', k),
+        ).fetchall()
+        return [
+            {"contract_id": int(contract_id), "chunk_no": int(chunk_no), "text": content, "score": round(-score, 4)}
+            for contract_id, chunk_no, content, score in rows
+        ]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_contract_index() -> Optional[ContractIndex]:
+    """Get or create the retrieval index, or None when retrieval is disabled."""
+    global _index
+    if not settings.RETRIEVAL_ENABLED:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = ContractIndex(
+                settings.RETRIEVAL_INDEX_PATH,
+                chunk_chars=settings.RETRIEVAL_CHUNK_CHARS,
+                chunk_overlap=settings.RETRIEVAL_CHUNK_OVERLAP,
+            )
+    return _index
@@ -0,0 +1,202 @@
+"""
+Deterministic pre-extraction of contract fields with compiled regexes.
+
+Emails, phone numbers, dates and contract values are taken from the text
+only where the match is unambiguous: next to a label such as "Effective
+Date:" or "Contract Value:", or the only candidate in the document. Those
+fields are then left out of the LLM request. ``offline_details`` fills every
+field this way for running without an OpenAI API key.
+"""
+import re
+import string
+from datetime import date
+from typing import Dict, List, Optional
+
+# Bump whenever the rules change so cached extraction results are not reused
+RULES_VERSION = "1"
+
+# Characters after a label in which its value must appear
+_LABEL_WINDOW = 60
+
+EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}\b")
+PHONE = re.compile(r"(?<![\w+])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)[\s.-]?)?\d{2,4}(?:[\s.-]\d{2,5}){1,3}(?![\w-])")
+# Only numbers in international or area-code form count without a label
+STRONG_PHONE = re.compile(r"(?<![\w+])(?:\+\d{1,3}[\s.-]?(?:\(\d{2,4}\)[\s.-]?)?|\(\d{2,4}\)[\s.-]?)\d{2,4}(?:[\s.-]\d{2,5}){1,3}(?![\w-])")
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",),
+         ("jun", "june"), ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"),
+         ("oct", "october"), ("nov", "november"), ("dec", "december")],
+        start=1,
+    )
+    for name in names
+}
+_MONTH = "|".join(sorted(_MONTHS, key=len, reverse=True))
+DATE = re.compile(
+    r"\b(?:"
+    r"(?P<iso_year>\d{4})-(?P<iso_month>\d{1,2})-(?P<iso_day>\d{1,2})"
+    r"|(?P<us_month>\d{1,2})/(?P<us_day>\d{1,2})/(?P<us_year>\d{4})"
+    rf"|(?P<md_month>{_MONTH})\.?\s+(?P<md_day>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<md_year>\d{{4}})"
+    rf"|(?P<dm_day>\d{{1,2}})(?:st|nd|rd|th)?\s+(?:day\s+of\s+)?(?P<dm_month>{_MONTH})\.?,?\s+(?P<dm_year>\d{{4}})"
+    r")\b",
+    re.IGNORECASE,
+)
+AMOUNT = re.compile(
+    r"(?:US\$|\$|USD\s?)\s?(?P<number>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)"
+    r"(?:\s*(?P<scale>million|thousand|billion|[mk])\b)?",
+    re.IGNORECASE,
+)
+_SCALES = {"thousand": 1e3, "k": 1e3, "million": 1e6, "m": 1e6, "billion": 1e9}
+
+# All labels in one pass over ASCII-lowercased text (IGNORECASE and a leading
+# \b make the scan several times slower); the group name is the field
+LABEL = re.compile(
+    r"(?<![a-z])(?:"
+    r"(?P<contact_email>e-?mail(?:\s+address)?)"
+    r"|(?P<contact_phone>(?:phone|telephone|tel|mobile|cell)(?:\s+(?:number|no\.?))?)"
+    r"|(?P<start_date>effective\s+date|start\s+date|commencement\s+date|effective\s+as\s+of|dated\s+as\s+of"
+    r"|commenc(?:es|ing)\s+on|start(?:s|ing)\s+on)"
+    r"|(?P<end_date>expiration\s+date|expiry\s+date|end\s+date|termination\s+date|expir(?:es|ing)\s+on|end(?:s|ing)\s+on)"
+    r"|(?P<contract_value>(?:total\s+)?contract\s+(?:value|price|amount|sum)"
+    r"|total\s+(?:value|price|amount|fees?|consideration)|aggregate\s+value)"
+    r")(?![a-z])"
+)
+# Unlike str.lower(), keeps every index the same as in the original text
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Offline mode only: labelled lines for the fields that otherwise need the LLM
+CONTACT_LINE = re.compile(
+    r"^\s*(?:primary\s+contact|contact\s+(?:person|name)|contact|attention|attn\.?)\s*[:\-]\s*"
+    r"(?P<value>[A-Z][\w.'-]+(?:[ \t]+[A-Z][\w.'-]+){0,3})",
+    re.IGNORECASE | re.MULTILINE,
+)
+PAYMENT_LINE = re.compile(r"^\s*payment(?:\s+terms?)?\s*:\s*(?P<value>.+)$", re.IGNORECASE | re.MULTILINE)
+TERMINATION_LINE = re.compile(r"^\s*termination(?:\s+terms?)?\s*:\s*(?P<value>.+)$", re.IGNORECASE | re.MULTILINE)
+
+
+def _parse_date(match: re.Match) -> Optional[str]:
+    groups = match.groupdict()
+    try:
+        if groups["iso_year"]:
+            value = date(int(groups["iso_year"]), int(groups["iso_month"]), int(groups["iso_day"]))
+        elif groups["us_year"]:
+            value = date(int(groups["us_year"]), int(groups["us_month"]), int(groups["us_day"]))
+        elif groups["md_year"]:
+            value = date(int(groups["md_year"]), _MONTHS[groups["md_month"].lower()], int(groups["md_day"]))
+        else:
+            value = date(int(groups["dm_year"]), _MONTHS[groups["dm_month"].lower()], int(groups["dm_day"]))
+    except ValueError:
+        return None
+    return value.isoformat()
+
+
+def _parse_amount(match: re.Match) -> float:
+    value = float(match.group("number").replace(",", ""))
+    scale = match.group("scale")
+    return value * _SCALES[scale.lower()] if scale else value
+
+
+def _phone(match: re.Match) -> Optional[str]:
+    digits = re.sub(r"\D", "", match.group(0))
+    return match.group(0).strip() if 7 <= len(digits) <= 15 else None
+
+
+def _email(match: re.Match) -> str:
+    return match.group(0).lower()
+
+
+# Field -> (value pattern, converter returning None for unusable matches)
+_VALUES = {
+    "contact_email": (EMAIL, _email),
+    "contact_phone": (PHONE, _phone),
+    "start_date": (DATE, _parse_date),
+    "end_date": (DATE, _parse_date),
+    "contract_value": (AMOUNT, _parse_amount),
+}
+
+
+def _labelled_values(text: str) -> Dict[str, List]:
+    """For each field, the first value after every occurrence of one of its labels."""
+    values = {}
+    for label in LABEL.finditer(text.translate(_ASCII_LOWER)):
+        pattern, convert = _VALUES[label.lastgroup]
+        match = pattern.search(text, label.end(), label.end() + _LABEL_WINDOW)
+        value = convert(match) if match else None
+        if value is not None:
+            values.setdefault(label.lastgroup, []).append(value)
+    return values
+
+
+def _emails(text: str) -> set:
+    """Every email address, found by looking around each "@" only."""
+    found = set()
+    at = text.find("@")
+    while at != -1:
+        match = EMAIL.search(text, max(at - 64, 0), at + 256)
+        if match and match.start() <= at < match.end():
+            found.add(_email(match))
+        at = text.find("@", at + 1)
+    return found
+
+
+def _agreed(values: List):
+    """The value if every labelled occurrence agrees, else None."""
+    return values[0] if values and len(set(values)) == 1 else None
+
+
+def _unique(values: set):
+    return next(iter(values)) if len(values) == 1 else None
+
+
+def extract_rule_fields(text: str) -> Dict[str, object]:
+    """The fields that can be read from ``text`` with confidence.
+
+    Returns a subset of contact_email, contact_phone, start_date, end_date
+    and contract_value; dates as YYYY-MM-DD, the value as a float. A field
+    is filled when all its labels agree on a value or, for emails and
+    phone numbers without a label, when the document contains exactly one.
+    """
+    labelled = _labelled_values(text)
+    fields = {}
+    for field in _VALUES:
+        value = _agreed(labelled.get(field, []))
+        if value is None and field == "contact_email":
+            value = _unique(_emails(text))
+        elif value is None and field == "contact_phone":
+            value = _unique({phone for phone in map(_phone, STRONG_PHONE.finditer(text)) if phone})
+        if value is not None:
+            fields[field] = value
+
+    if "start_date" in fields and "end_date" in fields and fields["end_date"] < fields["start_date"]:
+        # Contradictory labels; leave both to the model
+        del fields["start_date"], fields["end_date"]
+    return fields
+
+
+def _first_line(pattern: re.Pattern, text: str) -> Optional[str]:
+    match = pattern.search(text)
+    return match.group("value").strip() if match else None
+
+
+def offline_details(text: str) -> dict:
+    """Extraction result built without an LLM, for offline mode.
+
+    Uses ``extract_rule_fields`` plus labelled lines ("Primary Contact:",
+    "Payment Terms:", "Termination:") for the other fields; the summary only
+    names the document.
+    """
+    fields = extract_rule_fields(text)
+    title = next((line.strip() for line in text.splitlines() if line.strip()), "Untitled document")[:120].rstrip(".")
+    return {
+        "contact_name": _first_line(CONTACT_LINE, text),
+        "contact_email": fields.get("contact_email"),
+        "contact_phone": fields.get("contact_phone"),
+        "start_date": fields.get("start_date"),
+        "end_date": fields.get("end_date"),
+        "contract_value": fields.get("contract_value"),
+        "payment_terms": _first_line(PAYMENT_LINE, text),
+        "termination_terms": _first_line(TERMINATION_LINE, text),
+        "summary": f"{title}. Extracted offline by pattern matching; no AI summary is available.",
+    }
@@ -1,34 +1,125 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
+import bcrypt
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from backend.database import get_db
+from backend.config import settings
+from backend.database import get_async_db, get_db
 from backend.models.user import User
+from backend.utils.cache import LRUCache
+from backend.utils.metrics import cache_lookup, stage
+
+logger = logging.getLogger(__name__)
 
 # JWT Configuration
 SECRET_KEY = "your-secret-key-change-this-in-production"  # TODO: Move to environment variable
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 days
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# bcrypt only uses the first 72 bytes of a password; bcrypt>=5 raises instead of truncating
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+
+def _password_bytes(password: str) -> bytes:
+    return password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+
+def verify_password(plain_password: str, hashed_password: Optional[str]) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    if not hashed_password:
+        return False
+    try:
+        return bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode("utf-8"))
+    except ValueError:
+        # Not a bcrypt hash
+        return False
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
-    return pwd_context.hash(password)
+    """Hash a password with BCRYPT_ROUNDS rounds."""
+    return bcrypt.hashpw(_password_bytes(password), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode("utf-8")
+
+
+class PasswordHasher:
+    """Runs bcrypt in its own bounded thread pool.
+
+    bcrypt is deliberately slow and releases the GIL, so it gets dedicated
+    threads instead of competing with sync routes for Starlette's default
+    threadpool. At most ``workers + max_queue`` hashes are admitted at once;
+    a burst beyond that is rejected with 503 instead of queueing without
+    bound. With ``workers`` 0 hashing runs in the default threadpool.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt") if workers > 0 else None
+        self._pending = 0
+
+    async def run(self, fn: Callable, *args):
+        if self._pending >= max(self.workers, 1) + self.max_queue:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent sign-ins, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        self._pending += 1
+        try:
+            # Includes the wait for a free hashing thread
+            with stage("password_hash"):
+                if self._executor is None:
+                    return await run_in_threadpool(fn, *args)
+                return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_hasher = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get or create the shared password hasher."""
+    global _hasher
+    if _hasher is None:
+        _hasher = PasswordHasher(
+            workers=settings.PASSWORD_HASH_WORKERS,
+            max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+        )
+    return _hasher
+
+
+def shutdown_password_hasher():
+    global _hasher
+    if _hasher is not None:
+        _hasher.shutdown()
+        _hasher = None
+
+
+async def verify_password_async(plain_password: str, hashed_password: Optional[str]) -> bool:
+    """verify_password on the password hasher's threads."""
+    return await get_password_hasher().run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the password hasher's threads."""
+    return await get_password_hasher().run(get_password_hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -44,34 +135,112 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    """Get the current authenticated user from the JWT token."""
-    credentials_exception = HTTPException(
+# Resolved principals: token -> user id (bounded by the token's expiry) and
+# user id -> detached User. Entries live at most AUTH_CACHE_TTL_SECONDS and a
+# user's entry is dropped as soon as the user row is updated or deleted in
+# this process; other processes pick the change up within the TTL.
+_token_cache = LRUCache(max_entries=settings.AUTH_CACHE_MAX_ENTRIES, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS)
+_user_cache = LRUCache(max_entries=settings.AUTH_CACHE_MAX_ENTRIES, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def invalidate_cached_user(user_id: int):
+    """Drop a user from the principal cache."""
+    _user_cache.delete(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target: User):
+    invalidate_cached_user(target.id)
+
+
+def auth_cache_stats() -> dict:
+    return {"tokens": _token_cache.stats(), "users": _user_cache.stats()}
+
+
+def _user_id_from_token(token: str) -> int:
+    """Decode and validate the JWT, returning the user id; raises ValueError if invalid."""
+    caching = settings.AUTH_CACHE_TTL_SECONDS > 0
+    if caching:
+        user_id = _token_cache.get(token)
+        cache_lookup("auth_tokens", user_id is not None)
+        if user_id is not None:
+            return user_id
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError as e:
+        raise ValueError(f"JWT decode error: {e}")
+    user_id_str = payload.get("sub")
+    if user_id_str is None:
+        raise ValueError("No user_id in payload")
+    try:
+        user_id = int(user_id_str)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid user_id format: {e}")
+
+    if caching:
+        # Never cache a token past its own expiry
+        expires_in = payload.get("exp", 0) - time.time()
+        ttl = min(settings.AUTH_CACHE_TTL_SECONDS, expires_in)
+        if ttl > 0:
+            _token_cache.set(token, user_id, ttl_seconds=ttl)
+    return user_id
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def _cached_principal(token: str):
+    """``(user_id, cached_user_or_None)`` for a token; raises 401 if the token is invalid."""
     try:
-        print(f"DEBUG: Received token: {token[:20]}..." if len(token) > 20 else f"DEBUG: Received token: {token}")
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        print(f"DEBUG: Decoded payload: {payload}")
-        user_id_str: str = payload.get("sub")
-        if user_id_str is None:
-            print("DEBUG: No user_id in payload")
-            raise credentials_exception
-        user_id = int(user_id_str)
-    except JWTError as e:
-        print(f"DEBUG: JWT decode error: {e}")
-        raise credentials_exception
-    except (ValueError, TypeError) as e:
-        print(f"DEBUG: Invalid user_id format: {e}")
-        raise credentials_exception
+        user_id = _user_id_from_token(token)
+    except ValueError as e:
+        logger.debug("Rejected token: %s", e)
+        raise _credentials_exception()
+
+    if settings.AUTH_CACHE_TTL_SECONDS > 0:
+        user = _user_cache.get(user_id)
+        cache_lookup("auth_users", user is not None)
+        return user_id, user
+    return user_id, None
+
 
-    user = db.query(User).filter(User.id == user_id).first()
+def _remember_principal(db, user_id: int, user: Optional[User]) -> User:
     if user is None:
-        print(f"DEBUG: User not found with id: {user_id}")
-        raise credentials_exception
+        logger.debug("User not found with id: %s", user_id)
+        raise _credentials_exception()
 
-    print(f"DEBUG: User authenticated: {user.email}")
+    if settings.AUTH_CACHE_TTL_SECONDS > 0:
+        db.expunge(user)
+        _user_cache.set(user_id, user)
+    logger.debug("User authenticated: %s", user_id)
     return user
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    """Get the current authenticated user from the JWT token.
+
+    Resolved users are cached (see ``_user_cache``), so a warm request does
+    not touch the database. Cached users are detached from any session and
+    must be treated as read-only.
+    """
+    with stage("auth"):
+        user_id, user = _cached_principal(token)
+        if user is not None:
+            return user
+        return _remember_principal(db, user_id, db.query(User).filter(User.id == user_id).first())
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> User:
+    """``get_current_user`` for async routes; shares its cache and loads misses on the async engine."""
+    with stage("auth"):
+        user_id, user = _cached_principal(token)
+        if user is not None:
+            return user
+        return _remember_principal(db, user_id, await db.get(User, user_id))
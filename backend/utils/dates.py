@@ -0,0 +1,36 @@
+import re
+from datetime import date, datetime
+from typing import Optional
+from dateutil import parser as date_parser
+
+# Missing components in partial dates ("March 2024") fall back to the 1st
+_DEFAULT = datetime(2000, 1, 1)
+_YEAR = re.compile(r"\b\d{4}\b")
+
+
+def normalize_date(value) -> Optional[date]:
+    """Coerce a model-extracted or user-supplied date into a ``date``.
+
+    Accepts dates, datetimes and strings in ISO or common written formats.
+    Returns None for empty or unparseable values ("N/A", "indefinite", ...).
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+    # Without an explicit year dateutil would invent one ("30 days" -> 2000-01-30)
+    if not _YEAR.search(text):
+        return None
+    try:
+        return date_parser.parse(text, default=_DEFAULT).date()
+    except (ValueError, OverflowError):
+        return None
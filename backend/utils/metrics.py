@@ -0,0 +1,281 @@
+"""
+In-process counters and histograms, rendered in the Prometheus text format.
+
+A small dependency-free subset of the Prometheus client model: metrics are
+module-level objects with optional labels, ``collect`` callbacks add values
+that already live elsewhere (pool occupancy, cache sizes) at scrape time, and
+``render()`` produces the /metrics body. Values are per process.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; wide enough for an LLM call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+FAST_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+
+# (name, type, help, [(labels, value)])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.register(self)
+
+    def _key(self, labels: Dict[str, str]) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def collect(self) -> List[Family]:
+        with self._lock:
+            samples = [(self._labels(key), value) for key, value in self._values.items()]
+        return [(self.name, self.type, self.help, samples)]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label set, as Prometheus expects."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the ``with`` block, including when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self, **labels) -> Tuple[int, float]:
+        """``(count, sum)`` for one label set."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return (state[2], state[1]) if state else (0, 0.0)
+
+    def collect(self) -> List[Family]:
+        samples = []
+        with self._lock:
+            items = [(key, list(state[0]), state[1], state[2]) for key, state in self._values.items()]
+        for key, counts, total, count in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                samples.append(({**labels, "le": _format_value(bound)}, cumulative, "_bucket"))
+            samples.append((labels, total, "_sum"))
+            samples.append((labels, count, "_count"))
+        return [(self.name, self.type, self.help, samples)]
+
+
+class _Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Family]]):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            sources = [metric.collect for metric in self._metrics.values()] + list(self._collectors)
+        lines = []
+        for source in sources:
+            try:
+                families = list(source())
+            except Exception:
+                # One failing collector must not break the scrape
+                continue
+            for name, metric_type, help, samples in families:
+                lines.append(f"# HELP {name} {_escape(help)}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for sample in samples:
+                    labels, value = sample[0], sample[1]
+                    suffix = sample[2] if len(sample) > 2 else ""
+                    lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+_registry = _Registry()
+
+
+def add_collector(collector: Callable[[], Iterable[Family]]):
+    """Register a callback returning ``(name, type, help, samples)`` families at scrape time."""
+    _registry.add_collector(collector)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    return _registry.render()
+
+
+# HTTP
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by route and status.", ["method", "route", "status"])
+HTTP_DURATION = Histogram("http_request_duration_seconds", "HTTP request latency by route.", ["method", "route"])
+
+# Extraction pipeline and other request stages (upload_read, parse, rules, llm_extract, json_parse, auth, password_hash)
+STAGE_DURATION = Histogram("pipeline_stage_duration_seconds", "Latency of each pipeline stage.", ["stage"])
+STAGE_ERRORS = Counter("pipeline_stage_errors_total", "Pipeline stages that raised.", ["stage"])
+
+# Database
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Database statement latency.", ["engine", "operation"], buckets=FAST_BUCKETS
+)
+DB_ERRORS = Counter("db_errors_total", "Database statements that raised.", ["engine"])
+
+# LLM calls
+LLM_REQUESTS = Counter("llm_requests_total", "LLM API calls.", ["model", "operation", "outcome"])
+LLM_DURATION = Histogram("llm_request_duration_seconds", "LLM API call latency.", ["model", "operation"])
+LLM_TOKENS = Counter("llm_tokens_total", "LLM tokens used.", ["model", "operation", "kind"])
+LLM_COST = Counter("llm_cost_usd_total", "Estimated LLM spend in USD.", ["model", "operation"])
+LLM_JSON_PARSE = Counter("llm_json_parse_total", "How extraction responses were parsed as JSON.", ["method"])
+CHAT_TTFT = Histogram("chat_stream_ttft_seconds", "Time to first token of streamed chat answers.")
+RULE_FIELDS = Counter("rule_extraction_fields_total", "Fields read by the rule-based extractor instead of the LLM.", ["field"])
+
+# Extraction model tiers (fast, standard, large)
+EXTRACTION_COMPLEXITY = Histogram(
+    "extraction_complexity_score", "Complexity scores of routed documents.",
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+)
+EXTRACTION_ROUTED = Counter("extraction_routed_total", "Documents by the tier they were routed to.", ["tier"])
+EXTRACTION_ESCALATIONS = Counter(
+    "extraction_escalations_total", "Answers that failed validation and were retried one tier up.", ["tier", "reason"]
+)
+TIER_DURATION = Histogram("extraction_tier_duration_seconds", "Extraction call latency by tier.", ["tier"])
+TIER_COST = Counter("extraction_tier_cost_usd_total", "Estimated extraction spend in USD by tier.", ["tier"])
+
+# Caches (extraction, chat, auth_tokens, auth_users)
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by result.", ["cache", "result"])
+
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage into STAGE_DURATION and count it in STAGE_ERRORS if it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_ERRORS.inc(stage=name)
+        raise
+    finally:
+        STAGE_DURATION.observe(time.perf_counter() - start, stage=name)
+
+
+def cache_lookup(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def gauge(name: str, help: str, samples: List[Tuple[Dict[str, str], Optional[float]]]) -> Family:
+    """A gauge family for a collector; samples with a None value are skipped."""
+    return (name, "gauge", help, [(labels, value) for labels, value in samples if value is not None])
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting and timing HTTP requests.
+
+    Requests are labelled by route template (``/api/contracts/{contract_id}``)
+    rather than raw path, so label cardinality stays bounded. A plain ASGI
+    middleware, so streamed responses are passed through untouched; their
+    duration runs until the body is complete.
+    """
+
+    def __init__(self, app, exclude_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method=method, route=template, status=str(status[0]))
+            HTTP_DURATION.observe(time.perf_counter() - start, method=method, route=template)
@@ -0,0 +1,179 @@
+"""
+Incremental and forgiving JSON parsing for model output.
+
+``JSONObjectStream`` is fed a JSON object in arbitrary pieces, as a model
+streams it, and reports each top-level field as soon as its value is
+complete. ``repair_json`` fixes the usual ways a model's answer falls short
+of valid JSON - surrounding prose or code fences, trailing commas, Python
+literals, raw newlines in strings and output cut off mid-object - so a
+malformed answer can be used without another round trip.
+"""
+import json
+import re
+from typing import Any, List, Tuple
+
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CLOSERS = {"{": "}", "[": "]"}
+# A truncated true/false/null after a colon, comma or opening bracket
+_PARTIAL_LITERAL = re.compile(r"([:\[,]\s*)(t|tr|tru|f|fa|fal|fals|n|nu|nul)$")
+# An object key with no value yet, e.g. the tail of '{"a": 1, "b"'
+_DANGLING_KEY = re.compile(r'([{,])\s*"(?:[^"\\]|\\.)*"\s*$')
+
+
+class JSONObjectStream:
+    """Reports the top-level fields of a streamed JSON object as they complete.
+
+    Anything before the opening brace (prose, a code fence) is skipped. A
+    field is reported once the comma or closing brace after its value
+    arrives; values that do not parse are left for ``repair_json`` on the
+    full text.
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self.complete = False
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._segment_start = None
+
+    def feed(self, piece: str) -> List[Tuple[str, Any]]:
+        """Add the next piece of text; returns the ``(name, value)`` fields it completed."""
+        self._buffer += piece
+        completed = []
+        buffer = self._buffer
+        while self._pos < len(buffer) and not self.complete:
+            i, char = self._pos, buffer[self._pos]
+            self._pos += 1
+            if self._segment_start is None:
+                if char == "{":
+                    self._depth = 1
+                    self._segment_start = i + 1
+                continue
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._segment(self._segment_start, i))
+                    self.complete = True
+            elif char == "," and self._depth == 1:
+                completed.extend(self._segment(self._segment_start, i))
+                self._segment_start = i + 1
+        return completed
+
+    def _segment(self, start: int, end: int) -> List[Tuple[str, Any]]:
+        text = self._buffer[start:end].strip()
+        if not text:
+            return []
+        try:
+            parsed = json.loads("{" + text + "}")
+        except json.JSONDecodeError:
+            return []
+        new = [(name, value) for name, value in parsed.items() if name not in self.fields]
+        self.fields.update(new)
+        return new
+
+
+def _strip_wrapping(text: str) -> str:
+    """The JSON part of an answer: inside a code fence if there is one, from the first bracket on."""
+    if "```" in text:
+        fenced = text.split("```", 2)[1]
+        if fenced.startswith("json"):
+            fenced = fenced[4:]
+        text = fenced
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    return text[min(starts):] if starts else text.strip()
+
+
+def repair_json(text: str) -> str:
+    """Best-effort conversion of a model's almost-JSON answer into valid JSON text.
+
+    Keeps string contents intact, drops anything after the top-level value,
+    and closes strings, arrays and objects left open by truncated output (a
+    truncated string keeps the part that arrived). The result may still not
+    parse if the input is too far gone.
+    """
+    text = _strip_wrapping(text)
+    out = []
+    stack = []
+    in_string = escaped = False
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            elif char == "\n":
+                char = "\\n"
+            elif char in "\r\t":
+                char = "\\r" if char == "\r" else "\\t"
+            out.append(char)
+        elif char == '"':
+            in_string = True
+            out.append(char)
+        elif char in _CLOSERS:
+            stack.append(char)
+            out.append(char)
+        elif char in "}]":
+            _drop_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(char)
+            if not stack:
+                break
+        elif char.isalpha():
+            end = i
+            while end < len(text) and (text[end].isalnum() or text[end] == "_"):
+                end += 1
+            word = text[i:end]
+            out.append(_LITERALS.get(word, word))
+            i = end
+            continue
+        else:
+            out.append(char)
+        i += 1
+
+    if in_string:
+        if escaped:
+            out.pop()
+        out.append('"')
+    repaired = "".join(out).rstrip()
+    if stack:
+        repaired = _close_truncated(repaired, stack)
+    return repaired
+
+
+def _drop_trailing_comma(out: list):
+    j = len(out) - 1
+    while j >= 0 and out[j].isspace():
+        j -= 1
+    if j >= 0 and out[j] == ",":
+        del out[j]
+
+
+def _close_truncated(text: str, stack: list) -> str:
+    text = _PARTIAL_LITERAL.sub(r"\1null", text)
+    if stack[-1] == "{":
+        text = _DANGLING_KEY.sub(r"\1", text)
+    text = text.rstrip().rstrip(",").rstrip()
+    if text.endswith(":"):
+        text += " null"
+    elif text[-1:] in "-+.eE" and text[-2:-1].isdigit():
+        text = text.rstrip("-+.eE")
+    return text + "".join(_CLOSERS[opener] for opener in reversed(stack))
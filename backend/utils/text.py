@@ -0,0 +1,94 @@
+from typing import Iterable, List, Optional
+from backend.config import settings
+
+# Rough average for English contract text with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting, not billing."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def extraction_char_budget() -> Optional[int]:
+    """Characters of document text sent to the model for extraction.
+
+    Parsing stops once this many characters are available, so the parser and
+    the AI service always agree on how much of a document is used.
+    """
+    budgets = []
+    if settings.EXTRACTION_CHAR_BUDGET > 0:
+        budgets.append(settings.EXTRACTION_CHAR_BUDGET)
+    if settings.EXTRACTION_TOKEN_BUDGET > 0:
+        budgets.append(settings.EXTRACTION_TOKEN_BUDGET * CHARS_PER_TOKEN)
+    return min(budgets) if budgets else None
+
+
+def document_char_budget() -> Optional[int]:
+    """Characters of a document worth parsing.
+
+    Equal to the extraction budget, unless long-document mode is on, in which
+    case it covers as many overlapping chunks as will be sent to the model.
+    """
+    if not settings.LONG_DOCUMENT_MODE:
+        return extraction_char_budget()
+    chunk_chars = extraction_char_budget() or settings.LONG_DOCUMENT_CHUNK_CHARS
+    stride = max(chunk_chars - settings.LONG_DOCUMENT_CHUNK_OVERLAP, 1)
+    return chunk_chars + (settings.LONG_DOCUMENT_MAX_CHUNKS - 1) * stride
+
+
+def parse_char_budget() -> Optional[int]:
+    """Characters of a document to parse: the extraction needs, or more when
+    the text is also kept for the retrieval index."""
+    budget = document_char_budget()
+    if budget is None or not settings.RETRIEVAL_ENABLED:
+        return budget
+    if settings.RETRIEVAL_MAX_CHARS <= 0:
+        return None
+    return max(budget, settings.RETRIEVAL_MAX_CHARS)
+
+
+def split_into_chunks(text: str, chunk_chars: int, overlap: int = 0) -> List[str]:
+    """Split text into chunks of at most ``chunk_chars`` that overlap by ``overlap``.
+
+    Chunk ends are moved back to the nearest paragraph or sentence break in
+    the last fifth of the chunk, so clauses are split as rarely as possible.
+    """
+    if len(text) <= chunk_chars:
+        return [text] if text else []
+    overlap = min(overlap, chunk_chars // 2)
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_chars, len(text))
+        if end < len(text):
+            floor = end - chunk_chars // 5
+            for separator in ("\n\n", "\n", ". "):
+                cut = text.rfind(separator, floor, end)
+                if cut != -1:
+                    end = cut + len(separator)
+                    break
+        chunks.append(text[start:end])
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+def join_within_budget(chunks: Iterable[str], max_chars: Optional[int] = None) -> str:
+    """Join lazily produced text chunks, stopping once ``max_chars`` is reached.
+
+    The chunk iterator is abandoned as soon as the budget is met, so pages
+    after that point are never parsed.
+    """
+    parts = []
+    total = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parts.append(chunk)
+        total += len(chunk)
+        if max_chars is not None and total >= max_chars:
+            break
+    text = "".join(parts)
+    return text if max_chars is None else text[:max_chars]